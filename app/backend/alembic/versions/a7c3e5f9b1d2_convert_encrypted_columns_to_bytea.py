@@ -0,0 +1,139 @@
+"""convert encrypted columns to bytea (envelope v2)
+
+Revision ID: a7c3e5f9b1d2
+Revises: f3a9d2c7e815
+Create Date: 2026-10-18 15:00:00.000000
+
+ALTER COLUMN ... TYPE bytea는 테이블 전체를 ACCESS EXCLUSIVE 잠금으로 다시 쓰므로 쓰지 않고 온라인으로 교체
+1) 새 bytea 컬럼(<col>__bytea, NULL 허용) 추가 + 트리거로 기존 컬럼 쓰기를 새 컬럼에 동기화 (메타데이터만 변경)
+2) PK 순서로 BATCH_SIZE행씩 채움 (배치마다 커밋, 행 잠금만)
+3) NOT NULL 컬럼은 CHECK ... NOT VALID 추가 후 VALIDATE (쓰기를 막지 않는 잠금)
+4) 짧은 트랜잭션에서 트리거/기존 컬럼 삭제 + 이름 교체 + SET NOT NULL (검증된 CHECK가 있어 테이블을 다시 읽지 않음)
+
+- 4) 이후 bytea 컬럼에 문자열을 쓰는 이전 버전 앱은 쓰기가 실패하므로, 마이그레이션 직후 새 버전을 배포할 것
+- 잠금 대기가 lock_timeout(5초)를 넘으면 실패 → 그대로 다시 실행 (1은 있는 컬럼을 건너뛰고 2, 3은 다시 해도 같은 결과, 4는 한 트랜잭션)
+- v1 JSON envelope는 UTF-8 바이트 그대로 옮김 (읽기 시 v1/v2 모두 복호화)
+  v2 바이너리로의 재암호화는 python -m app.backend.utils.rotate_keys 로 온라인 배치 처리
+- 배치마다 커밋하므로 오프라인(--sql) 모드는 지원하지 않음
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e5f9b1d2"
+down_revision: Union[str, None] = "f3a9d2c7e815"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 테이블 → (PK, 암호화 컬럼, NOT NULL 컬럼)
+ENCRYPTED_COLUMNS = {
+    "students": ("student_id", ("name", "phone", "parent_phone"), ("name", "phone")),
+    "teachers": ("teacher_id", ("phone", "email", "account_name", "account_number"), ("phone",)),
+}
+BATCH_SIZE = 5000
+LOCK_TIMEOUT = "5s"
+
+
+def _tmp(column: str) -> str:
+    return f"{column}__bytea"
+
+
+def _sync_function(table: str) -> str:
+    return f"{table}_bytea_swap_sync"
+
+
+def _not_null_check(column: str) -> str:
+    return f"{_tmp(column)}_not_null"
+
+
+def _columns(bind, table: str) -> set[str]:
+    return {c["name"] for c in sa.inspect(bind).get_columns(table)}
+
+
+def _add_shadow_columns(table: str, columns: tuple[str, ...]) -> None:
+    """1) 새 컬럼 + 동기화 트리거 (이미 있으면 건너뜀)"""
+    existing = _columns(op.get_bind(), table)
+    for column in columns:
+        if _tmp(column) not in existing:
+            op.add_column(table, sa.Column(_tmp(column), sa.LargeBinary(), nullable=True))
+    assignments = " ".join(f"NEW.{_tmp(c)} := convert_to(NEW.{c}, 'UTF8');" for c in columns)
+    op.execute(
+        f"CREATE OR REPLACE FUNCTION {_sync_function(table)}() RETURNS trigger AS $$ "
+        f"BEGIN {assignments} RETURN NEW; END; $$ LANGUAGE plpgsql"
+    )
+    op.execute(f"DROP TRIGGER IF EXISTS {_sync_function(table)} ON {table}")
+    op.execute(
+        f"CREATE TRIGGER {_sync_function(table)} BEFORE INSERT OR UPDATE ON {table} "
+        f"FOR EACH ROW EXECUTE FUNCTION {_sync_function(table)}()"
+    )
+
+
+def _backfill(bind, table: str, pk: str, columns: tuple[str, ...]) -> None:
+    """2) PK keyset 배치로 채움 (autocommit → 문장마다 커밋)"""
+    assignments = ", ".join(f"{_tmp(c)} = convert_to(t.{c}, 'UTF8')" for c in columns)
+    stmt = sa.text(
+        f"WITH batch AS (SELECT {pk} FROM {table} WHERE {pk} > :last ORDER BY {pk} LIMIT :n), "
+        f"done AS (UPDATE {table} t SET {assignments} FROM batch WHERE t.{pk} = batch.{pk} RETURNING t.{pk}) "
+        f"SELECT count(*), max({pk}) FROM done"
+    )
+    last = 0
+    while True:
+        count, max_pk = bind.execute(stmt, {"last": last, "n": BATCH_SIZE}).one()
+        if count < BATCH_SIZE:
+            return
+        last = max_pk
+
+
+def _validate_not_null(bind, table: str, columns: tuple[str, ...]) -> None:
+    """3) NOT NULL 대신 검증된 CHECK (VALIDATE는 SHARE UPDATE EXCLUSIVE라 쓰기를 막지 않음)"""
+    for column in columns:
+        bind.execute(
+            sa.text(
+                f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {_not_null_check(column)}, "
+                f"ADD CONSTRAINT {_not_null_check(column)} CHECK ({_tmp(column)} IS NOT NULL) NOT VALID"
+            )
+        )
+        bind.execute(sa.text(f"ALTER TABLE {table} VALIDATE CONSTRAINT {_not_null_check(column)}"))
+
+
+def _swap(table: str, columns: tuple[str, ...], not_null: tuple[str, ...]) -> None:
+    """4) 메타데이터만 바꾸는 짧은 잠금"""
+    op.execute(f"DROP TRIGGER IF EXISTS {_sync_function(table)} ON {table}")
+    op.execute(f"DROP FUNCTION IF EXISTS {_sync_function(table)}()")
+    for column in columns:
+        op.drop_column(table, column)
+        op.alter_column(table, _tmp(column), new_column_name=column)
+    for column in not_null:
+        op.alter_column(table, column, nullable=False)
+        op.drop_constraint(_not_null_check(column), table, type_="check")
+
+
+def upgrade() -> None:
+    op.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    for table, (_, columns, _) in ENCRYPTED_COLUMNS.items():
+        _add_shadow_columns(table, columns)
+
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for table, (pk, columns, not_null) in ENCRYPTED_COLUMNS.items():
+            _backfill(bind, table, pk, columns)
+            _validate_not_null(bind, table, not_null)
+
+    for table, (_, columns, not_null) in ENCRYPTED_COLUMNS.items():
+        _swap(table, columns, not_null)
+    op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    # 서비스 중단 상태에서 실행 (ALTER TYPE이 테이블을 다시 씀)
+    # v2로 변환된 행은 텍스트로 되돌릴 수 없으므로 다운그레이드 전에 v1로 재암호화 필요
+    for table, (_, columns, _) in ENCRYPTED_COLUMNS.items():
+        for column in columns:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE text "
+                f"USING convert_from({column}, 'UTF8')"
+            )
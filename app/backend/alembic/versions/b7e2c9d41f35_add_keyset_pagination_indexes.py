@@ -0,0 +1,40 @@
+"""add keyset pagination indexes
+
+Revision ID: b7e2c9d41f35
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e2c9d41f35"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 커서 페이지네이션 seek용: (teacher_id, 정렬키, PK)
+    # schedules는 기존 ix_schedules_teacher_id_lesson_date로 충분
+    op.create_index(
+        "ix_invoices_teacher_id_created_at_invoice_id",
+        "invoices",
+        ["teacher_id", "created_at", "invoice_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_students_teacher_id_created_at_student_id",
+        "students",
+        ["teacher_id", "created_at", "student_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_students_teacher_id_created_at_student_id", table_name="students")
+    op.drop_index("ix_invoices_teacher_id_created_at_invoice_id", table_name="invoices")
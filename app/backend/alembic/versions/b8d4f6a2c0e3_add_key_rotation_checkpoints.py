@@ -0,0 +1,39 @@
+"""add key_rotation_checkpoints
+
+Revision ID: b8d4f6a2c0e3
+Revises: a7c3e5f9b1d2
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d4f6a2c0e3"
+down_revision: Union[str, None] = "a7c3e5f9b1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # python -m app.backend.utils.rotate_keys 의 재개 지점
+    op.create_table(
+        "key_rotation_checkpoints",
+        sa.Column("job_name", sa.String(length=100), nullable=False),
+        sa.Column("table_name", sa.String(length=100), nullable=False),
+        sa.Column("target_key_id", sa.Integer(), nullable=False),
+        sa.Column("last_id", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("rows_scanned", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("rows_rewritten", sa.BigInteger(), server_default="0", nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("job_name", "table_name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("key_rotation_checkpoints")
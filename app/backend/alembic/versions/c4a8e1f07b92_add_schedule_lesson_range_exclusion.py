@@ -0,0 +1,75 @@
+"""add schedule lesson_range exclusion constraint
+
+Revision ID: c4a8e1f07b92
+Revises: b7e2c9d41f35
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8e1f07b92"
+down_revision: Union[str, None] = "b7e2c9d41f35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LESSON_RANGE_SQL = (
+    "tsrange("
+    "lesson_date + make_time(split_part(start_time, ':', 1)::int, split_part(start_time, ':', 2)::int, 0), "
+    "lesson_date + make_time(split_part(end_time, ':', 1)::int, split_part(end_time, ':', 2)::int, 0), "
+    "'[)')"
+)
+
+
+def upgrade() -> None:
+    # GiST에서 bigint '=' 연산을 쓰기 위해 필요
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.add_column(
+        "schedules",
+        sa.Column(
+            "lesson_range",
+            postgresql.TSRANGE(),
+            sa.Computed(LESSON_RANGE_SQL, persisted=True),
+            nullable=True,
+        ),
+    )
+
+    # 기존 데이터에 겹치는 수업이 있으면 제약 생성이 실패하므로 먼저 알려줌
+    overlaps = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT count(*)
+            FROM schedules a
+            JOIN schedules b
+              ON a.teacher_id = b.teacher_id
+             AND a.schedule_id < b.schedule_id
+             AND a.lesson_range && b.lesson_range
+            WHERE a.status <> 'cancelled' AND b.status <> 'cancelled'
+            """
+        )
+    ).scalar()
+    if overlaps:
+        raise RuntimeError(
+            f"{overlaps} overlapping schedule pairs found. "
+            "Cancel or fix them before applying the exclusion constraint."
+        )
+
+    op.execute(
+        """
+        ALTER TABLE schedules
+        ADD CONSTRAINT ex_schedules_teacher_id_lesson_range
+        EXCLUDE USING gist (teacher_id WITH =, lesson_range WITH &&)
+        WHERE (status <> 'cancelled')
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE schedules DROP CONSTRAINT IF EXISTS ex_schedules_teacher_id_lesson_range")
+    op.drop_column("schedules", "lesson_range")
@@ -0,0 +1,36 @@
+"""add schedule_rules.deleted_at and schedule_rule_exceptions.updated_at
+
+Revision ID: c9e3f1a7d2b4
+Revises: b8d4f6a2c0e3
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c9e3f1a7d2b4"
+down_revision: Union[str, None] = "b8d4f6a2c0e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 규칙 삭제를 증분 동기화(GET /schedules/changes)가 감지할 수 있도록 소프트 삭제
+    op.add_column("schedule_rules", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_schedule_rules_teacher_id_updated_at", "schedule_rules", ["teacher_id", "updated_at"])
+    # 예외 수정(취소 → 실체화 등)도 감지
+    op.add_column(
+        "schedule_rule_exceptions",
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("schedule_rule_exceptions", "updated_at")
+    op.drop_index("ix_schedule_rules_teacher_id_updated_at", table_name="schedule_rules")
+    op.execute("DELETE FROM schedule_rules WHERE deleted_at IS NOT NULL")
+    op.drop_column("schedule_rules", "deleted_at")
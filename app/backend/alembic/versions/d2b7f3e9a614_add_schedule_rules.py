@@ -0,0 +1,78 @@
+"""add schedule_rules and schedule_rule_exceptions
+
+Revision ID: d2b7f3e9a614
+Revises: c4a8e1f07b92
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2b7f3e9a614"
+down_revision: Union[str, None] = "c4a8e1f07b92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "schedule_rules",
+        sa.Column("rule_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("teacher_id", sa.BigInteger(), nullable=False),
+        sa.Column("student_id", sa.BigInteger(), nullable=False),
+        sa.Column("subject_id", sa.String(length=50), nullable=False),
+        sa.Column("weekday", sa.SmallInteger(), nullable=False),
+        sa.Column("start_time", sa.String(length=5), nullable=False),
+        sa.Column("end_time", sa.String(length=5), nullable=False),
+        sa.Column("interval_weeks", sa.Integer(), server_default="1", nullable=False),
+        sa.Column("valid_from", sa.Date(), nullable=False),
+        sa.Column("valid_to", sa.Date(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["teacher_id"], ["teachers.teacher_id"]),
+        sa.ForeignKeyConstraint(["student_id"], ["students.student_id"]),
+        sa.PrimaryKeyConstraint("rule_id"),
+    )
+    op.create_index("ix_schedule_rules_student_id", "schedule_rules", ["student_id"])
+    op.create_index("ix_schedule_rules_teacher_id_weekday", "schedule_rules", ["teacher_id", "weekday"])
+
+    op.create_table(
+        "schedule_rule_exceptions",
+        sa.Column("exception_id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("rule_id", sa.BigInteger(), nullable=False),
+        sa.Column("occurrence_date", sa.Date(), nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("schedule_id", sa.BigInteger(), nullable=True),
+        sa.Column("cancelled_by", sa.BigInteger(), nullable=True),
+        sa.Column("cancel_reason", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["rule_id"], ["schedule_rules.rule_id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["schedule_id"], ["schedules.schedule_id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("exception_id"),
+        sa.UniqueConstraint("rule_id", "occurrence_date", name="uniq_rule_occurrence_date"),
+    )
+
+    # 실체화된 회차가 어느 규칙에서 왔는지
+    op.add_column("schedules", sa.Column("rule_id", sa.BigInteger(), nullable=True))
+    op.create_foreign_key(
+        "fk_schedules_rule_id",
+        "schedules",
+        "schedule_rules",
+        ["rule_id"],
+        ["rule_id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("fk_schedules_rule_id", "schedules", type_="foreignkey")
+    op.drop_column("schedules", "rule_id")
+    op.drop_table("schedule_rule_exceptions")
+    op.drop_index("ix_schedule_rules_teacher_id_weekday", table_name="schedule_rules")
+    op.drop_index("ix_schedule_rules_student_id", table_name="schedule_rules")
+    op.drop_table("schedule_rules")
@@ -0,0 +1,32 @@
+"""add schedules (teacher_id, updated_at) index for delta sync
+
+Revision ID: e8c1a6f4b390
+Revises: d2b7f3e9a614
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8c1a6f4b390"
+down_revision: Union[str, None] = "d2b7f3e9a614"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # GET /schedules/changes seek용: (teacher_id, updated_at, PK)
+    op.create_index(
+        "ix_schedules_teacher_id_updated_at",
+        "schedules",
+        ["teacher_id", "updated_at", "schedule_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_schedules_teacher_id_updated_at", table_name="schedules")
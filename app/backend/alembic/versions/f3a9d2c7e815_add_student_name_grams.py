@@ -0,0 +1,36 @@
+"""add student_name_grams blind index
+
+Revision ID: f3a9d2c7e815
+Revises: e8c1a6f4b390
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a9d2c7e815"
+down_revision: Union[str, None] = "e8c1a6f4b390"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 값은 HMAC 키가 필요하므로 애플리케이션에서 채움
+    # 기존 학생은 python -m app.backend.utils.backfill_name_grams 로 백필
+    op.create_table(
+        "student_name_grams",
+        sa.Column("gram_hash", sa.String(length=32), nullable=False),
+        sa.Column("student_id", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["student_id"], ["students.student_id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("gram_hash", "student_id"),
+    )
+    op.create_index("ix_student_name_grams_student_id", "student_name_grams", ["student_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_student_name_grams_student_id", table_name="student_name_grams")
+    op.drop_table("student_name_grams")
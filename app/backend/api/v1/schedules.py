@@ -1,15 +1,19 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, date, time
+from datetime import datetime, date, time
 from typing import Optional
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import and_, select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...db.database import get_session
+from ...db.errors import is_exclusion_violation
 from ...db.models import Schedule
+from ...db.models.schedule import SCHEDULE_OVERLAP_CONSTRAINT
+from ...services.recurrence import expand_weekdays, generate_recurring_schedules
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
@@ -46,25 +50,6 @@ async def create_schedule(
     start_time_str = start_time_obj.strftime("%H:%M")
     end_time_str = end_time_obj.strftime("%H:%M")
 
-    # 충돌 확인
-    conflict_count = (
-        await db.execute(
-            select(func.count())
-            .select_from(Schedule)
-            .where(
-                and_(
-                    Schedule.teacher_id == payload.teacher_id,
-                    Schedule.lesson_date == lesson_date,
-                    Schedule.start_time < end_time_str,
-                    Schedule.end_time > start_time_str,
-                )
-            )
-        )
-    ).scalar_one()
-
-    if conflict_count > 0:
-        raise HTTPException(status_code=409, detail="Schedule conflict detected")
-
     if payload.cancelled_at:
         try:
             cancelled_at = datetime.fromisoformat(payload.cancelled_at)
@@ -87,8 +72,15 @@ async def create_schedule(
         cancel_reason=payload.cancel_reason,
     )
 
+    # 충돌은 EXCLUDE 제약이 INSERT 시점에 판정
     db.add(schedule)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if is_exclusion_violation(e, SCHEDULE_OVERLAP_CONSTRAINT):
+            raise HTTPException(status_code=409, detail="Schedule conflict detected")
+        raise
     await db.refresh(schedule)
 
     return {
@@ -206,17 +198,19 @@ async def check_conflict(
     lesson_date_obj = datetime.strptime(lesson_date, "%Y-%m-%d").date()
     start_time_obj = datetime.strptime(start_time, "%H:%M").time()
     end_time_obj = datetime.strptime(end_time, "%H:%M").time()
-    start_time_str = start_time_obj.strftime("%H:%M")
-    end_time_str = end_time_obj.strftime("%H:%M")
+    requested = func.tsrange(
+        datetime.combine(lesson_date_obj, start_time_obj),
+        datetime.combine(lesson_date_obj, end_time_obj),
+        "[)",
+    )
 
     count = (
         await db.execute(
             select(func.count()).select_from(Schedule).where(
                 and_(
                     Schedule.teacher_id == teacher_id,
-                    Schedule.lesson_date == lesson_date_obj,
-                    Schedule.start_time < end_time_str,
-                    Schedule.end_time > start_time_str,
+                    Schedule.status != "cancelled",
+                    Schedule.lesson_range.op("&&")(requested),
                 )
             )
         )
@@ -246,43 +240,24 @@ async def bulk_generate(
 
     df = parse_date(date_from)
     dt = parse_date(date_to)
-    st = parse_time(start_time)
-    et = parse_time(end_time)
-    st_str = st.strftime("%H:%M")
-    et_str = et.strftime("%H:%M")
+    st_str = parse_time(start_time).strftime("%H:%M")
+    et_str = parse_time(end_time).strftime("%H:%M")
 
-    cur = df
-    while cur.weekday() != weekday:
-        cur = cur + timedelta(days=1)
+    try:
+        dates = expand_weekdays(df, dt, [weekday])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    created = 0
-    while cur <= dt:
-        exists = (
-            await db.execute(
-                select(func.count())
-                .select_from(Schedule)
-                .where(
-                    (Schedule.teacher_id == teacher_id)
-                    & (Schedule.lesson_date == cur)
-                    & (Schedule.start_time < et_str)
-                    & (Schedule.end_time > st_str)
-                )
-            )
-        ).scalar_one()
-        if not exists:
-            db.add(
-                Schedule(
-                    teacher_id=teacher_id,
-                    student_id=student_id,
-                    subject_id=subject_id,
-                    lesson_date=cur,
-                    start_time=st_str,
-                    end_time=et_str,
-                    status=status,
-                    notes=notes,
-                )
-            )
-            created += 1
-        cur = cur + timedelta(days=7)
+    result = await generate_recurring_schedules(
+        db,
+        teacher_id=teacher_id,
+        student_id=student_id,
+        subject_id=subject_id,
+        dates=dates,
+        start_time=st_str,
+        end_time=et_str,
+        status=status,
+        notes=notes,
+    )
     await db.commit()
-    return {"created": created}
+    return {"created": result["created"]}
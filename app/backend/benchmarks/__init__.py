@@ -0,0 +1 @@
+# 암호화/직렬화 마이크로 벤치마크 (python -m app.backend.benchmarks)
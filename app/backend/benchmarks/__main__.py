@@ -0,0 +1,41 @@
+"""
+python -m app.backend.benchmarks                        # 실행 + 출력
+python -m app.backend.benchmarks --save baselines/main.json
+python -m app.backend.benchmarks --compare baselines/main.json --threshold 0.15
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from app.backend.benchmarks.cases import CASES
+from app.backend.benchmarks.harness import DEFAULT_SIZES, Report, compare, run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="암호화/직렬화 마이크로 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="페이지 크기 (값 개수)")
+    parser.add_argument("--only", nargs="+", help="이름에 이 문자열이 들어간 케이스만")
+    parser.add_argument("--save", type=Path, help="결과를 JSON으로 저장")
+    parser.add_argument("--compare", type=Path, help="기준 JSON과 비교 (느려지면 종료 코드 1)")
+    parser.add_argument("--threshold", type=float, default=0.15, help="허용 ops/sec 감소 비율 (기본 0.15)")
+    args = parser.parse_args(argv)
+
+    report = run(CASES, sizes=args.sizes, only=args.only)
+    if args.save:
+        report.save(args.save)
+        print(f"\n💾 저장: {args.save}")
+    if args.compare:
+        regressions = compare(report, Report.load(args.compare), threshold=args.threshold)
+        if regressions:
+            print("\n❌ 성능 저하:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ 기준 대비 성능 저하 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
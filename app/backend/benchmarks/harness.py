@@ -0,0 +1,145 @@
+"""
+벤치마크 실행/기록/비교
+- 케이스마다 페이지 크기(값 개수)별로 반복 측정하여 최선값 기준 ops/sec(값 단위) 기록
+- 결과는 JSON으로 저장하고, 기준(baseline) JSON과 비교해 느려진 케이스를 표시
+"""
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+DEFAULT_SIZES = (20, 200, 2000)
+# 최소 측정 시간 (초) - 이보다 짧으면 반복 횟수를 늘림
+MIN_TIME = 0.2
+REPEAT = 5
+
+
+@dataclass
+class Case:
+    name: str
+    # size → (실행할 함수, 값 1개당 envelope 크기 또는 None)
+    setup: Callable[[int], tuple[Callable[[], object], float | None]]
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    ops_per_sec: float  # 초당 처리한 값 개수
+    sec_per_page: float  # size개 처리에 걸린 시간 (최선값)
+    stdev_pct: float  # 반복 측정 간 편차 (%)
+    bytes_per_envelope: float | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.size}"
+
+
+@dataclass
+class Report:
+    results: list[Result] = field(default_factory=list)
+    meta: dict = field(default_factory=dict)
+
+    def to_json(self) -> dict:
+        return {"meta": self.meta, "results": [asdict(r) for r in self.results]}
+
+    @classmethod
+    def load(cls, path: Path) -> "Report":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(results=[Result(**r) for r in data["results"]], meta=data.get("meta", {}))
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_json(), ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+
+
+def _time_page(fn: Callable[[], object]) -> tuple[float, float]:
+    """(페이지 1번 최선 시간, 반복 간 편차 %)"""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_TIME or loops >= 1 << 20:
+            break
+        loops *= 2
+    samples = [elapsed / loops]
+    for _ in range(REPEAT - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    best = min(samples)
+    spread = statistics.pstdev(samples) / statistics.mean(samples) * 100 if len(samples) > 1 else 0.0
+    return best, spread
+
+
+def run(cases: list[Case], sizes=DEFAULT_SIZES, only: list[str] | None = None, out=sys.stdout) -> Report:
+    report = Report(
+        meta={
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "sizes": list(sizes),
+        }
+    )
+    for case in cases:
+        if only and not any(o in case.name for o in only):
+            continue
+        for size in sizes:
+            fn, envelope_bytes = case.setup(size)
+            best, spread = _time_page(fn)
+            result = Result(
+                name=case.name,
+                size=size,
+                ops_per_sec=size / best,
+                sec_per_page=best,
+                stdev_pct=round(spread, 2),
+                bytes_per_envelope=envelope_bytes,
+            )
+            report.results.append(result)
+            size_info = f"  {envelope_bytes:6.1f} B/env" if envelope_bytes is not None else ""
+            print(
+                f"{result.key:<40} {result.ops_per_sec:>14,.0f} ops/s"
+                f"  {best * 1000:>10.3f} ms/page  ±{spread:4.1f}%{size_info}",
+                file=out,
+            )
+    return report
+
+
+def compare(current: Report, baseline: Report, threshold: float = 0.15, out=sys.stdout) -> list[str]:
+    """
+    baseline 대비 ops/sec가 threshold 이상 떨어졌거나 envelope가 커진 케이스 목록
+    """
+    base = {r.key: r for r in baseline.results}
+    regressions: list[str] = []
+    print(f"\n{'case':<40} {'baseline':>14} {'current':>14} {'change':>8}", file=out)
+    for r in current.results:
+        b = base.get(r.key)
+        if b is None:
+            print(f"{r.key:<40} {'-':>14} {r.ops_per_sec:>14,.0f} {'new':>8}", file=out)
+            continue
+        change = r.ops_per_sec / b.ops_per_sec - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  ⚠️ slower"
+            regressions.append(f"{r.key}: {change:+.1%} ops/sec")
+        if (
+            r.bytes_per_envelope is not None
+            and b.bytes_per_envelope is not None
+            and r.bytes_per_envelope > b.bytes_per_envelope
+        ):
+            flag += "  ⚠️ larger envelope"
+            regressions.append(f"{r.key}: {b.bytes_per_envelope:.1f} → {r.bytes_per_envelope:.1f} B/env")
+        print(f"{r.key:<40} {b.ops_per_sec:>14,.0f} {r.ops_per_sec:>14,.0f} {change:>+8.1%}{flag}", file=out)
+    return regressions
@@ -0,0 +1,101 @@
+# app/backend/core/blind_index.py
+"""
+암호화된 이름의 부분 검색용 blind n-gram 인덱스
+- 이름을 음절 1/2-gram + 초성 1/2-gram으로 쪼개 keyed-HMAC으로 저장 (평문은 DB에 남지 않음)
+- 검색어도 같은 방식으로 해시하여 후보를 찾고, 후보만 복호화해서 최종 확인
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import unicodedata
+
+from .crypto import HMAC_KEY
+
+# 이름 인덱스 전용 파생 키 (name_hash 등 다른 HMAC과 값이 겹치지 않게 분리)
+_GRAM_KEY = hmac.new(HMAC_KEY, b"blind-index:student-name", hashlib.sha256).digest()
+# 저장 공간을 줄이기 위해 앞 16바이트만 사용 (충돌은 복호화 확인 단계에서 걸러짐)
+GRAM_HASH_LEN = 32
+
+# ─────────────────────────────────────────────────────────────
+# 한글 자모
+# ─────────────────────────────────────────────────────────────
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_CHOSUNG_SET = frozenset(_CHOSUNG)
+
+
+def normalize(text: str) -> str:
+    """NFC 정규화 + 소문자 + 공백 제거"""
+    return "".join(unicodedata.normalize("NFC", text).lower().split())
+
+
+def chosung(text: str) -> str:
+    """음절을 초성으로 변환 (한글 음절이 아닌 글자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(_CHOSUNG[(code - _HANGUL_BASE) // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def is_chosung_query(text: str) -> bool:
+    return bool(text) and all(ch in _CHOSUNG_SET for ch in text)
+
+
+def _grams(text: str, prefix: str) -> set[str]:
+    grams = {prefix + ch for ch in text}
+    grams.update(prefix + text[i : i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+# ─────────────────────────────────────────────────────────────
+# Gram 생성 / 해시
+# ─────────────────────────────────────────────────────────────
+def name_grams(name: str) -> set[str]:
+    """인덱스에 저장할 gram (음절 's:', 초성 'c:')"""
+    text = normalize(name)
+    if not text:
+        return set()
+    return _grams(text, "s:") | _grams(chosung(text), "c:")
+
+
+def query_grams(query: str) -> set[str]:
+    """
+    검색어가 반드시 포함해야 하는 gram
+    2글자 이상이면 bigram만 (선택도가 높음), 1글자면 unigram
+    """
+    text = normalize(query)
+    if not text:
+        return set()
+    prefix = "c:" if is_chosung_query(text) else "s:"
+    if len(text) == 1:
+        return {prefix + text}
+    return {prefix + text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def gram_hash(gram: str) -> str:
+    return hmac.new(_GRAM_KEY, gram.encode("utf-8"), hashlib.sha256).hexdigest()[:GRAM_HASH_LEN]
+
+
+def name_gram_hashes(name: str) -> set[str]:
+    return {gram_hash(g) for g in name_grams(name)}
+
+
+def query_gram_hashes(query: str) -> set[str]:
+    return {gram_hash(g) for g in query_grams(query)}
+
+
+def name_matches(name: str, query: str) -> bool:
+    """복호화된 이름이 검색어를 포함하는지 (초성 검색 포함)"""
+    text = normalize(name)
+    q = normalize(query)
+    if not q:
+        return True
+    if is_chosung_query(q):
+        return q in chosung(text)
+    return q in text
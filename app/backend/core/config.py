@@ -8,9 +8,28 @@ ENV_FILE = Path(__file__).resolve().parents[1] / ".env"
 
 class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., description="SQLAlchemy async URL")
-    AES_KEY_B64: str | None = None
+    DATABASE_REPLICA_URL: str | None = None  # 읽기 전용 복제본 (없으면 primary 사용)
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # 쓰기 후 이 시간 동안 같은 교사의 읽기는 primary로
+
+    # 커넥션 풀 (uvicorn 워커마다 별도 풀: 워커 수 × (POOL_SIZE + MAX_OVERFLOW) ≤ max_connections)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # 풀에서 커넥션을 기다리는 최대 시간 (초)
+    DB_POOL_RECYCLE: int = 1800  # 이 시간(초)보다 오래된 커넥션은 재연결
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statement 캐시 (pgbouncer transaction 모드면 0)
+    DB_ECHO: bool = False
+    METRICS_MULTIPROC_DIR: str | None = None  # 여러 워커의 /metrics를 합칠 스냅샷 디렉터리 (배포 전 비우기)
+    METRICS_FLUSH_SECONDS: float = 5.0  # 워커 스냅샷 기록 주기
+    SQL_NPLUS1_THRESHOLD: int = 10  # 한 요청에서 같은 모양의 쿼리가 이 횟수를 넘으면 N+1 경고 (0이면 끔)
+    AES_KEY_B64: str | None = None  # key id 1
+    AES_KEYS_B64: str | None = None  # 키 교체용 추가 키 "2:<base64>,3:<base64>"
+    AES_CURRENT_KEY_ID: int = 1  # 새로 암호화할 때 사용할 key id
     HMAC_KEY_B64: str | None = None
+    DECRYPT_THREAD_THRESHOLD: int = 64  # 목록 복호화 값이 이 개수 이상이면 워커 스레드에서 실행
     ENV: str = "local"
+    # /metrics, /internal/* 접근 토큰 (Authorization: Bearer <토큰>), 없으면 ENV=local에서만 허용
+    INTERNAL_TOKEN: str | None = None
     
     # 카카오페이 설정
     KAKAO_PAY_ADMIN_KEY: str | None = None  # 카카오페이 Admin Key
@@ -20,6 +39,26 @@ class Settings(BaseSettings):
     # OpenAI 설정
     OPENAI_API_KEY: str | None = None  # OpenAI API Key
     OPENAI_MODEL: str = "gpt-4o"  # 사용할 모델
+    OPENAI_BASE_URL: str | None = None  # 프록시/테스트 서버 (기본: api.openai.com)
+    OPENAI_TIMEOUT_SECONDS: float = 30.0  # 요청 1건 타임아웃 (읽기/쓰기/풀 대기)
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_MAX_CONCURRENCY: int = 8  # 워커당 동시 OpenAI 호출 수 (초과분은 대기)
+    OPENAI_MAX_CONNECTIONS: int = 20  # 워커당 공유 httpx 커넥션 풀 크기
+    # AI 대화 기록 (core/redis.py) - Redis가 없으면 프로세스 메모리 사용
+    REDIS_URL: str | None = "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS: int = 20  # 워커당 커넥션 풀 크기
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    REDIS_RETRY_SECONDS: float = 30.0  # 연결 실패 후 이 시간 동안 메모리 저장소 사용
+    CONVERSATION_TTL_SECONDS: int = 3600
+    CONVERSATION_MAX_MESSAGES: int = 20  # 세션당 보관 메시지 수 (LTRIM)
+    CONVERSATION_MEMORY_SESSIONS: int = 1000  # 메모리 저장소 최대 세션 수 (LRU)
+    # LLM 응답 캐시 (core/llm_cache.py) - 워커 메모리(LRU) → Redis 순서로 조회
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_MEMORY_ENTRIES: int = 1000  # 워커당 메모리 캐시 항목 수
+    AI_WS_SILENCE_SECONDS: float = 1.0  # WS /ai/ws: 이 시간 동안 오디오 프레임이 없으면 발화 끝으로 보고 STT
+    AI_WS_MAX_AUDIO_BYTES: int = 10 * 1024 * 1024  # 발화 1건 오디오 최대 크기
 
     model_config = SettingsConfigDict(
         env_file=str(ENV_FILE),
@@ -5,7 +5,9 @@ import os
 import base64
 import hmac
 import hashlib
-from typing import Optional, Union, Any, Dict
+import json
+from functools import lru_cache
+from typing import Optional, Union, Any, Dict, List, Sequence
 
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import phonenumbers
@@ -73,8 +75,9 @@ def _aad_bytes(aad: Optional[Union[str, bytes, Dict[str, Any]]]) -> Optional[byt
 # ─────────────────────────────────────────────────────────────
 # Phone utilities
 # ─────────────────────────────────────────────────────────────
+@lru_cache(maxsize=8192)
 def to_e164(phone: str, region: str = "KR") -> str:
-    """Normalize phone number to E.164 (+821012345678)."""
+    """Normalize phone number to E.164 (+821012345678). phonenumbers 파싱이 느리므로 결과를 캐시"""
     try:
         num = phonenumbers.parse(phone, region)
     except phonenumbers.NumberParseException as e:
@@ -91,6 +94,22 @@ def hmac_sha256_hex(data: Union[str, bytes]) -> str:
     """Return hex-encoded HMAC-SHA256 signature."""
     return hmac.new(HMAC_KEY, _to_bytes(data), hashlib.sha256).hexdigest()
 
+def canonical_phone(phone: str) -> str:
+    """
+    해시용 전화번호 정규형: E.164, 유효하지 않은 번호면 숫자만 (앞의 + 유지)
+    "010-1234-5678", "01012345678", "+821012345678" → "+821012345678"
+    """
+    phone = phone.strip()
+    try:
+        return to_e164(phone)
+    except ValueError:
+        digits = "".join(ch for ch in phone if ch.isdigit())
+        return f"+{digits}" if phone.startswith("+") else digits
+
+def phone_hash_hex(phone: str) -> str:
+    """전화번호 해시 (phone_hash 컬럼 / 조회 공통)"""
+    return hmac_sha256_hex(canonical_phone(phone))
+
 def hmac_verify_hex(data: Union[str, bytes], hex_sig: str) -> bool:
     """Constant-time verification of hex signature."""
     try:
@@ -142,7 +161,7 @@ def aesgcm_decrypt(env: Dict[str, str], *, aad: Optional[Union[str, bytes, Dict[
     if len(nonce) != _NONCE_LEN:
         raise ValueError("Invalid nonce length for AES-GCM")
 
-    aes = AESGCM(AES_KEY)
+    aes = _aesgcm_for(_V1_KEY_ID)
     try:
         return aes.decrypt(nonce, ct, _aad_bytes(aad))
     except Exception as e:
@@ -158,3 +177,158 @@ def aesgcm_encrypt_str(plaintext: str, *, aad: Optional[Union[str, bytes, Dict[s
 
 def aesgcm_decrypt_str(env: Dict[str, str], *, aad: Optional[Union[str, bytes, Dict[str, Any]]] = None) -> str:
     return aesgcm_decrypt(env, aad=aad).decode("utf-8")
+
+
+# ─────────────────────────────────────────────────────────────
+# Binary envelope v2 (bytea 컬럼용)
+# Layout: version(1) | key_id(1) | nonce(12) | ciphertext+tag
+# - JSON/base64 없이 그대로 저장 → 11자리 전화번호 기준 약 100B → 약 41B
+# - key_id로 어떤 키로 암호화했는지 기록 (키 교체 대비)
+# ─────────────────────────────────────────────────────────────
+ENVELOPE_V2 = 0x02
+_V2_HEADER_LEN = 2 + _NONCE_LEN
+_GCM_TAG_LEN = 16
+
+def _load_key_ring() -> Dict[int, bytes]:
+    """key_id → AES 키 (AES_KEY_B64는 1번, AES_KEYS_B64로 교체용 키 추가)"""
+    ring: Dict[int, bytes] = {1: AES_KEY}
+    raw = getattr(settings, "AES_KEYS_B64", None)
+    if not raw:
+        return ring
+    for item in raw.split(","):
+        kid_str, sep, b64 = item.strip().partition(":")
+        try:
+            kid = int(kid_str)
+            key = base64.b64decode(b64)
+        except Exception as e:
+            raise RuntimeError("AES_KEYS_B64 must look like '2:<base64>,3:<base64>'") from e
+        if not sep or not 1 <= kid <= 255:
+            raise RuntimeError(f"AES_KEYS_B64: key id must be 1..255, got {kid_str!r}")
+        if len(key) != 32:
+            raise RuntimeError(f"AES_KEYS_B64: key {kid} must decode to 32 bytes, got {len(key)}")
+        if kid == 1 and key != AES_KEY:
+            raise RuntimeError("AES_KEYS_B64: key id 1 is reserved for AES_KEY_B64")
+        ring[kid] = key
+    return ring
+
+
+AES_KEYS: Dict[int, bytes] = _load_key_ring()
+CURRENT_KEY_ID: int = getattr(settings, "AES_CURRENT_KEY_ID", 1)
+if CURRENT_KEY_ID not in AES_KEYS:
+    raise RuntimeError(f"AES_CURRENT_KEY_ID={CURRENT_KEY_ID} has no key in AES_KEYS_B64")
+# v1 envelope에는 key id가 없으며 항상 AES_KEY로 암호화됨
+_V1_KEY_ID = 1
+
+# 키별 AESGCM 인스턴스 캐시 (매번 생성하지 않음)
+_AESGCM_BY_KEY_ID: Dict[int, AESGCM] = {}
+
+
+def _aesgcm_for(key_id: int) -> AESGCM:
+    aes = _AESGCM_BY_KEY_ID.get(key_id)
+    if aes is None:
+        try:
+            key = AES_KEYS[key_id]
+        except KeyError as e:
+            raise ValueError(f"Unknown encryption key id: {key_id}") from e
+        aes = _AESGCM_BY_KEY_ID[key_id] = AESGCM(key)
+    return aes
+
+
+def is_envelope_v2(blob: Union[bytes, bytearray, memoryview, None]) -> bool:
+    return (
+        blob is not None
+        and len(blob) >= _V2_HEADER_LEN + _GCM_TAG_LEN
+        and blob[0] == ENVELOPE_V2
+    )
+
+
+def aesgcm_encrypt_v2(plaintext: Union[str, bytes], *, key_id: int | None = None) -> bytes:
+    kid = CURRENT_KEY_ID if key_id is None else key_id
+    nonce = os.urandom(_NONCE_LEN)
+    ct = _aesgcm_for(kid).encrypt(nonce, _to_bytes(plaintext), None)
+    return bytes((ENVELOPE_V2, kid)) + nonce + ct
+
+
+def aesgcm_decrypt_v2(blob: Union[bytes, bytearray, memoryview]) -> bytes:
+    if not is_envelope_v2(blob):
+        raise ValueError("Invalid v2 envelope")
+    blob = bytes(blob)
+    nonce = blob[2:_V2_HEADER_LEN]
+    try:
+        return _aesgcm_for(blob[1]).decrypt(nonce, blob[_V2_HEADER_LEN:], None)
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError("Decryption failed (auth/tag verification error)") from e
+
+
+def decrypt_envelope_str(value: Union[bytes, bytearray, memoryview, str]) -> str:
+    """
+    v2 바이너리 / v1 JSON(문자열 또는 bytea로 변환된 바이트) 모두 복호화
+    둘 다 아니면 ValueError
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if is_envelope_v2(value):
+            return aesgcm_decrypt_v2(value).decode("utf-8")
+        value = bytes(value).decode("utf-8")
+    try:
+        envelope = json.loads(value)
+    except (json.JSONDecodeError, TypeError) as e:
+        raise ValueError("Not an encryption envelope") from e
+    return aesgcm_decrypt_str(envelope)
+
+
+def aesgcm_decrypt_many(
+    values: Sequence[Union[bytes, bytearray, memoryview, str, None]],
+    *,
+    plaintext_fallback: bool = False,
+) -> List[Optional[str]]:
+    """
+    여러 envelope(v1/v2)를 한 번에 복호화 (목록 응답용)
+    - 키별 AESGCM 인스턴스를 재사용하고, v2는 JSON 파싱 없이 바로 복호화
+    - None은 그대로 None
+    - plaintext_fallback이면 envelope가 아닌 값을 평문으로 간주 (마이그레이션 전 데이터)
+      envelope인데 복호화에 실패하면 (키 누락/손상) fallback 여부와 관계없이 ValueError
+    """
+    out: List[Optional[str]] = []
+    for value in values:
+        if value is None:
+            out.append(None)
+        elif plaintext_fallback and envelope_key_id(value) is None:
+            out.append(value if isinstance(value, str) else bytes(value).decode("utf-8", errors="replace"))
+        elif isinstance(value, (bytes, bytearray, memoryview)) and is_envelope_v2(value):
+            out.append(aesgcm_decrypt_v2(value).decode("utf-8"))
+        else:
+            out.append(decrypt_envelope_str(value))
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# 키 교체 (utils/rotate_keys)
+# ─────────────────────────────────────────────────────────────
+def envelope_key_id(value: Union[bytes, bytearray, memoryview, str, None]) -> Optional[int]:
+    """envelope를 암호화한 key id (v1은 항상 1), envelope가 아니면 None"""
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        if is_envelope_v2(value):
+            return value[1]
+        value = bytes(value).decode("utf-8", errors="replace")
+    if value.startswith("{") and '"ct"' in value:
+        return _V1_KEY_ID
+    return None
+
+
+def reencrypt_envelope(
+    value: Union[bytes, bytearray, memoryview, str],
+    *,
+    key_id: int | None = None,
+) -> Optional[bytes]:
+    """
+    envelope를 key_id(기본 CURRENT_KEY_ID)의 v2 envelope로 재암호화
+    이미 해당 키의 v2면 None (다시 쓸 필요 없음), envelope가 아니면 ValueError
+    """
+    kid = CURRENT_KEY_ID if key_id is None else key_id
+    if isinstance(value, (bytes, bytearray, memoryview)) and is_envelope_v2(value) and value[1] == kid:
+        return None
+    return aesgcm_encrypt_v2(decrypt_envelope_str(value), key_id=kid)
@@ -1,29 +1,113 @@
 # app/core/llm.py
+"""
+OpenAI 비동기 클라이언트 (LLM / STT / TTS 공용)
+- 워커마다 httpx.AsyncClient 하나를 공유 (커넥션 풀 재사용)
+- 요청 타임아웃 + 워커당 동시 호출 수 제한(OPENAI_MAX_CONCURRENCY)으로
+  AI 요청이 몰려도 이벤트 루프와 다른 API(일정/학생)가 막히지 않게 함
+"""
+import asyncio
 import os
-from openai import OpenAI
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+from openai import AsyncOpenAI
+
 from app.backend.core.config import settings
-import json
+from app.backend.core.llm_cache import get_llm_cache, make_key
+from app.backend.core.metrics import OPENAI_ERRORS, OPENAI_LATENCY, track
 
 # === 프록시 환경 변수 강제 제거 ===
 for key in list(os.environ.keys()):
     if key.lower() in ["http_proxy", "https_proxy", "HTTP_PROXY", "HTTPS_PROXY"]:
         del os.environ[key]
 
-# === OpenAI 클라이언트 생성 (지연 초기화) ===
-_llm_client: OpenAI | None = None
+# === OpenAI 클라이언트 (지연 초기화, 워커당 1개) ===
+_http_client: httpx.AsyncClient | None = None
+_llm_client: AsyncOpenAI | None = None
+_semaphore: asyncio.BoundedSemaphore | None = None
+# 테스트에서 가짜 OpenAI 서버를 붙일 때만 지정 (reset_llm_client)
+_transport: httpx.AsyncBaseTransport | None = None
 
-def get_llm_client() -> OpenAI:
-    """OpenAI LLM 클라이언트를 지연 초기화"""
-    global _llm_client
+
+def get_llm_client() -> AsyncOpenAI:
+    """공유 httpx 풀을 쓰는 AsyncOpenAI 클라이언트를 지연 초기화"""
+    global _http_client, _llm_client
     if _llm_client is None:
         api_key = settings.OPENAI_API_KEY or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. 환경변수 또는 .env 파일에 설정하세요.")
-        _llm_client = OpenAI(api_key=api_key)
+        _http_client = httpx.AsyncClient(
+            transport=_transport,
+            timeout=httpx.Timeout(settings.OPENAI_TIMEOUT_SECONDS, connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS,
+            ),
+        )
+        _llm_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=settings.OPENAI_BASE_URL,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=_http_client,
+        )
     return _llm_client
 
+
+async def close_llm_client() -> None:
+    """워커 종료 시 커넥션 풀 정리 (main.py lifespan)"""
+    global _http_client, _llm_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _llm_client = None
+
+
+def reset_llm_client(transport: httpx.AsyncBaseTransport | None = None) -> None:
+    """다음 호출에서 클라이언트/세마포어를 새로 만들도록 초기화 (이벤트 루프가 바뀌는 테스트용)"""
+    global _http_client, _llm_client, _semaphore, _transport
+    _http_client = None
+    _llm_client = None
+    _semaphore = None
+    _transport = transport
+
+
+def _get_semaphore() -> asyncio.BoundedSemaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.BoundedSemaphore(settings.OPENAI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+@asynccontextmanager
+async def openai_call(api: str):
+    """
+    OpenAI 호출 1건 (api: llm/stt/tts)
+    동시 호출 수 제한 + 지연 시간/실패 메트릭 (대기 시간은 지연 시간에 포함하지 않음)
+    """
+    async with _get_semaphore():
+        with track(OPENAI_LATENCY, OPENAI_ERRORS, api=api):
+            yield get_llm_client()
+
+
+def _cache_key(cache_key: str, response_format=None) -> str:
+    # 모델/응답 형식이 바뀌면 다른 키 (temperature는 항상 0)
+    return make_key(settings.OPENAI_MODEL, repr(response_format), cache_key)
+
+
 # app/core/llm.py
-def call_llm(messages: list, response_format=None):
+async def call_llm(messages: list, response_format=None, cache_key: str | None = None):
+    """
+    cache_key를 주면 같은 키의 성공 응답을 캐시에서 돌려줌 (core/llm_cache)
+    키에는 응답을 결정하는 내용(메시지, 대화 기록, 프롬프트)이 모두 들어가야 함
+    """
+    cache = get_llm_cache() if cache_key else None
+    if cache is not None:
+        cache_key = _cache_key(cache_key, response_format)
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     # 디버깅: messages를 안전하게 출력
     safe_messages = []
     for msg in messages:
@@ -41,10 +125,50 @@ def call_llm(messages: list, response_format=None):
         kwargs["response_format"] = response_format
 
     try:
-        client = get_llm_client()
-        response = client.chat.completions.create(**kwargs)
+        async with openai_call("llm") as client:
+            response = await client.chat.completions.create(**kwargs)
         content = response.choices[0].message.content.strip()
+        if cache is not None and content:
+            await cache.set(cache_key, content)
         return content
     except Exception as e:
         print(f"[LLM ERROR] {e}")
-        return "죄송해요, 다시 말씀해 주세요."
\ No newline at end of file
+        return "죄송해요, 다시 말씀해 주세요."
+
+
+async def stream_llm(messages: list, cache_key: str | None = None) -> AsyncIterator[str]:
+    """call_llm의 스트리밍 버전: 응답 텍스트 조각을 받는 대로 내보냄 (캐시 적중 시 한 번에)"""
+    cache = get_llm_cache() if cache_key else None
+    if cache is not None:
+        cache_key = _cache_key(cache_key)
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+
+    kwargs = {
+        "model": settings.OPENAI_MODEL,
+        "messages": messages,
+        "temperature": 0.0,
+        "stream": True,
+    }
+    parts: list[str] = []
+    try:
+        async with openai_call("llm") as client:
+            stream = await client.chat.completions.create(**kwargs)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    yield delta
+    except Exception as e:
+        print(f"[LLM ERROR] {e}")
+        if not parts:
+            yield "죄송해요, 다시 말씀해 주세요."
+        return
+    content = "".join(parts).strip()
+    if cache is not None and content:
+        await cache.set(cache_key, content)
+
@@ -0,0 +1,135 @@
+# app/core/llm_cache.py
+"""
+LLM 응답 캐시 (temperature 0 호출 전용)
+- 1단계: 워커 메모리 LRU (TTL), 2단계: Redis (llm:{key}, SET EX) → 다른 워커가 받은 응답도 재사용
+- Redis에서 찾으면 메모리에도 올려 둠
+- 키는 호출하는 쪽이 만듦 (services/intent_extractor: 정규화한 메시지 + 대화 기록 지문 + 프롬프트 버전)
+- Redis 오류는 캐시 미스로 처리하고 REDIS_RETRY_SECONDS 동안 메모리 캐시만 사용
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+
+import redis
+import redis.asyncio as aioredis
+
+from app.backend.core.config import settings
+from app.backend.core.metrics import LLM_CACHE, REDIS_ERRORS, REDIS_LATENCY, track
+from app.backend.core.redis import new_async_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "llm:"
+
+
+def make_key(*parts: str) -> str:
+    """키 구성 요소를 이어서 해시 (Redis 키 길이 고정, 메시지 원문은 저장하지 않음)"""
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class MemoryLLMCache:
+    """워커 메모리 캐시 (항목 수 LRU 제한 + TTL)"""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key → (만료 시각(monotonic), 응답)
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class LLMCache:
+    def __init__(self, memory: MemoryLLMCache, client: aioredis.Redis | None, ttl: int):
+        self.memory = memory
+        self.client = client
+        self.ttl = ttl
+        self._retry_at = 0.0
+
+    def _redis_available(self) -> bool:
+        return self.client is not None and time.monotonic() >= self._retry_at
+
+    def _redis_failed(self, e: Exception) -> None:
+        self._retry_at = time.monotonic() + settings.REDIS_RETRY_SECONDS
+        logger.warning(f"LLM 캐시 Redis 연결 실패, {settings.REDIS_RETRY_SECONDS:.0f}초 동안 메모리 캐시만 사용: {e}")
+
+    async def get(self, key: str) -> str | None:
+        value = self.memory.get(key)
+        if value is not None:
+            LLM_CACHE.inc(result="memory")
+            return value
+        if self._redis_available():
+            try:
+                with track(REDIS_LATENCY, REDIS_ERRORS, command="llm_cache_get"):
+                    value = await self.client.get(KEY_PREFIX + key)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._redis_failed(e)
+            if value is not None:
+                LLM_CACHE.inc(result="redis")
+                self.memory.set(key, value)
+                return value
+        LLM_CACHE.inc(result="miss")
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self._redis_available():
+            try:
+                with track(REDIS_LATENCY, REDIS_ERRORS, command="llm_cache_set"):
+                    await self.client.set(KEY_PREFIX + key, value, ex=self.ttl)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._redis_failed(e)
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+
+_cache: LLMCache | None = None
+
+
+def get_llm_cache() -> LLMCache | None:
+    """워커당 하나, LLM_CACHE_ENABLED=false면 None"""
+    global _cache
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        ttl = settings.LLM_CACHE_TTL_SECONDS
+        client = new_async_client() if settings.REDIS_URL else None
+        _cache = LLMCache(MemoryLLMCache(settings.LLM_CACHE_MEMORY_ENTRIES, ttl), client, ttl)
+    return _cache
+
+
+async def close_llm_cache() -> None:
+    """워커 종료 시 커넥션 풀 정리 (main.py lifespan)"""
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+    _cache = None
+
+
+def reset_llm_cache() -> None:
+    """다음 호출에서 설정을 다시 읽어 캐시를 만들도록 초기화 (테스트용)"""
+    global _cache
+    _cache = None
@@ -0,0 +1,378 @@
+"""
+프로세스 내 메트릭 레지스트리 + Prometheus 텍스트 포맷 출력 (GET /metrics)
+- Counter / Histogram / Gauge(콜백)만 지원 (prometheus_client 없이 동작)
+- 여러 uvicorn 워커: METRICS_MULTIPROC_DIR을 지정하면 워커마다 {pid}.json 스냅샷을 주기적으로 쓰고
+  /metrics는 디렉터리의 모든 스냅샷을 합쳐서 출력
+  · Counter/Histogram은 합산 (종료된 워커 값도 유지해서 카운터가 줄지 않음)
+  · Gauge는 pid 라벨을 붙이고 살아 있는 워커 값만 출력
+  · 배포(재시작) 전에 디렉터리를 비울 것
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable
+
+from app.backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 기본 지연 시간 히스토그램 상한 (초), 마지막 칸은 +Inf
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _labels_key(labelnames: tuple[str, ...], labels: dict) -> LabelValues:
+    return tuple(str(labels[name]) for name in labelnames)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> dict:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"values": [[list(k), v] for k, v in self._values.items()]}
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 → [칸별 개수(+Inf 포함, 누적 아님), 합계]
+        self._values: dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _labels_key(self.labelnames, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "buckets": list(self.buckets),
+                "values": [[list(k), list(counts), total] for k, (counts, total) in self._values.items()],
+            }
+
+
+class Gauge(_Metric):
+    """스크레이프 시점에 callback()으로 값을 읽는 게이지 ({라벨 값 튜플: 값})"""
+
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), callback: Callable[[], dict] | None = None):
+        super().__init__(name, documentation, labelnames)
+        self._callback = callback
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = _labels_key(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = value
+
+    def snapshot(self) -> dict:
+        if self._callback is not None:
+            try:
+                values = {tuple(str(v) for v in k): float(val) for k, val in self._callback().items()}
+            except Exception as e:  # 콜백 오류로 /metrics 전체가 깨지지 않게
+                logger.warning(f"gauge {self.name} callback failed: {e}")
+                values = {}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return {"values": [[list(k), v] for k, v in values.items()]}
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            # 모듈 재로딩 등으로 같은 이름이 다시 등록되면 기존 객체 유지
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "type": m.type_name,
+                "help": m.documentation,
+                "labelnames": list(m.labelnames),
+                **m.snapshot(),
+            }
+            for name, m in self._metrics.items()
+        }
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(
+    name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Iterable[float] = LATENCY_BUCKETS
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+def gauge(
+    name: str, documentation: str, labelnames: Iterable[str] = (), callback: Callable[[], dict] | None = None
+) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames, callback))
+
+
+@contextmanager
+def track(latency: Histogram, errors: Counter | None = None, **labels):
+    """블록 실행 시간을 latency에 기록하고, 예외가 나면 errors도 증가"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:  # 취소/클라이언트 연결 끊김은 실패로 세지 않음
+        if errors is not None:
+            errors.inc(**labels)
+        raise
+    finally:
+        latency.observe(time.perf_counter() - start, **labels)
+
+
+# ─────────────────────────────────────────────────────────────
+# 공용 메트릭
+# ─────────────────────────────────────────────────────────────
+HTTP_REQUESTS = counter("http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+HTTP_LATENCY = histogram("http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+OPENAI_LATENCY = histogram("openai_request_duration_seconds", "OpenAI API 호출 시간", ("api",))
+OPENAI_ERRORS = counter("openai_errors_total", "OpenAI API 호출 실패 수", ("api",))
+LLM_CACHE = counter("llm_cache_total", "LLM 응답 캐시 조회 결과 (memory/redis=적중, miss)", ("result",))
+AI_INTENT = counter("ai_intent_total", "AI 의도 추출 경로별 처리 수 (fast=규칙 파서, llm)", ("path",))
+TTS_FIRST_AUDIO = histogram("tts_time_to_first_audio_seconds", "스트리밍 TTS 요청부터 첫 오디오 청크까지 걸린 시간")
+KAKAOPAY_LATENCY = histogram("kakaopay_request_duration_seconds", "카카오페이 API 호출 시간", ("operation",))
+KAKAOPAY_ERRORS = counter("kakaopay_errors_total", "카카오페이 API 호출 실패 수", ("operation",))
+REDIS_LATENCY = histogram(
+    "redis_command_duration_seconds",
+    "Redis 명령 실행 시간",
+    ("command",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+REDIS_ERRORS = counter("redis_errors_total", "Redis 명령 실패 수", ("command",))
+
+
+# ─────────────────────────────────────────────────────────────
+# 멀티 프로세스 스냅샷
+# ─────────────────────────────────────────────────────────────
+def _multiproc_dir() -> Path | None:
+    path = settings.METRICS_MULTIPROC_DIR
+    return Path(path) if path else None
+
+
+def write_snapshot() -> None:
+    """현재 워커의 스냅샷을 {dir}/{pid}.json에 원자적으로 기록"""
+    directory = _multiproc_dir()
+    if directory is None:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+    tmp = directory / f".{pid}.json.tmp"
+    tmp.write_text(json.dumps({"pid": pid, "metrics": REGISTRY.snapshot()}), encoding="utf-8")
+    os.replace(tmp, directory / f"{pid}.json")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _collect() -> list[tuple[int, dict]]:
+    directory = _multiproc_dir()
+    if directory is None:
+        return [(os.getpid(), REGISTRY.snapshot())]
+    write_snapshot()
+    snapshots = []
+    for path in sorted(directory.glob("*.json")):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue  # 다른 워커가 교체 중
+        snapshots.append((int(data["pid"]), data["metrics"]))
+    return snapshots
+
+
+def _merge(snapshots: list[tuple[int, dict]], per_pid_gauges: bool) -> dict:
+    merged: dict[str, dict] = {}
+    for pid, metrics in snapshots:
+        alive = None
+        for name, m in metrics.items():
+            out = merged.setdefault(
+                name,
+                {"type": m["type"], "help": m["help"], "labelnames": m["labelnames"], "values": {}},
+            )
+            if m["type"] == "gauge":
+                if per_pid_gauges:
+                    if alive is None:
+                        alive = _pid_alive(pid)
+                    if not alive:
+                        continue
+                    for labels, value in m["values"]:
+                        out["values"][(*labels, str(pid))] = value
+                else:
+                    for labels, value in m["values"]:
+                        out["values"][tuple(labels)] = value
+            elif m["type"] == "counter":
+                for labels, value in m["values"]:
+                    key = tuple(labels)
+                    out["values"][key] = out["values"].get(key, 0.0) + value
+            else:
+                out["buckets"] = m["buckets"]
+                for labels, counts, total in m["values"]:
+                    key = tuple(labels)
+                    prev = out["values"].get(key)
+                    if prev is None or len(prev[0]) != len(counts):
+                        out["values"][key] = [list(counts), total]
+                    else:
+                        prev[0] = [a + b for a, b in zip(prev[0], counts)]
+                        prev[1] += total
+    if per_pid_gauges:
+        for m in merged.values():
+            if m["type"] == "gauge":
+                m["labelnames"] = [*m["labelnames"], "pid"]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Iterable[str], values: Iterable[str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render() -> str:
+    """Prometheus text exposition format (0.0.4)"""
+    merged = _merge(_collect(), per_pid_gauges=_multiproc_dir() is not None)
+    lines: list[str] = []
+    for name, m in merged.items():
+        lines.append(f"# HELP {name} {m['help']}")
+        lines.append(f"# TYPE {name} {m['type']}")
+        labelnames = m["labelnames"]
+        if m["type"] != "histogram":
+            for labels, value in m["values"].items():
+                lines.append(f"{name}{_label_str(labelnames, labels)} {_fmt(value)}")
+            continue
+        bounds = [*m.get("buckets", []), float("inf")]
+        for labels, (counts, total) in m["values"].items():
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else _fmt(bound)
+                lines.append(f"{name}_bucket{_label_str(labelnames, labels, ('le', le))} {cumulative}")
+            lines.append(f"{name}_sum{_label_str(labelnames, labels)} {_fmt(total)}")
+            lines.append(f"{name}_count{_label_str(labelnames, labels)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+async def snapshot_writer() -> None:
+    """METRICS_MULTIPROC_DIR이 있을 때 METRICS_FLUSH_SECONDS마다 스냅샷 기록 (main.py lifespan에서 실행)"""
+    while True:
+        await asyncio.sleep(settings.METRICS_FLUSH_SECONDS)
+        try:
+            write_snapshot()
+        except OSError as e:
+            logger.warning(f"metrics snapshot write failed: {e}")
+
+
+# ─────────────────────────────────────────────────────────────
+# HTTP 미들웨어
+# ─────────────────────────────────────────────────────────────
+class MetricsMiddleware:
+    """
+    라우트 템플릿(/students/{student_id}) 기준 요청 수/처리 시간 기록
+    매칭되는 라우트가 없으면 route="unmatched" (경로별 라벨 폭증 방지)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=method, route=route)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
@@ -1,16 +1,172 @@
 # app/core/redis.py
-import redis
+"""
+AI 어시스턴트 대화 기록 저장소
+- Redis 리스트(conv:{session_id})에 메시지를 하나씩 추가: RPUSH + LTRIM + EXPIRE를 파이프라인 1번으로
+- 읽을 때는 최근 N개만 LRANGE
+- REDIS_URL이 없거나 Redis에 연결할 수 없으면 프로세스 메모리(LRU)에 저장하고,
+  REDIS_RETRY_SECONDS 후 다시 Redis를 시도 (로컬 실행/테스트에 Redis 서버 불필요)
+"""
+from __future__ import annotations
+
 import json
-from typing import List, Dict
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List
+
+import redis
+import redis.asyncio as aioredis
+
+from app.backend.core.config import settings
+from app.backend.core.metrics import REDIS_ERRORS, REDIS_LATENCY, track
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "conv:"
+
+
+def _key(session_id: str) -> str:
+    return f"{KEY_PREFIX}{session_id}"
+
+
+class MemoryConversationStore:
+    """프로세스 메모리 저장소 (세션 수 LRU 제한 + TTL), 워커 간에는 공유되지 않음"""
+
+    def __init__(self, max_sessions: int, max_messages: int, ttl: int):
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.ttl = ttl
+        # session_id → (만료 시각(monotonic), 메시지)
+        self._sessions: OrderedDict[str, tuple[float, deque]] = OrderedDict()
+
+    def _get(self, session_id: str) -> deque | None:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires_at, messages = entry
+        if expires_at < time.monotonic():
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return messages
+
+    async def append(self, session_id: str, *messages: Dict) -> None:
+        current = self._get(session_id)
+        if current is None:
+            current = deque(maxlen=self.max_messages)
+        current.extend(messages)
+        self._sessions[session_id] = (time.monotonic() + self.ttl, current)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    async def recent(self, session_id: str, limit: int) -> List[Dict]:
+        current = self._get(session_id)
+        if not current:
+            return []
+        return list(current)[-limit:]
+
+    async def clear(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+
+class RedisConversationStore:
+    def __init__(self, client: aioredis.Redis, max_messages: int, ttl: int):
+        self.client = client
+        self.max_messages = max_messages
+        self.ttl = ttl
+
+    async def append(self, session_id: str, *messages: Dict) -> None:
+        key = _key(session_id)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.rpush(key, *(json.dumps(m, ensure_ascii=False) for m in messages))
+        pipe.ltrim(key, -self.max_messages, -1)
+        pipe.expire(key, self.ttl)
+        with track(REDIS_LATENCY, REDIS_ERRORS, command="append"):
+            await pipe.execute()
+
+    async def recent(self, session_id: str, limit: int) -> List[Dict]:
+        with track(REDIS_LATENCY, REDIS_ERRORS, command="lrange"):
+            raw = await self.client.lrange(_key(session_id), -limit, -1)
+        return [json.loads(item) for item in raw]
+
+    async def clear(self, session_id: str) -> None:
+        with track(REDIS_LATENCY, REDIS_ERRORS, command="delete"):
+            await self.client.delete(_key(session_id))
+
+
+class ConversationStore:
+    """Redis 우선, 연결 오류가 나면 메모리 저장소로 전환 (REDIS_RETRY_SECONDS 후 재시도)"""
+
+    def __init__(self, primary: RedisConversationStore | None, fallback: MemoryConversationStore):
+        self.primary = primary
+        self.fallback = fallback
+        self._retry_at = 0.0
+
+    async def _call(self, method: str, *args):
+        if self.primary is not None and time.monotonic() >= self._retry_at:
+            try:
+                return await getattr(self.primary, method)(*args)
+            except (redis.ConnectionError, redis.TimeoutError) as e:
+                self._retry_at = time.monotonic() + settings.REDIS_RETRY_SECONDS
+                logger.warning(
+                    f"Redis 연결 실패, {settings.REDIS_RETRY_SECONDS:.0f}초 동안 메모리 저장소 사용: {e}"
+                )
+        return await getattr(self.fallback, method)(*args)
+
+    async def append(self, session_id: str, *messages: Dict) -> None:
+        """메시지 추가 (세션당 CONVERSATION_MAX_MESSAGES개 유지, TTL 갱신)"""
+        await self._call("append", session_id, *messages)
+
+    async def recent(self, session_id: str, limit: int) -> List[Dict]:
+        """최근 limit개 메시지 (오래된 것부터)"""
+        return await self._call("recent", session_id, limit)
+
+    async def clear(self, session_id: str) -> None:
+        await self._call("clear", session_id)
+
+    async def close(self) -> None:
+        if self.primary is not None:
+            await self.primary.client.aclose()
+
+
+def new_async_client() -> aioredis.Redis:
+    """REDIS_URL 설정으로 비동기 클라이언트(커넥션 풀) 생성 (core/llm_cache도 사용)"""
+    return aioredis.Redis.from_url(
+        settings.REDIS_URL,
+        decode_responses=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    )
+
+
+_store: ConversationStore | None = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """워커당 하나 (커넥션 풀 공유)"""
+    global _store
+    if _store is None:
+        ttl = settings.CONVERSATION_TTL_SECONDS
+        max_messages = settings.CONVERSATION_MAX_MESSAGES
+        primary = None
+        if settings.REDIS_URL:
+            primary = RedisConversationStore(new_async_client(), max_messages, ttl)
+        fallback = MemoryConversationStore(settings.CONVERSATION_MEMORY_SESSIONS, max_messages, ttl)
+        _store = ConversationStore(primary, fallback)
+    return _store
 
-r = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
 
-def save_conversation(session_id: str, messages: List[Dict], ttl: int = 3600):
-    r.setex(session_id, ttl, json.dumps(messages))
+async def close_conversation_store() -> None:
+    """워커 종료 시 커넥션 풀 정리 (main.py lifespan)"""
+    global _store
+    if _store is not None:
+        await _store.close()
+    _store = None
 
-def get_conversation(session_id: str) -> List[Dict]:
-    data = r.get(session_id)
-    return json.loads(data) if data else []
 
-def clear_conversation(session_id: str):
-    r.delete(session_id)
\ No newline at end of file
+def reset_conversation_store() -> None:
+    """다음 호출에서 설정을 다시 읽어 저장소를 만들도록 초기화 (테스트용)"""
+    global _store
+    _store = None
@@ -6,10 +6,14 @@ from app.backend.db.models import (
     Category,
     Subject,
     Student,
+    StudentNameGram,
     Teacher,
     Schedule,
+    ScheduleRule,
+    ScheduleRuleException,
     Invoice,
     InvoiceItem,
+    KeyRotationCheckpoint,
 )  # noqa: F401
 
 
@@ -0,0 +1,50 @@
+"""
+목록 응답용 일괄 복호화
+- 암호화 컬럼을 엔티티 로드에서 빼고(defer) 암호문(bytea)을 그대로 추가 컬럼으로 SELECT
+- 한 페이지 분량을 aesgcm_decrypt_many로 한 번에 복호화하고, 많으면 워커 스레드에서 실행
+- 복호화한 값은 set_committed_value로 객체에 채움 (변경으로 간주되지 않음)
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Sequence
+
+from sqlalchemy import LargeBinary, Select, type_coerce
+from sqlalchemy.orm import defer
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.backend.core.config import settings
+from app.backend.core.crypto import aesgcm_decrypt_many
+
+
+async def decrypt_values(values: Sequence[Any]) -> list[str | None]:
+    """값이 DECRYPT_THREAD_THRESHOLD개 이상이면 이벤트 루프를 막지 않도록 스레드에서 복호화"""
+    if len(values) >= settings.DECRYPT_THREAD_THRESHOLD:
+        return await asyncio.to_thread(aesgcm_decrypt_many, values, plaintext_fallback=True)
+    return aesgcm_decrypt_many(values, plaintext_fallback=True)
+
+
+def defer_encrypted(model, keys: Sequence[str]) -> tuple:
+    """엔티티 로드에서 제외할 암호화 컬럼 옵션 (select(...).options(*defer_encrypted(...)))"""
+    return tuple(defer(getattr(model, key)) for key in keys)
+
+
+def with_raw_encrypted(stmt: Select, model, keys: Sequence[str]) -> Select:
+    """엔티티 select 뒤에 keys 순서대로 암호문 컬럼을 추가 (EncryptedString 복호화를 거치지 않음)"""
+    table = model.__table__
+    return stmt.add_columns(*(type_coerce(table.c[key], LargeBinary) for key in keys))
+
+
+async def attach_decrypted(rows: Sequence[Any], keys: Sequence[str]) -> list[Any]:
+    """
+    with_raw_encrypted로 조회한 행 (엔티티, 암호문...)을 일괄 복호화해 엔티티에 채우고 엔티티 목록 반환
+    """
+    width = len(keys)
+    plain = await decrypt_values([value for row in rows for value in row[1 : 1 + width]])
+    objs = []
+    for i, row in enumerate(rows):
+        obj = row[0]
+        for j, key in enumerate(keys):
+            set_committed_value(obj, key, plain[i * width + j])
+        objs.append(obj)
+    return objs
@@ -1,14 +1,85 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session, declarative_base
 
+from app.backend.core import metrics
 from app.backend.core.config import settings  # settings.DATABASE_URL 읽는다고 가정
+from app.backend.db.instrumentation import instrument_engine
+from app.backend.db.pool import instrumented_pool_class, pool_status
 
 DATABASE_URL = settings.DATABASE_URL  # postgresql+asyncpg://...
 
-engine = create_async_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+def create_engine_from_settings(url: str, *, name: str = "primary") -> AsyncEngine:
+    """
+    앱 전체에서 쓰는 유일한 엔진 팩토리
+    풀 크기/재활용/타임아웃과 asyncpg statement 캐시는 core/config.Settings의 DB_* 값 사용
+    요청 단위 SQL 계측(db/instrumentation.py) 이벤트도 여기서 등록
+    """
+    kwargs: dict = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":
+        kwargs.update(
+            poolclass=instrumented_pool_class(name),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if make_url(url).get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    async_engine = create_async_engine(url, **kwargs)
+    instrument_engine(async_engine)
+    return async_engine
+
+
+engine = create_engine_from_settings(DATABASE_URL)
+# 복제본이 없으면 primary 엔진을 그대로 사용
+replica_engine = (
+    create_engine_from_settings(settings.DATABASE_REPLICA_URL, name="replica")
+    if settings.DATABASE_REPLICA_URL
+    else engine
+)
+
+
+
+class PrimarySession(Session):
+    """primary 쓰기 세션 (커밋 시 read-your-writes 고정은 db/routing.py의 이벤트가 처리)"""
+
+
+AsyncSessionLocal = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=PrimarySession
+)
+ReadSessionLocal = async_sessionmaker(replica_engine, expire_on_commit=False, class_=AsyncSession)
 Base = declarative_base()
 
 async def get_session() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def engine_pool_stats() -> dict:
+    """엔진별 풀 상태 (내부 모니터링용)"""
+    stats = {"primary": pool_status(engine.pool)}
+    if replica_engine is not engine:
+        stats["replica"] = pool_status(replica_engine.pool)
+    return stats
+
+
+_POOL_GAUGE_KEYS = ("size", "checked_out", "checked_in", "overflow")
+
+
+def _pool_gauge_values() -> dict:
+    values = {}
+    for name, stats in engine_pool_stats().items():
+        for key in _POOL_GAUGE_KEYS:
+            if key in stats:
+                values[(name, key)] = stats[key]
+    return values
+
+
+metrics.gauge(
+    "db_pool_connections",
+    "커넥션 풀 상태 (state=size/checked_out/checked_in/overflow)",
+    ("engine", "state"),
+    _pool_gauge_values,
+)
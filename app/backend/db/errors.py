@@ -0,0 +1,22 @@
+"""
+DB 제약 위반 판별 헬퍼
+asyncpg 드라이버 오류는 SQLAlchemy IntegrityError.orig.sqlstate로 노출됩니다.
+"""
+from __future__ import annotations
+
+from sqlalchemy.exc import IntegrityError
+
+# PostgreSQL SQLSTATE
+EXCLUSION_VIOLATION = "23P01"
+
+
+def _sqlstate(exc: IntegrityError) -> str | None:
+    orig = getattr(exc, "orig", None)
+    return getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+
+
+def is_exclusion_violation(exc: IntegrityError, constraint: str | None = None) -> bool:
+    """EXCLUDE 제약 위반인지 확인 (constraint를 주면 제약 이름까지 비교)"""
+    if _sqlstate(exc) != EXCLUSION_VIOLATION:
+        return False
+    return constraint is None or constraint in str(exc.orig)
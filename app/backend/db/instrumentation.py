@@ -0,0 +1,189 @@
+"""
+요청 단위 SQL 계측
+- 엔진 커서 이벤트로 요청마다 쿼리 수, 총 DB 시간, 가장 느린 쿼리를 기록
+- SQLInstrumentationMiddleware가 Server-Timing 헤더와 로그 한 줄(JSON)로 내보냄
+- 같은 모양(리터럴/바인드 값 제외)의 쿼리가 한 요청에서 SQL_NPLUS1_THRESHOLD번을 넘으면 N+1 경고
+- 요청 밖(스크립트, 백그라운드 작업)의 쿼리는 기록하지 않음
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+
+from sqlalchemy import event
+
+from app.backend.core.config import settings
+
+logger = logging.getLogger("app.backend.sql")
+
+# 로그/경고에 남길 SQL 최대 길이
+_SQL_PREVIEW_LEN = 300
+
+
+class QueryStats:
+    __slots__ = ("count", "total", "slowest", "slowest_sql", "shapes")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_sql = ""
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds >= self.slowest:
+            self.slowest = seconds
+            self.slowest_sql = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """threshold번을 넘게 실행된 쿼리 모양"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("sql_query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+# ─────────────────────────────────────────────────────────────
+# 쿼리 모양
+# ─────────────────────────────────────────────────────────────
+_PLACEHOLDER = r"(?:\$\d+|\?|%\(\w+\)s|%s)"
+_PLACEHOLDER_LIST_RE = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_PLACEHOLDER_RE = re.compile(_PLACEHOLDER)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """바인드 값/리터럴/IN 목록 길이를 지운 쿼리 (N+1 집계 키)"""
+    shape = _STRING_RE.sub("?", statement)
+    shape = _PLACEHOLDER_LIST_RE.sub("(?)", shape)
+    shape = _PLACEHOLDER_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+# ─────────────────────────────────────────────────────────────
+# 엔진 이벤트
+# ─────────────────────────────────────────────────────────────
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context):
+    # 실패한 쿼리의 시작 시각이 남지 않게 정리
+    conn = exception_context.connection
+    if conn is not None and _current.get() is not None:
+        starts = conn.info.get("query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    """AsyncEngine/Engine에 커서 이벤트 등록 (db/database.create_engine_from_settings에서 호출)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# ─────────────────────────────────────────────────────────────
+# 미들웨어
+# ─────────────────────────────────────────────────────────────
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.total * 1000:.1f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest * 1000:.1f}, "
+        f"app;dur={elapsed * 1000:.1f}"
+    )
+
+
+class SQLInstrumentationMiddleware:
+    """
+    요청마다 QueryStats를 contextvar에 두고 응답 헤더/로그로 내보내는 ASGI 미들웨어
+    스트리밍 응답에서 헤더 전송 후 실행된 쿼리는 로그에만 반영됨
+    """
+
+    def __init__(self, app, nplus1_threshold: int | None = None):
+        self.app = app
+        self.nplus1_threshold = (
+            settings.SQL_NPLUS1_THRESHOLD if nplus1_threshold is None else nplus1_threshold
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (b"server-timing", server_timing(stats, time.perf_counter() - start).encode("latin-1"))
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._report(scope, status_code, stats, time.perf_counter() - start)
+
+    def _report(self, scope, status_code: int, stats: QueryStats, elapsed: float) -> None:
+        path = scope.get("path", "")
+        method = scope.get("method", "")
+        payload = {
+            "method": method,
+            "path": path,
+            "status": status_code,
+            "duration_ms": round(elapsed * 1000, 2),
+            "db_queries": stats.count,
+            "db_ms": round(stats.total * 1000, 2),
+            "db_slowest_ms": round(stats.slowest * 1000, 2),
+        }
+        if stats.count:
+            payload["db_slowest_sql"] = stats.slowest_sql[:_SQL_PREVIEW_LEN]
+        logger.info("sql_stats %s", json.dumps(payload, ensure_ascii=False), extra={"sql_stats": payload})
+
+        if self.nplus1_threshold > 0:
+            for shape, n in stats.repeated(self.nplus1_threshold):
+                logger.warning(
+                    "N+1 의심: %s %s 에서 같은 쿼리 %d번 실행: %s",
+                    method,
+                    path,
+                    n,
+                    shape[:_SQL_PREVIEW_LEN],
+                )
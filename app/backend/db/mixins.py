@@ -2,38 +2,68 @@
 SQLAlchemy Mixins for automatic hash field management
 암호화된 필드의 해시값을 자동으로 생성합니다.
 """
-from sqlalchemy import event
+from sqlalchemy import Table, event, inspect
 from sqlalchemy.orm import Session
-from app.backend.core.crypto import hmac_sha256_hex
+from app.backend.core.blind_index import name_gram_hashes
+from app.backend.core.crypto import hmac_sha256_hex, phone_hash_hex
 
 
-def setup_hash_fields(model_class):
+def _changed(target, key: str) -> bool:
+    return inspect(target).attrs[key].history.has_changes()
+
+
+def setup_hash_fields(model_class, name_gram_table: Table | None = None):
     """
     모델 클래스에 해시 필드 자동 업데이트 이벤트 리스너 등록
+    name_gram_table을 주면 이름 부분 검색용 blind n-gram 인덱스도 함께 갱신
     """
     @event.listens_for(model_class, "before_insert", propagate=True)
     @event.listens_for(model_class, "before_update", propagate=True)
     def receive_before_insert_or_update(mapper, connection, target):
-        """저장/수정 전에 해시 필드 자동 업데이트"""
+        """저장/수정 전에 해시 필드 자동 업데이트 (값이 새로 들어왔거나 바뀐 경우)"""
         # Student 모델
         if hasattr(target, 'name') and hasattr(target, 'name_hash'):
-            if target.name and not target.name_hash:
-                # name이 있고 name_hash가 없으면 생성
+            if target.name and (not target.name_hash or _changed(target, 'name')):
                 # name은 암호화 전 평문이어야 함
                 target.name_hash = hmac_sha256_hex(target.name)
+
+        # Student / Teacher 공통: 전화번호는 E.164로 정규화 후 해시 (표기 형식이 달라도 같은 해시)
         if hasattr(target, 'phone') and hasattr(target, 'phone_hash'):
-            if target.phone and not target.phone_hash:
-                # phone이 있고 phone_hash가 없으면 생성
-                target.phone_hash = hmac_sha256_hex(target.phone)
-        
+            if target.phone and (not target.phone_hash or _changed(target, 'phone')):
+                target.phone_hash = phone_hash_hex(target.phone)
+
         # Teacher 모델
-        if hasattr(target, 'phone') and hasattr(target, 'phone_hash'):
-            if target.phone and not target.phone_hash:
-                target.phone_hash = hmac_sha256_hex(target.phone)
         if hasattr(target, 'email') and hasattr(target, 'email_hash'):
             if target.email:
-                if not target.email_hash:
+                if not target.email_hash or _changed(target, 'email'):
                     target.email_hash = hmac_sha256_hex(target.email)
             else:
                 target.email_hash = None
 
+    if name_gram_table is None:
+        return
+
+    pk = inspect(model_class).primary_key[0]
+    fk_col = next(c for c in name_gram_table.c if c.name == pk.name)
+
+    def _write_name_grams(connection, target, *, replace: bool):
+        target_id = getattr(target, pk.key)
+        if replace:
+            connection.execute(name_gram_table.delete().where(fk_col == target_id))
+        hashes = name_gram_hashes(target.name) if target.name else set()
+        if hashes:
+            connection.execute(
+                name_gram_table.insert(),
+                [{"gram_hash": h, fk_col.name: target_id} for h in sorted(hashes)],
+            )
+
+    @event.listens_for(model_class, "after_insert", propagate=True)
+    def receive_after_insert(mapper, connection, target):
+        """새 행의 이름 n-gram 인덱스 생성 (같은 트랜잭션)"""
+        _write_name_grams(connection, target, replace=False)
+
+    @event.listens_for(model_class, "after_update", propagate=True)
+    def receive_after_update(mapper, connection, target):
+        """이름이 바뀐 경우에만 n-gram 인덱스 재생성"""
+        if inspect(target).attrs.name.history.has_changes():
+            _write_name_grams(connection, target, replace=True)
@@ -1,21 +1,28 @@
 from .category import Category
 from .subject import Subject
 from .student import Student
+from .student_name_gram import StudentNameGram
 from .teacher import Teacher
 from .schedule import Schedule
+from .schedule_rule import ScheduleRule, ScheduleRuleException
 from .invoice import Invoice
 from .invoice_item import InvoiceItem
 from .student_history import StudentHistory
 from .teacher_history import TeacherHistory
+from .key_rotation_checkpoint import KeyRotationCheckpoint
 
 __all__ = [
     "Category",
     "Subject",
     "Student",
+    "StudentNameGram",
     "Teacher",
     "Schedule",
+    "ScheduleRule",
+    "ScheduleRuleException",
     "Invoice",
     "InvoiceItem",
     "StudentHistory",
     "TeacherHistory",
+    "KeyRotationCheckpoint",
 ]
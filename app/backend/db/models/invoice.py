@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, BigInteger, Integer, DateTime, Text, func, ForeignKey
+from sqlalchemy import String, BigInteger, Integer, DateTime, Text, func, ForeignKey, Index
 
 from app.backend.db.base_class import Base
 from app.backend.db.enums import invoice_status
@@ -38,6 +38,14 @@ class Invoice(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
-    # Relationship
-    items: Mapped[list["InvoiceItem"]] = relationship("InvoiceItem", back_populates="invoice", cascade="all, delete-orphan")
+    # Relationship (목록 조회 시 페이지 전체 항목을 SELECT ... WHERE invoice_id IN (...) 1번으로 로드)
+    items: Mapped[list["InvoiceItem"]] = relationship(
+        "InvoiceItem", back_populates="invoice", cascade="all, delete-orphan", lazy="selectin"
+    )
+
+    __table_args__ = (
+        Index("ix_invoices_teacher_id_created_at_invoice_id", "teacher_id", "created_at", "invoice_id"),
+    )
+    # INSERT/UPDATE 시 서버 기본값(created_at, updated_at 등)을 RETURNING으로 받아 refresh 불필요
+    __mapper_args__ = {"eager_defaults": True}
 
@@ -27,3 +27,5 @@ class InvoiceItem(Base):
     # Relationship
     invoice: Mapped["Invoice"] = relationship("Invoice", back_populates="items")
 
+    __mapper_args__ = {"eager_defaults": True}
+
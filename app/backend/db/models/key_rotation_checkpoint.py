@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.backend.db.base_class import Base
+
+
+class KeyRotationCheckpoint(Base):
+    """
+    키 교체(재암호화) 작업의 테이블별 진행 위치 (utils/rotate_keys 참고)
+    배치 UPDATE와 같은 트랜잭션에서 갱신되므로 중단 후 last_id 다음부터 이어서 실행됩니다.
+    """
+    __tablename__ = "key_rotation_checkpoints"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    target_key_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_id: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    rows_scanned: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    rows_rewritten: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default="0")
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+    )
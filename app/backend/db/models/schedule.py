@@ -1,10 +1,26 @@
 from __future__ import annotations
 from datetime import datetime, date
+from typing import Any
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import BigInteger, Date, DateTime, Text, String, func, ForeignKey, Index
+from sqlalchemy import BigInteger, Computed, Date, DateTime, Text, String, func, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint, TSRANGE
 from app.backend.db.enums import attendance_status
 
 from app.backend.db.base_class import Base
+
+# 같은 교사의 (취소되지 않은) 수업 시간이 겹치지 않도록 보장하는 제약 이름
+SCHEDULE_OVERLAP_CONSTRAINT = "ex_schedules_teacher_id_lesson_range"
+
+# start_time/end_time("HH:MM")에서 계산되는 실제 시간 범위 [start, end)
+# time 캐스팅은 IMMUTABLE이 아니므로 split_part + make_time 사용
+_LESSON_RANGE_SQL = (
+    "tsrange("
+    "lesson_date + make_time(split_part(start_time, ':', 1)::int, split_part(start_time, ':', 2)::int, 0), "
+    "lesson_date + make_time(split_part(end_time, ':', 1)::int, split_part(end_time, ':', 2)::int, 0), "
+    "'[)')"
+)
+
+
 class Schedule(Base):
     __tablename__ = "schedules"
 
@@ -14,6 +30,10 @@ class Schedule(Base):
     lesson_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     start_time: Mapped[str] = mapped_column(String(5), nullable=False)
     end_time: Mapped[str] = mapped_column(String(5), nullable=False)
+    # DB가 계산하는 시간 범위 (충돌 판정 전용, 응답에는 포함하지 않음)
+    lesson_range: Mapped[Any] = mapped_column(
+        TSRANGE, Computed(_LESSON_RANGE_SQL, persisted=True), nullable=True, deferred=True
+    )
     subject_id: Mapped[str] = mapped_column(String(50), nullable=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[str] = mapped_column(Text, nullable=False, server_default="confirmed")
@@ -21,12 +41,25 @@ class Schedule(Base):
     cancelled_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     cancelled_by: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     cancel_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # 반복 규칙에서 실체화된 회차면 규칙 ID
+    rule_id: Mapped[int | None] = mapped_column(
+        BigInteger, ForeignKey("schedule_rules.rule_id", ondelete="SET NULL"), nullable=True
+    )
 
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     __table_args__ = (
         Index("ix_schedules_teacher_id_lesson_date", "teacher_id", "lesson_date"),
+        Index("ix_schedules_teacher_id_updated_at", "teacher_id", "updated_at", "schedule_id"),
         Index("ix_schedules_status", "status"),
         Index("ix_schedules_subject_id", "subject_id"),
+        ExcludeConstraint(
+            ("teacher_id", "="),
+            ("lesson_range", "&&"),
+            name=SCHEDULE_OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status <> 'cancelled'"),
+        ),
     )
+    __mapper_args__ = {"eager_defaults": True}
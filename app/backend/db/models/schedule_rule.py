@@ -0,0 +1,79 @@
+from __future__ import annotations
+from datetime import datetime, date
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import (
+    BigInteger,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
+
+from app.backend.db.base_class import Base
+
+
+class ScheduleRule(Base):
+    """
+    반복 수업 규칙 (매주 X요일 HH:MM~HH:MM)
+    회차는 조회 시 전개되며, 출결/메모 기록 시에만 schedules 행으로 실체화됩니다.
+    """
+    __tablename__ = "schedule_rules"
+
+    rule_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    teacher_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("teachers.teacher_id"), nullable=False)
+    student_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("students.student_id"), nullable=False, index=True)
+    subject_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    weekday: Mapped[int] = mapped_column(SmallInteger, nullable=False)  # 0=월 ... 6=일
+    start_time: Mapped[str] = mapped_column(String(5), nullable=False)
+    end_time: Mapped[str] = mapped_column(String(5), nullable=False)
+    interval_weeks: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")  # 1=매주, 2=격주
+    valid_from: Mapped[date] = mapped_column(Date, nullable=False)
+    valid_to: Mapped[date | None] = mapped_column(Date, nullable=True)  # NULL이면 종료일 없음
+    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # 삭제 시각 (증분 동기화가 삭제를 감지하도록 행을 남김, 조회/전개에서는 제외)
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_schedule_rules_teacher_id_weekday", "teacher_id", "weekday"),
+        Index("ix_schedule_rules_teacher_id_updated_at", "teacher_id", "updated_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class ScheduleRuleException(Base):
+    """
+    반복 규칙의 특정 회차 예외
+    - cancelled: 해당 회차 취소 (schedules 행 없음)
+    - materialized: 출결/메모 기록으로 schedules 행 생성 (schedule_id)
+    - moved: 날짜/시간이 변경되어 schedules 행으로 이동 (schedule_id)
+    """
+    __tablename__ = "schedule_rule_exceptions"
+
+    exception_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    rule_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("schedule_rules.rule_id", ondelete="CASCADE"), nullable=False
+    )
+    occurrence_date: Mapped[date] = mapped_column(Date, nullable=False)
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    schedule_id: Mapped[int | None] = mapped_column(
+        BigInteger, ForeignKey("schedules.schedule_id", ondelete="SET NULL"), nullable=True
+    )
+    cancelled_by: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    cancel_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("rule_id", "occurrence_date", name="uniq_rule_occurrence_date"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
@@ -13,10 +13,12 @@ from sqlalchemy import (
     func,
     UniqueConstraint,
     ForeignKey,
+    Index,
 )
 from app.backend.db.base_class import Base
-from app.backend.db.types import EncryptedString, HashedString
+from app.backend.db.types import SENSITIVE_GROUP, EncryptedString, HashedString, PhoneHashedString
 from app.backend.db.mixins import setup_hash_fields
+from app.backend.db.models.student_name_gram import StudentNameGram
 
 class Student(Base):
     __tablename__ = "students"
@@ -24,11 +26,13 @@ class Student(Base):
     student_id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(EncryptedString, nullable=False)
     phone: Mapped[str] = mapped_column(EncryptedString, nullable=False)
-    parent_phone: Mapped[str | None] = mapped_column(EncryptedString, nullable=True)
+    parent_phone: Mapped[str | None] = mapped_column(
+        EncryptedString, nullable=True, deferred=True, deferred_group=SENSITIVE_GROUP
+    )
     
     # 해시 필드 (unique constraint 및 검색용)
     name_hash: Mapped[str] = mapped_column(HashedString, nullable=False, index=True)
-    phone_hash: Mapped[str] = mapped_column(HashedString, nullable=False, index=True)
+    phone_hash: Mapped[str] = mapped_column(PhoneHashedString, nullable=False, index=True)
     
     teacher_id: Mapped[int | None] = mapped_column(
         BigInteger, ForeignKey("teachers.teacher_id"), nullable=True, index=True
@@ -55,7 +59,9 @@ class Student(Base):
 
     __table_args__ = (
         UniqueConstraint("name_hash", "phone_hash", name="uniq_name_phone"),
+        Index("ix_students_teacher_id_created_at_student_id", "teacher_id", "created_at", "student_id"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
 # 해시 필드 자동 업데이트 이벤트 리스너 등록
-setup_hash_fields(Student)
+setup_hash_fields(Student, name_gram_table=StudentNameGram.__table__)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.backend.db.base_class import Base
+
+
+class StudentNameGram(Base):
+    """
+    학생 이름 부분 검색용 blind n-gram 인덱스 (core/blind_index 참고)
+    학생 저장/이름 변경 시 setup_hash_fields 이벤트가 자동으로 갱신합니다.
+    """
+    __tablename__ = "student_name_grams"
+
+    gram_hash: Mapped[str] = mapped_column(String(32), primary_key=True)
+    student_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("students.student_id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    )
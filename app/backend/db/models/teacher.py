@@ -15,7 +15,7 @@ from sqlalchemy import (
 
 from app.backend.db.base_class import Base
 from app.backend.db.enums import teacher_tax_type, auth_provider
-from app.backend.db.types import EncryptedString, HashedString
+from app.backend.db.types import SENSITIVE_GROUP, EncryptedString, HashedString, PhoneHashedString
 from app.backend.db.mixins import setup_hash_fields
 
 
@@ -26,12 +26,17 @@ class Teacher(Base):
     nickname: Mapped[str] = mapped_column(String(50), nullable=False, unique=True, index=True)
     phone: Mapped[str] = mapped_column(EncryptedString, nullable=False)
     email: Mapped[str | None] = mapped_column(EncryptedString, nullable=True)
-    account_name: Mapped[str | None] = mapped_column(EncryptedString, nullable=True)
+    # 정산 계좌 정보는 필요할 때만 로드/복호화
+    account_name: Mapped[str | None] = mapped_column(
+        EncryptedString, nullable=True, deferred=True, deferred_group=SENSITIVE_GROUP
+    )
     bank_code: Mapped[str | None] = mapped_column(String(3), nullable=True)
-    account_number: Mapped[str | None] = mapped_column(EncryptedString, nullable=True)
+    account_number: Mapped[str | None] = mapped_column(
+        EncryptedString, nullable=True, deferred=True, deferred_group=SENSITIVE_GROUP
+    )
     
     # 해시 필드 (검색용, 필요시 unique constraint에도 사용 가능)
-    phone_hash: Mapped[str] = mapped_column(HashedString, nullable=False, index=True)
+    phone_hash: Mapped[str] = mapped_column(PhoneHashedString, nullable=False, index=True)
     email_hash: Mapped[str | None] = mapped_column(HashedString, nullable=True, index=True)
     
     subject_id: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)
@@ -60,6 +65,7 @@ class Teacher(Base):
     __table_args__ = (
         UniqueConstraint("provider", "oauth_id", name="uniq_provider_oauth_id"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
 # 해시 필드 자동 업데이트 이벤트 리스너 등록
 setup_hash_fields(Teacher)
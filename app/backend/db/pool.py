@@ -0,0 +1,98 @@
+"""
+커넥션 풀 계측
+- 풀에서 커넥션을 얻기까지 걸린 시간을 히스토그램으로 기록 (새 연결 생성 시간 포함)
+- 풀 크기/사용 중/overflow는 풀에서 바로 읽음
+- 같은 값을 core/metrics에도 기록 (GET /metrics)
+"""
+from __future__ import annotations
+
+import bisect
+import time
+
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.backend.core import metrics
+
+# 대기 시간 히스토그램 상한 (초), 마지막 칸은 +Inf
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+POOL_WAIT = metrics.histogram("db_pool_wait_seconds", "풀에서 커넥션을 얻기까지 걸린 시간", ("engine",), WAIT_BUCKETS)
+POOL_TIMEOUTS = metrics.counter("db_pool_timeouts_total", "풀 checkout 타임아웃 수", ("engine",))
+
+
+class PoolStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_sum += seconds
+        if seconds > self.wait_max:
+            self.wait_max = seconds
+        self.bucket_counts[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+        POOL_WAIT.observe(seconds, engine=self.name)
+
+    def snapshot(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip((*WAIT_BUCKETS, float("inf")), self.bucket_counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_sum": round(self.wait_sum, 6),
+            "wait_seconds_max": round(self.wait_max, 6),
+            "wait_seconds_buckets": buckets,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """checkout 대기 시간을 stats에 기록하는 풀 (stats는 instrumented_pool_class가 클래스에 붙임)"""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except sa_exc.TimeoutError:
+            self.stats.timeouts += 1
+            POOL_TIMEOUTS.inc(engine=self.stats.name)
+            raise
+        self.stats.observe(time.perf_counter() - start)
+        return conn
+
+
+def instrumented_pool_class(name: str) -> type[InstrumentedQueuePool]:
+    """
+    엔진별 풀 클래스 생성
+    pool.recreate()/dispose()는 같은 클래스로 풀을 다시 만들므로 통계가 유지됨
+    """
+    return type(f"InstrumentedQueuePool_{name}", (InstrumentedQueuePool,), {"stats": PoolStats(name)})
+
+
+def pool_status(pool) -> dict:
+    """풀 현재 상태 + 누적 대기 통계"""
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+            }
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,120 @@
+"""
+읽기 라우팅 (primary / replica)
+- 목록/이력 같은 무거운 GET은 get_read_session으로 복제본에서 읽음
+- 쓰기 직후 복제 지연으로 방금 쓴 데이터가 안 보이지 않도록,
+  커밋된 변경의 teacher_id를 잠시 primary에 고정 (read-your-writes)
+- teacher_id를 받지 않는 학생 단위 라우트(/students/{student_id}/...)를 위해 student_id도 같은 방식으로 고정
+- 고정 정보는 워커 프로세스 메모리에 있으므로 여러 워커 간에는 공유되지 않음
+"""
+from __future__ import annotations
+
+import time
+
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.config import settings
+from app.backend.db.database import AsyncSessionLocal, PrimarySession, ReadSessionLocal, replica_engine, engine
+
+TEACHER_ID_HEADER = "X-Teacher-Id"
+
+# teacher_id / student_id → primary 고정 만료 시각 (monotonic)
+_pinned: dict[int, float] = {}
+_pinned_students: dict[int, float] = {}
+
+
+def _is_pinned(pins: dict[int, float], key: int | None) -> bool:
+    if key is None:
+        return False
+    until = pins.get(key)
+    if until is None:
+        return False
+    if until < time.monotonic():
+        pins.pop(key, None)
+        return False
+    return True
+
+
+def pin_to_primary(teacher_id: int, seconds: float | None = None) -> None:
+    ttl = settings.READ_YOUR_WRITES_SECONDS if seconds is None else seconds
+    _pinned[teacher_id] = time.monotonic() + ttl
+
+
+def is_pinned(teacher_id: int | None) -> bool:
+    return _is_pinned(_pinned, teacher_id)
+
+
+def pin_student_to_primary(student_id: int, seconds: float | None = None) -> None:
+    ttl = settings.READ_YOUR_WRITES_SECONDS if seconds is None else seconds
+    _pinned_students[student_id] = time.monotonic() + ttl
+
+
+def is_student_pinned(student_id: int | None) -> bool:
+    return _is_pinned(_pinned_students, student_id)
+
+
+def mark_written(session: AsyncSession, teacher_id: int) -> None:
+    """
+    ORM 객체로 드러나지 않는 쓰기도 커밋 후 primary에 고정
+    (Core INSERT/UPDATE, teacher_id 컬럼이 없는 schedule_rule_exceptions 등)
+    """
+    session.info.setdefault("written_teacher_ids", set()).add(teacher_id)
+
+
+@event.listens_for(PrimarySession, "before_flush")
+def _collect_written_teachers(session, flush_context, instances):
+    written = session.info.setdefault("written_teacher_ids", set())
+    students = session.info.setdefault("written_student_ids", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        teacher_id = getattr(obj, "teacher_id", None)
+        if isinstance(teacher_id, int):
+            written.add(teacher_id)
+        student_id = getattr(obj, "student_id", None)
+        if isinstance(student_id, int):
+            students.add(student_id)
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _pin_written_teachers(session):
+    for teacher_id in session.info.pop("written_teacher_ids", ()):
+        pin_to_primary(teacher_id)
+    for student_id in session.info.pop("written_student_ids", ()):
+        pin_student_to_primary(student_id)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _forget_written_teachers(session):
+    session.info.pop("written_teacher_ids", None)
+    session.info.pop("written_student_ids", None)
+
+
+def _int_or_none(raw) -> int | None:
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _request_teacher_id(request: Request) -> int | None:
+    """경로/쿼리의 teacher_id, 없으면 X-Teacher-Id 헤더"""
+    return _int_or_none(
+        request.path_params.get("teacher_id")
+        or request.query_params.get("teacher_id")
+        or request.headers.get(TEACHER_ID_HEADER)
+    )
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """
+    읽기 전용 라우트용 세션
+    복제본이 없거나 해당 교사(또는 경로의 학생)에 최근 쓰기가 있었으면 primary 세션
+    """
+    use_primary = (
+        replica_engine is engine
+        or is_pinned(_request_teacher_id(request))
+        or is_student_pinned(_int_or_none(request.path_params.get("student_id")))
+    )
+    maker = AsyncSessionLocal if use_primary else ReadSessionLocal
+    async with maker() as session:
+        yield session
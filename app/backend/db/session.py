@@ -1,9 +1,6 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from app.backend.core.config import settings
+# 하위 호환: 엔진/세션은 db/database.py 한 곳에서 생성
+from app.backend.db.database import AsyncSessionLocal, engine, get_session
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False, future=True)
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+get_db = get_session
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
-        yield session
+__all__ = ["AsyncSessionLocal", "engine", "get_session", "get_db"]
@@ -3,61 +3,70 @@ SQLAlchemy 암호화 타입 정의
 DB에 저장될 때 자동으로 암호화하고, 읽을 때 자동으로 복호화합니다.
 """
 from __future__ import annotations
-import json
 from typing import Any
-from sqlalchemy import TypeDecorator, Text, String
+from sqlalchemy import TypeDecorator, LargeBinary, String
 from sqlalchemy.dialects.postgresql import JSONB
 
-from app.backend.core.crypto import aesgcm_encrypt_str, aesgcm_decrypt_str, hmac_sha256_hex
+from app.backend.core.crypto import (
+    aesgcm_encrypt_v2,
+    decrypt_envelope_str,
+    hmac_sha256_hex,
+    is_envelope_v2,
+    phone_hash_hex,
+)
+
+# 목록 화면에 필요 없는 민감 컬럼의 deferred 그룹 (읽을 때만 SELECT + 복호화)
+# 전체 값이 필요한 엔드포인트는 undefer_group(SENSITIVE_GROUP)으로 함께 로드
+SENSITIVE_GROUP = "sensitive"
 
 
 class EncryptedString(TypeDecorator):
     """
     암호화된 문자열 타입
-    DB에는 JSON 형태의 암호화된 envelope로 저장됩니다.
+    DB(bytea)에는 바이너리 envelope v2 (version | key_id | nonce | ct+tag)로 저장됩니다.
+    읽을 때는 v2와 기존 v1 JSON envelope를 모두 복호화합니다.
     """
-    impl = Text
+    impl = LargeBinary
     cache_ok = True
 
-    def process_bind_param(self, value: str | None, dialect: Any) -> str | None:
+    def process_bind_param(self, value: str | bytes | None, dialect: Any) -> bytes | None:
         """DB에 저장하기 전 암호화"""
         if value is None:
             return None
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            if is_envelope_v2(value):
+                # 이미 암호화된 값이면 그대로 저장
+                return bytes(value)
+            raise ValueError("EncryptedString expects str or a v2 envelope")
         if not isinstance(value, str):
             raise ValueError(f"EncryptedString expects str, got {type(value)}")
-        
-        # 이미 암호화된 JSON 문자열인지 확인 (중복 암호화 방지)
-        try:
-            test_envelope = json.loads(value)
-            if isinstance(test_envelope, dict) and "alg" in test_envelope and "ct" in test_envelope:
-                # 이미 암호화된 값이면 그대로 반환
-                return value
-        except (json.JSONDecodeError, TypeError, AttributeError):
-            pass  # 평문이므로 암호화 진행
-        
-        # 암호화 (envelope 형태로 반환)
-        envelope = aesgcm_encrypt_str(value)
-        # JSON 문자열로 저장
-        return json.dumps(envelope)
 
-    def process_result_value(self, value: str | None, dialect: Any) -> str | None:
+        # v1 JSON envelope가 그대로 들어온 경우만 파싱 (일반 평문은 json.loads 하지 않음)
+        if value.startswith("{") and '"ct"' in value:
+            try:
+                value = decrypt_envelope_str(value)
+            except ValueError:
+                pass  # envelope처럼 보이는 평문
+
+        return aesgcm_encrypt_v2(value)
+
+    def process_result_value(self, value: bytes | str | None, dialect: Any) -> str | None:
         """DB에서 읽을 때 복호화"""
         if value is None:
             return None
-        if not isinstance(value, str):
+        if not isinstance(value, (bytes, bytearray, memoryview, str)):
             return None
-        
+
         try:
-            # JSON 문자열을 파싱하여 envelope 복원
-            envelope = json.loads(value)
-            # 복호화
-            return aesgcm_decrypt_str(envelope)
-        except (json.JSONDecodeError, ValueError, KeyError) as e:
+            return decrypt_envelope_str(value)
+        except (ValueError, UnicodeDecodeError) as e:
             # 기존 평문 데이터가 있을 수 있으므로 그대로 반환 (마이그레이션 전)
             # 로그를 남기고 평문 반환
             import logging
             logging.warning(f"Failed to decrypt value (may be plaintext): {e}")
-            return value
+            if isinstance(value, str):
+                return value
+            return bytes(value).decode("utf-8", errors="replace")
 
 
 class HashedString(TypeDecorator):
@@ -87,3 +96,21 @@ class HashedString(TypeDecorator):
     def process_result_value(self, value: str | None, dialect: Any) -> str | None:
         """해시값은 복호화하지 않고 그대로 반환 (검색용)"""
         return value
+
+
+class PhoneHashedString(HashedString):
+    """
+    전화번호 해시 타입
+    E.164로 정규화한 뒤 해시하므로 "010-1234-5678" / "01012345678" / "+821012345678"이 같은 값이 됩니다.
+    Student.phone_hash == "010-1234-5678" 처럼 평문으로 비교해도 인덱스 조회 1번으로 찾을 수 있습니다.
+    """
+    cache_ok = True
+
+    def process_bind_param(self, value: str | None, dialect: Any) -> str | None:
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            raise ValueError(f"PhoneHashedString expects str, got {type(value)}")
+        if len(value) == 64 and all(c in '0123456789abcdef' for c in value.lower()):
+            return value
+        return phone_hash_hex(value)
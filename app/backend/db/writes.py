@@ -0,0 +1,41 @@
+"""
+쓰기 헬퍼
+- eager_defaults 모델은 flush 시 INSERT/UPDATE ... RETURNING으로 PK와 서버 생성값(created_at, updated_at 등)을 함께 받음
+- ORM flush 경로이므로 이벤트 리스너(setup_hash_fields 등)는 그대로 동작
+"""
+from __future__ import annotations
+
+from typing import TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+T = TypeVar("T")
+
+
+async def flush_returning(session: AsyncSession, obj: T) -> T:
+    """
+    obj를 flush하고 응답/이력 스냅샷에 필요한 컬럼이 모두 채워진 상태로 반환
+    RETURNING으로 받지 못한 컬럼이 있을 때만 (eager_defaults가 없는 모델 등) 해당 컬럼만 SELECT
+    """
+    state = inspect(obj)
+    inserting = state.key is None
+    session.add(obj)
+    await session.flush()
+
+    unloaded = state.unloaded
+    missing: list[str] = []
+    for attr in state.mapper.column_attrs:
+        if attr.key not in unloaded:
+            continue
+        column = attr.columns[0]
+        if inserting and column.server_default is None and column.server_onupdate is None:
+            # 값을 지정하지 않은 nullable 컬럼은 NULL로 INSERT됨
+            set_committed_value(obj, attr.key, None)
+        elif not attr.deferred:
+            # 지연 로딩 컬럼은 실제로 읽을 때만 SELECT
+            missing.append(attr.key)
+    if missing:
+        await session.refresh(obj, missing)
+    return obj
@@ -1,15 +1,26 @@
+import asyncio
 import logging
 import traceback
-from fastapi import FastAPI, Request, status
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
+from app.backend.core import metrics
+from app.backend.core.config import settings
+from app.backend.core.llm import close_llm_client
+from app.backend.core.llm_cache import close_llm_cache
+from app.backend.core.redis import close_conversation_store
+from app.backend.core.metrics import MetricsMiddleware
+from app.backend.db.instrumentation import SQLInstrumentationMiddleware
 from app.backend.routers.student_router import router as students_router
 from app.backend.routers.teacher_router import router as teachers_router
+from app.backend.routers.schedule_rule_router import router as schedule_rules_router
 from app.backend.routers.schedule_router import router as schedules_router
 from app.backend.routers.invoice_router import router as invoices_router
 from app.backend.routers.ai_router import router as ai_router
+from app.backend.routers.internal_router import require_internal_access, router as internal_router
 
 # 로깅 설정
 logging.basicConfig(
@@ -21,7 +32,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Tutor API", version="0.1.0", debug=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 여러 워커의 /metrics를 합치기 위한 스냅샷 기록 (METRICS_MULTIPROC_DIR 설정 시)
+    writer = asyncio.create_task(metrics.snapshot_writer()) if settings.METRICS_MULTIPROC_DIR else None
+    yield
+    if writer is not None:
+        writer.cancel()
+        metrics.write_snapshot()
+    await close_llm_client()
+    await close_conversation_store()
+    await close_llm_cache()
+
+
+app = FastAPI(title="Tutor API", version="0.1.0", debug=True, lifespan=lifespan)
 
 # 전역 예외 핸들러는 Swagger UI와 충돌할 수 있으므로 제거
 # 대신 필요한 경우에만 특정 예외 타입을 처리
@@ -56,6 +81,11 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 def health():
     return {"ok": True}
 
+# Prometheus 스크레이프 (text exposition format), INTERNAL_TOKEN으로 보호
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_access)])
+def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 # 🔐 프론트 도메인/포트 맞추기
 # 개발 환경: 모든 localhost 포트 허용 (Flutter 웹 앱은 매번 다른 포트 사용)
 origins = [
@@ -85,11 +115,19 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Reply-Text", "X-Session-Id", "Server-Timing"],
     )
 
+# 요청별 쿼리 수/DB 시간 → Server-Timing 헤더 + 로그 (N+1 경고 포함)
+app.add_middleware(SQLInstrumentationMiddleware)
+# 라우트별 요청 수/지연 시간 히스토그램 (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+
 # 라우터 등록
 app.include_router(students_router)
 app.include_router(teachers_router)
+app.include_router(schedule_rules_router)  # /schedules/{schedule_id}보다 먼저
 app.include_router(schedules_router)
 app.include_router(invoices_router)
 app.include_router(ai_router)
+app.include_router(internal_router)
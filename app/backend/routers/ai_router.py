@@ -4,16 +4,19 @@ AI 어시스턴트 라우터
 - LLM 처리
 - 음성 응답 생성
 """
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
-from fastapi.responses import Response
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.backend.db.database import get_session
 from app.backend.services.speech_service import SpeechService
 from app.backend.services.intent_extractor import extract_intent_with_history
 from app.backend.services.orchestra import _execute_action
+from app.backend.services.student_search import teacher_student_names
+from app.backend.services.voice_session import VoiceSession
 from app.backend.schemas.command import ActionPlan
 import uuid
 import logging
+from urllib.parse import quote
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +25,57 @@ router = APIRouter(prefix="/ai", tags=["ai"])
 # SpeechService 인스턴스
 speech_service = SpeechService()
 
+# 스트리밍 응답 헤더 (헤더는 latin-1만 허용되므로 응답 텍스트는 퍼센트 인코딩, 클라이언트는 decodeURIComponent)
+REPLY_TEXT_HEADER = "X-Reply-Text"
+SESSION_ID_HEADER = "X-Session-Id"
+
+
+async def _student_names(db: AsyncSession, teacher_id: int) -> list[str]:
+    """빠른 경로(규칙 파서)용 학생 이름, 조회에 실패하면 빈 목록 (→ LLM으로 처리)"""
+    try:
+        return await teacher_student_names(db, teacher_id)
+    except Exception as e:
+        logger.warning(f"학생 이름 조회 실패, 빠른 경로 없이 처리: {e}")
+        return []
+
+
+def _wants_audio_stream(request: Request, stream: bool) -> bool:
+    return stream or "audio/mpeg" in request.headers.get("accept", "")
+
+
+async def _audio_stream_response(text: str, session_id: str) -> Response | dict:
+    """
+    TTS 청크를 받는 대로 audio/mpeg로 전달
+    첫 청크 전에 TTS가 실패하면 오디오 없이 JSON(text, session_id)으로 응답
+    """
+    chunks = speech_service.stream_text_to_speech(text, voice="nova")
+    try:
+        first = await chunks.__anext__()
+    except Exception as e:
+        if not isinstance(e, StopAsyncIteration):
+            logger.error(f"TTS error: {e}")
+        await chunks.aclose()
+        return {"text": text, "session_id": session_id}
+
+    async def body():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+
+    headers = {
+        REPLY_TEXT_HEADER: quote(text, safe=""),
+        SESSION_ID_HEADER: session_id,
+        "Cache-Control": "no-store",
+    }
+    return StreamingResponse(body(), media_type="audio/mpeg", headers=headers)
+
 
 @router.post("/process_audio")
 async def process_audio(
+    request: Request,
     audio: UploadFile = File(...),
     session_id: str | None = None,
+    stream: bool = False,
     teacher_id: int = 1,  # TODO: 실제 인증에서 가져오기
     db: AsyncSession = Depends(get_session),
 ):
@@ -41,6 +90,10 @@ async def process_audio(
     Returns:
         - text: LLM 응답 텍스트
         - audio: TTS 오디오 (base64 인코딩)
+
+    stream=true 또는 Accept: audio/mpeg이면 JSON 대신 MP3를 스트리밍
+        - 본문: audio/mpeg (TTS에서 받는 대로 전달)
+        - X-Reply-Text: 응답 텍스트 (퍼센트 인코딩), X-Session-Id: 세션 ID
     """
     try:
         # 세션 ID 생성 (없으면)
@@ -56,7 +109,7 @@ async def process_audio(
         
         # 2. Speech-to-Text
         try:
-            user_text = speech_service.speech_to_text(
+            user_text = await speech_service.speech_to_text(
                 audio_data, 
                 filename=audio.filename or "recording.webm"
             )
@@ -71,7 +124,9 @@ async def process_audio(
         # 3. LLM 처리 (의도 추출 + 실행)
         try:
             # 의도 추출
-            intent_result = extract_intent_with_history(session_id, user_text)
+            intent_result = await extract_intent_with_history(
+                session_id, user_text, await _student_names(db, teacher_id)
+            )
             
             # 자연어 질문인 경우 (추가 정보 필요)
             if "response" in intent_result:
@@ -94,8 +149,11 @@ async def process_audio(
             ai_response_text = "죄송해요, 다시 말씀해 주세요."
         
         # 4. Text-to-Speech
+        if _wants_audio_stream(request, stream):
+            return await _audio_stream_response(ai_response_text, session_id)
+
         try:
-            audio_bytes = speech_service.text_to_speech(ai_response_text, voice="nova")
+            audio_bytes = await speech_service.text_to_speech(ai_response_text, voice="nova")
         except Exception as e:
             logger.error(f"TTS error: {e}")
             # TTS 실패해도 텍스트는 반환
@@ -123,6 +181,24 @@ async def process_audio(
         raise HTTPException(status_code=500, detail=f"처리 중 오류가 발생했습니다: {str(e)}")
 
 
+@router.websocket("/ws")
+async def voice_session_ws(
+    websocket: WebSocket,
+    session_id: str | None = None,
+    teacher_id: int = 1,  # TODO: 실제 인증에서 가져오기
+):
+    """
+    음성 어시스턴트 WebSocket (프로토콜은 services/voice_session.py 참고)
+    발화가 끝나면 바로 STT, LLM 응답을 토큰 단위로 보내면서 문장마다 TTS 오디오를 이어서 전송
+    """
+    await websocket.accept()
+    session = VoiceSession(websocket, session_id or str(uuid.uuid4()), teacher_id, speech_service)
+    try:
+        await session.run()
+    except WebSocketDisconnect:
+        logger.info(f"Voice session closed: {session.session_id}")
+
+
 @router.post("/process_text")
 async def process_text(
     message: str,
@@ -139,7 +215,9 @@ async def process_text(
             session_id = str(uuid.uuid4())
         
         # LLM 처리
-        intent_result = extract_intent_with_history(session_id, message)
+        intent_result = await extract_intent_with_history(
+            session_id, message, await _student_names(db, teacher_id)
+        )
         
         if "response" in intent_result:
             ai_response_text = intent_result["response"]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hmac
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.backend.core.config import settings
+from app.backend.db.database import engine_pool_stats
+
+
+def require_internal_access(authorization: str | None = Header(None)) -> None:
+    """
+    운영 모니터링 엔드포인트 접근 제한 (/metrics, /internal/*)
+    INTERNAL_TOKEN이 있으면 "Bearer <토큰>" 헤더가 필요하고, 없으면 ENV=local에서만 열림
+    거부할 때는 엔드포인트가 있다는 것도 알리지 않도록 404
+    """
+    token = settings.INTERNAL_TOKEN
+    if token:
+        if authorization is not None and hmac.compare_digest(authorization.encode(), f"Bearer {token}".encode()):
+            return
+    elif settings.ENV == "local":
+        return
+    raise HTTPException(status_code=404, detail="Not Found")
+
+
+# 운영 모니터링용 (Swagger 문서에는 노출하지 않음)
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_access)],
+)
+
+
+@router.get("/db-pool")
+async def db_pool_stats():
+    """현재 워커 프로세스의 커넥션 풀 상태 (사용 중/overflow/대기 시간 히스토그램)"""
+    return {"pid": os.getpid(), "engines": engine_pool_stats()}
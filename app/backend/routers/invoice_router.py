@@ -6,6 +6,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.backend.db.database import get_session
+from app.backend.db.routing import get_read_session
+from app.backend.db.writes import flush_returning
 from app.backend.db.models import Invoice, InvoiceItem
 from app.backend.schemas.invoice import (
     InvoiceCreate,
@@ -15,6 +17,7 @@ from app.backend.schemas.invoice import (
     InvoiceItemCreate,
 )
 from app.backend.services.kakao_pay import kakao_pay_service, KakaoPayError
+from app.backend.utils.pagination import fetch_keyset_page
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
@@ -26,19 +29,11 @@ async def create_invoice(payload: InvoiceCreate, session: AsyncSession = Depends
     cols = set(Invoice.__table__.columns.keys())
     safe = {k: v for k, v in data.items() if k in cols}
     
+    # 청구 항목은 relationship으로 함께 INSERT (서버 기본값은 RETURNING으로 채워짐)
     invoice = Invoice(**safe)
-    session.add(invoice)
-    await session.flush()  # invoice_id 생성
-    
-    # 청구 항목 추가
-    for item_data in payload.items:
-        item = InvoiceItem(invoice_id=invoice.invoice_id, **item_data.model_dump())
-        session.add(item)
-    
+    invoice.items = [InvoiceItem(**item_data.model_dump()) for item_data in payload.items]
+    await flush_returning(session, invoice)
     await session.commit()
-    await session.refresh(invoice)
-    # items 로드
-    await session.refresh(invoice, ["items"])
     return invoice
 
 
@@ -49,7 +44,9 @@ async def list_invoices(
     status: str | None = Query(None),
     page: int = Query(1, ge=1),
     pageSize: int = Query(20, ge=1, le=200),
-    session: AsyncSession = Depends(get_session),
+    cursor: str | None = Query(None, description="커서 모드: 첫 페이지는 빈 문자열, 이후 next_cursor 값 (OFFSET 대신 seek)"),
+    withTotal: bool | None = Query(None, description="total 계산 여부 (기본: offset 모드 true, 커서 모드 false)"),
+    session: AsyncSession = Depends(get_read_session),
 ):
     stmt = select(Invoice)
     cnt = select(func.count()).select_from(Invoice)
@@ -64,20 +61,36 @@ async def list_invoices(
         stmt = stmt.where(Invoice.status == status)
         cnt = cnt.where(Invoice.status == status)
     
-    total = (await session.execute(cnt)).scalar_one()
-    rows = (
-        await session.execute(
-            stmt.order_by(Invoice.created_at.desc())
-            .offset((page - 1) * pageSize)
-            .limit(pageSize)
-        )
-    ).scalars().all()
-    
-    # items 로드
-    for invoice in rows:
-        await session.refresh(invoice, ["items"])
-    
-    return InvoiceListResp(total=total, page=page, pageSize=pageSize, items=rows)
+    if withTotal is None:
+        withTotal = cursor is None
+    total = (await session.execute(cnt)).scalar_one() if withTotal else None
+
+    next_cursor = None
+    if cursor is not None:
+        try:
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                stmt,
+                (Invoice.created_at, Invoice.invoice_id),
+                cursor=cursor,
+                page_size=pageSize,
+                parsers=(datetime.fromisoformat, int),
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        rows = (
+            await session.execute(
+                stmt.order_by(Invoice.created_at.desc(), Invoice.invoice_id.desc())
+                .offset((page - 1) * pageSize)
+                .limit(pageSize)
+            )
+        ).scalars().all()
+
+    # items는 relationship(lazy="selectin")으로 페이지 단위 1번에 로드됨
+    return InvoiceListResp(
+        total=total, page=page, pageSize=pageSize, items=rows, next_cursor=next_cursor
+    )
 
 
 @router.get("/{invoice_id}", response_model=InvoiceOut)
@@ -85,7 +98,6 @@ async def get_invoice(invoice_id: int, session: AsyncSession = Depends(get_sessi
     invoice = await session.get(Invoice, invoice_id)
     if not invoice:
         raise HTTPException(404, "Invoice not found")
-    await session.refresh(invoice, ["items"])
     return invoice
 
 
@@ -111,7 +123,6 @@ async def update_invoice(
         invoice.paid_at = datetime.now()
     
     await session.commit()
-    await session.refresh(invoice, ["items"])
     return invoice
 
 
@@ -155,7 +166,6 @@ async def create_kakao_pay_link(
         invoice.status = "sent"
         
         await session.commit()
-        await session.refresh(invoice, ["items"])
         return invoice
     except KakaoPayError as e:
         raise HTTPException(status_code=500, detail=f"KakaoPay error: {str(e)}")
@@ -179,7 +189,6 @@ async def send_kakao_pay_link(
     invoice.status = "sent"
     
     await session.commit()
-    await session.refresh(invoice, ["items"])
     return invoice
 
 
@@ -215,7 +224,6 @@ async def approve_payment(
         # 실제 결제 정보 저장 (필요시)
         
         await session.commit()
-        await session.refresh(invoice, ["items"])
         return invoice
     except KakaoPayError as e:
         raise HTTPException(status_code=500, detail=f"KakaoPay approval error: {str(e)}")
@@ -241,7 +249,6 @@ async def complete_payment(
         invoice.kakao_pay_tid = kakao_pay_tid
     
     await session.commit()
-    await session.refresh(invoice, ["items"])
     return invoice
 
 
@@ -1,67 +1,93 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, date, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
-from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select, func, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.backend.db.database import get_session
-from app.backend.db.models import Schedule
+from app.backend.db.routing import get_read_session
+from app.backend.db.writes import flush_returning
+from app.backend.db.errors import is_exclusion_violation
+from app.backend.db.models import Schedule, ScheduleRule, ScheduleRuleException
+from app.backend.db.models.schedule import SCHEDULE_OVERLAP_CONSTRAINT
 from app.backend.schemas.schedule import (
+    ScheduleChangesResp,
     ScheduleCreate,
     ScheduleOut,
     ScheduleListResp,
     ScheduleUpdate,
 )
+from app.backend.services.recurrence import (
+    expand_rrule,
+    expand_weekdays,
+    find_rule_occurrence_at,
+    generate_recurring_schedules,
+    load_rule_occurrences,
+)
+from app.backend.utils.pagination import decode_cursor, encode_cursor, fetch_keyset_page, keyset_after
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
+CONFLICT_DETAIL = "해당 시간대에 이미 등록된 수업이 있습니다."
+
+# updated_at은 트랜잭션 시작 시각이라 늦게 커밋된 행이 토큰보다 과거 시각을 가질 수 있음
+# → 이 시간보다 오래된 변경만 내보내 커밋 지연으로 누락되지 않게 함
+SYNC_SETTLE = timedelta(seconds=5)
+
 
 def _schedule_to_out(schedule: Schedule) -> ScheduleOut:
-    data = jsonable_encoder(schedule)
-    return ScheduleOut.model_validate(data)
+    # from_attributes로 필요한 컬럼만 읽음 (RETURNING으로 채워진 lesson_range 등은 무시)
+    return ScheduleOut.model_validate(schedule)
+
+
+def _optional(parse):
+    """None을 허용하는 커서 값 parser (변경 피드의 첫 토큰은 수업 위치가 없음)"""
+    return lambda value: None if value is None else parse(value)
+
+
+def _merge_sort_key(item: ScheduleOut) -> tuple:
+    """실제 수업/가상 회차 공통 정렬 키 (가상 회차는 -rule_id로 schedule_id와 겹치지 않게 구분)"""
+    sid = item.schedule_id if item.schedule_id is not None else -(item.rule_id or 0)
+    return (item.lesson_date, item.start_time, sid)
+
+
+def _lesson_range(lesson_date: date, start_time: str, end_time: str):
+    """요청 시간대를 lesson_range와 같은 [start, end) tsrange로 변환"""
+    start = datetime.combine(lesson_date, datetime.strptime(start_time, "%H:%M").time())
+    end = datetime.combine(lesson_date, datetime.strptime(end_time, "%H:%M").time())
+    return func.tsrange(start, end, "[)")
 
 
 @router.post("", response_model=ScheduleOut, status_code=201)
 async def create_schedule(payload: ScheduleCreate, session: AsyncSession = Depends(get_session)):
-    from datetime import datetime
-    
-    # 시간 파싱
-    start_time_str = payload.start_time
-    end_time_str = payload.end_time
-    
-    # 충돌 확인 (취소된 수업 제외)
-    conflict_count = (
-        await session.execute(
-            select(func.count())
-            .select_from(Schedule)
-            .where(
-                and_(
-                    Schedule.teacher_id == payload.teacher_id,
-                    Schedule.lesson_date == payload.lesson_date,
-                    Schedule.status != "cancelled",  # 취소된 수업 제외
-                    Schedule.start_time < end_time_str,
-                    Schedule.end_time > start_time_str,
-                )
-            )
+    if payload.start_time >= payload.end_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+
+    # 반복 규칙의 가상 회차는 EXCLUDE 제약 대상이 아니므로 먼저 확인
+    if (payload.status or "confirmed") != "cancelled":
+        rule_id = await find_rule_occurrence_at(
+            session,
+            teacher_id=payload.teacher_id,
+            lesson_date=payload.lesson_date,
+            start_time=payload.start_time,
+            end_time=payload.end_time,
         )
-    ).scalar_one()
-    
-    if conflict_count > 0:
-        raise HTTPException(status_code=409, detail="해당 시간대에 이미 등록된 수업이 있습니다.")
-    
+        if rule_id is not None:
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+
+    # 충돌은 EXCLUDE 제약(ex_schedules_teacher_id_lesson_range)이 INSERT 시점에 판정 (취소된 수업 제외)
     data = payload.model_dump(exclude_unset=True)
     sched = Schedule(**data)
-    session.add(sched)
     try:
-        await session.flush()
+        await flush_returning(session, sched)
         await session.commit()
-    except IntegrityError:
+    except IntegrityError as e:
         await session.rollback()
+        if is_exclusion_violation(e, SCHEDULE_OVERLAP_CONSTRAINT):
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
         raise HTTPException(status_code=409, detail="Duplicated schedule for the teacher at the same time")
-    await session.refresh(sched)
     return _schedule_to_out(sched)
 
 
@@ -75,8 +101,12 @@ async def list_schedules(
     date_to: str | None = Query(None),
     page: int = Query(1, ge=1),
     pageSize: int = Query(50, ge=1, le=500),
-    session: AsyncSession = Depends(get_session),
+    cursor: str | None = Query(None, description="커서 모드: 첫 페이지는 빈 문자열, 이후 next_cursor 값 (OFFSET 대신 seek)"),
+    withTotal: bool | None = Query(None, description="total 계산 여부 (기본: offset 모드 true, 커서 모드 false)"),
+    expand_rules: bool = Query(True, description="반복 규칙을 가상 회차로 전개하여 합칠지 여부 (date_from/date_to와 teacher_id 또는 student_id 필요)"),
+    session: AsyncSession = Depends(get_read_session),
 ):
+    date_from_obj = date_to_obj = None
     stmt = select(Schedule)
     cnt = select(func.count()).select_from(Schedule)
 
@@ -107,17 +137,189 @@ async def list_schedules(
         stmt = stmt.where(Schedule.lesson_date <= date_to_obj)
         cnt = cnt.where(Schedule.lesson_date <= date_to_obj)
 
-    total = (await session.execute(cnt)).scalar_one()
-    rows = (
-        await session.execute(
-            stmt.order_by(Schedule.lesson_date.desc(), Schedule.start_time.desc())
-            .offset((page - 1) * pageSize)
-            .limit(pageSize)
+    if withTotal is None:
+        withTotal = cursor is None
+
+    # 반복 규칙 전개: 기간이 정해진 조회에서만 (무기한 전개 방지)
+    virtual: list[dict] = []
+    if (
+        expand_rules
+        and date_from_obj is not None
+        and date_to_obj is not None
+        and (teacher_id is not None or student_id is not None)
+    ):
+        virtual = await load_rule_occurrences(
+            session,
+            window_from=date_from_obj,
+            window_to=date_to_obj,
+            teacher_id=teacher_id,
+            student_id=student_id,
+            subject_id=subject_id,
         )
-    ).scalars().all()
+        if status:
+            virtual = [v for v in virtual if v["status"] == status]
+    if virtual:
+        return await _merged_page(
+            session, stmt, cnt, virtual, page=page, pageSize=pageSize, cursor=cursor, withTotal=withTotal
+        )
+
+    total = (await session.execute(cnt)).scalar_one() if withTotal else None
+
+    next_cursor = None
+    if cursor is not None:
+        try:
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                stmt,
+                (Schedule.lesson_date, Schedule.start_time, Schedule.schedule_id),
+                cursor=cursor,
+                page_size=pageSize,
+                parsers=(date.fromisoformat, str, int),
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        rows = (
+            await session.execute(
+                stmt.order_by(
+                    Schedule.lesson_date.desc(),
+                    Schedule.start_time.desc(),
+                    Schedule.schedule_id.desc(),
+                )
+                .offset((page - 1) * pageSize)
+                .limit(pageSize)
+            )
+        ).scalars().all()
 
     items = [_schedule_to_out(row) for row in rows]
-    return ScheduleListResp(total=total, page=page, pageSize=pageSize, items=items)
+    return ScheduleListResp(
+        total=total, page=page, pageSize=pageSize, items=items, next_cursor=next_cursor
+    )
+
+
+async def _merged_page(
+    session: AsyncSession,
+    stmt,
+    cnt,
+    virtual: list[dict],
+    *,
+    page: int,
+    pageSize: int,
+    cursor: str | None,
+    withTotal: bool,
+) -> ScheduleListResp:
+    """
+    실제 수업과 가상 회차를 합쳐 정렬 후 페이지 분할 (커서 형식은 DB 모드와 동일)
+    - 실제 수업은 필요한 만큼만 조회: 커서 모드는 keyset seek + pageSize+1행, offset 모드는 page*pageSize행
+    - 가상 회차는 기간 내 규칙 전개 결과를 메모리에서 같은 키로 거름
+    """
+    keys = (Schedule.lesson_date, Schedule.start_time, Schedule.schedule_id)
+    virtual_items = [ScheduleOut.model_validate(v) for v in virtual]
+    total = (await session.execute(cnt)).scalar_one() + len(virtual_items) if withTotal else None
+
+    if cursor is not None:
+        if cursor:
+            try:
+                after = tuple(decode_cursor(cursor, (date.fromisoformat, str, int)))
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            # 가상 회차의 키(-rule_id)도 같은 row-value 비교로 이어짐
+            stmt = stmt.where(keyset_after(keys, after, descending=True))
+            virtual_items = [v for v in virtual_items if _merge_sort_key(v) < after]
+        limit = pageSize + 1
+    else:
+        limit = page * pageSize
+    rows = (await session.execute(stmt.order_by(*(k.desc() for k in keys)).limit(limit))).scalars().all()
+    merged = [_schedule_to_out(row) for row in rows]
+    merged.extend(virtual_items)
+    merged.sort(key=_merge_sort_key, reverse=True)
+
+    next_cursor = None
+    if cursor is not None:
+        items = merged[:pageSize]
+        if len(merged) > pageSize:
+            next_cursor = encode_cursor(list(_merge_sort_key(items[-1])))
+    else:
+        items = merged[(page - 1) * pageSize : page * pageSize]
+
+    return ScheduleListResp(
+        total=total, page=page, pageSize=pageSize, items=items, next_cursor=next_cursor
+    )
+
+
+@router.get("/changes", response_model=ScheduleChangesResp)
+async def list_schedule_changes(
+    teacher_id: int = Query(...),
+    since: str | None = Query(None, description="이전 응답의 next_token (없으면 처음부터)"),
+    limit: int = Query(500, ge=1, le=1000),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    증분 동기화: since 이후 updated_at이 바뀐 수업만 반환
+    - (updated_at, schedule_id) keyset으로 ix_schedules_teacher_id_updated_at 범위 스캔
+    - 취소는 삭제되지 않고 status=cancelled 행으로 내려감 (툼스톤)
+    - 토큰에는 마지막 수업 위치와 서버 기준 시각(as_of = 조회 시점 - SYNC_SETTLE)을 함께 담음
+      → 규칙/예외 변경(삭제 포함)은 (이전 as_of, 이번 as_of] 구간만 보고 rules_changed로 한 번만 알림
+    """
+    position = None
+    since_at = None
+    if since:
+        try:
+            updated_at, schedule_id, since_at = decode_cursor(
+                since, (_optional(datetime.fromisoformat), _optional(int), datetime.fromisoformat)
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid since token")
+        if updated_at is not None:
+            position = (updated_at, schedule_id)
+
+    # 늦게 커밋되는 트랜잭션을 기다리기 위해 이 시각 이후 변경은 다음 조회로 미룸
+    as_of = await session.scalar(select(func.localtimestamp() - SYNC_SETTLE))
+    keys = (Schedule.updated_at, Schedule.schedule_id)
+    stmt = select(Schedule).where(Schedule.teacher_id == teacher_id, Schedule.updated_at <= as_of)
+    if position is not None:
+        stmt = stmt.where(keyset_after(keys, position, descending=False))
+    rows = (
+        await session.execute(stmt.order_by(*(k.asc() for k in keys)).limit(limit + 1))
+    ).scalars().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if rows:
+        position = (rows[-1].updated_at, rows[-1].schedule_id)
+    next_token = encode_cursor([*(position or (None, None)), as_of])
+
+    # 반복 규칙 회차는 행이 없으므로 규칙/예외 변경 여부만 알림 (규칙 삭제는 deleted_at 기록으로 updated_at 갱신)
+    rules_changed = False
+    if since_at is not None:
+        rules_changed = bool(
+            await session.scalar(
+                select(
+                    select(ScheduleRule.rule_id)
+                    .where(
+                        ScheduleRule.teacher_id == teacher_id,
+                        ScheduleRule.updated_at > since_at,
+                        ScheduleRule.updated_at <= as_of,
+                    )
+                    .exists()
+                    | select(ScheduleRuleException.exception_id)
+                    .join(ScheduleRule, ScheduleRule.rule_id == ScheduleRuleException.rule_id)
+                    .where(
+                        ScheduleRule.teacher_id == teacher_id,
+                        ScheduleRuleException.updated_at > since_at,
+                        ScheduleRuleException.updated_at <= as_of,
+                    )
+                    .exists()
+                )
+            )
+        )
+
+    return ScheduleChangesResp(
+        items=[_schedule_to_out(row) for row in rows],
+        next_token=next_token,
+        has_more=has_more,
+        rules_changed=rules_changed,
+    )
 
 
 @router.get("/{schedule_id}", response_model=ScheduleOut)
@@ -141,9 +343,30 @@ async def update_schedule(
     data = payload.model_dump(exclude_unset=True)
     for k, v in data.items():
         setattr(obj, k, v)
+    if obj.start_time >= obj.end_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+
+    # 옮긴 시간대가 반복 규칙의 가상 회차와 겹치는지 (이 수업이 실체화된 회차는 예외가 있어 제외됨)
+    if obj.status != "cancelled":
+        with session.no_autoflush:
+            rule_id = await find_rule_occurrence_at(
+                session,
+                teacher_id=obj.teacher_id,
+                lesson_date=obj.lesson_date,
+                start_time=obj.start_time,
+                end_time=obj.end_time,
+            )
+        if rule_id is not None:
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
 
-    await session.commit()
-    await session.refresh(obj)
+    try:
+        await flush_returning(session, obj)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if is_exclusion_violation(e, SCHEDULE_OVERLAP_CONSTRAINT):
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+        raise
     return _schedule_to_out(obj)
 
 
@@ -163,13 +386,12 @@ async def check_conflict(
     start_time_str = start_time_obj.strftime("%H:%M")
     end_time_str = end_time_obj.strftime("%H:%M")
 
+    # EXCLUDE 제약과 같은 조건 → 부분 GiST 인덱스 사용
     stmt = select(func.count()).select_from(Schedule).where(
         and_(
             Schedule.teacher_id == teacher_id,
-            Schedule.lesson_date == lesson_date_obj,
             Schedule.status != "cancelled",  # 취소된 수업 제외
-            Schedule.start_time < end_time_str,
-            Schedule.end_time > start_time_str,
+            Schedule.lesson_range.op("&&")(_lesson_range(lesson_date_obj, start_time_str, end_time_str)),
         )
     )
     count = (await session.execute(stmt)).scalar_one()
@@ -181,64 +403,57 @@ async def bulk_generate(
     teacher_id: int,
     student_id: int,
     subject_id: str,
-    weekday: int,  # 0=Mon ... 6=Sun
     start_time: str,
     end_time: str,
     date_from: str,
     date_to: str,
+    weekday: int | None = Query(None, description="0=Mon ... 6=Sun (단일 요일, 하위 호환)"),
+    weekdays: list[int] | None = Query(None, description="여러 요일 (예: weekdays=0&weekdays=2)"),
+    interval: int = Query(1, ge=1, description="반복 주 간격 (1=매주, 2=격주)"),
+    rrule: str | None = Query(None, description="RRULE 스펙 (예: FREQ=WEEKLY;BYDAY=MO,WE;COUNT=24). 지정 시 요일 옵션 무시"),
+    notes: str | None = Query(None),
+    dry_run: bool = Query(False, description="true면 생성하지 않고 생성될 날짜/충돌만 반환"),
     session: AsyncSession = Depends(get_session),
 ):
-    from datetime import datetime, timedelta
-
-    def parse_date(s: str):
-        return datetime.strptime(s, "%Y-%m-%d").date()
-
-    def parse_time(s: str):
-        return datetime.strptime(s, "%H:%M").time()
-
-    df = parse_date(date_from)
-    dt = parse_date(date_to)
-    st = parse_time(start_time)
-    et = parse_time(end_time)
-    st_str = st.strftime("%H:%M")
-    et_str = et.strftime("%H:%M")
-
-    # move df to first target weekday
-    cur = df
-    while cur.weekday() != weekday:
-        cur = cur + timedelta(days=1)
-
-    created = 0
-    while cur <= dt:
-        # skip if conflict
-        dup = await session.execute(
-            select(func.count())
-            .select_from(Schedule)
-            .where(
-                and_(
-                    Schedule.teacher_id == teacher_id,
-                    Schedule.lesson_date == cur,
-                    Schedule.start_time < et_str,
-                    Schedule.end_time > st_str,
-                )
-            )
-        )
-        if dup.scalar_one() == 0:
-            sched = Schedule(
-                teacher_id=teacher_id,
-                student_id=student_id,
-                lesson_date=cur,
-                start_time=st_str,
-                end_time=et_str,
-                subject_id=subject_id,
-                status="confirmed",
-            )
-            session.add(sched)
-            created += 1
-        cur = cur + timedelta(days=7)
+    try:
+        df = datetime.strptime(date_from, "%Y-%m-%d").date()
+        dt = datetime.strptime(date_to, "%Y-%m-%d").date()
+        st_str = datetime.strptime(start_time, "%H:%M").strftime("%H:%M")
+        et_str = datetime.strptime(end_time, "%H:%M").strftime("%H:%M")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date (YYYY-MM-DD) or time (HH:MM) format")
+    if st_str >= et_str:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    if df > dt:
+        raise HTTPException(status_code=400, detail="date_from must be on or before date_to")
 
-    await session.commit()
-    return {"created": created}
+    try:
+        if rrule:
+            dates = expand_rrule(rrule, df, dt)
+        else:
+            days = list(weekdays or [])
+            if weekday is not None:
+                days.append(weekday)
+            if not days:
+                raise ValueError("weekday, weekdays or rrule is required")
+            dates = expand_weekdays(df, dt, days, interval)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = await generate_recurring_schedules(
+        session,
+        teacher_id=teacher_id,
+        student_id=student_id,
+        subject_id=subject_id,
+        dates=dates,
+        start_time=st_str,
+        end_time=et_str,
+        notes=notes,
+        dry_run=dry_run,
+    )
+    if not dry_run:
+        await session.commit()
+    return {**result, "dry_run": dry_run}
 
 
 @router.delete("/{schedule_id}", response_model=ScheduleOut)
@@ -262,6 +477,6 @@ async def delete_schedule(
     if cancel_reason is not None:
         obj.cancel_reason = cancel_reason
     
+    await flush_returning(session, obj)
     await session.commit()
-    await session.refresh(obj)
     return _schedule_to_out(obj)
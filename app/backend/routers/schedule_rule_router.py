@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from app.backend.db.database import get_session
+from app.backend.db.writes import flush_returning
+from app.backend.db.errors import is_exclusion_violation
+from app.backend.db.models import Schedule, ScheduleRule, ScheduleRuleException
+from app.backend.db.models.schedule import SCHEDULE_OVERLAP_CONSTRAINT
+from app.backend.db.routing import mark_written
+from app.backend.schemas.schedule import ScheduleOut, ScheduleUpdate
+from app.backend.schemas.schedule_rule import (
+    ScheduleRuleCreate,
+    ScheduleRuleExceptionOut,
+    ScheduleRuleOut,
+    ScheduleRuleUpdate,
+)
+from app.backend.services.recurrence import (
+    find_rule_occurrence_at,
+    find_rule_overlaps,
+    find_rule_schedule_conflicts,
+    rule_occurrences,
+    rule_phase_start,
+)
+from app.backend.routers.schedule_router import CONFLICT_DETAIL, _schedule_to_out
+
+# /schedules/{schedule_id}보다 먼저 등록되어야 함 (main.py)
+router = APIRouter(prefix="/schedules/rules", tags=["schedule-rules"])
+
+
+async def _get_rule(session: AsyncSession, rule_id: int) -> ScheduleRule:
+    rule = await session.get(ScheduleRule, rule_id)
+    if not rule or rule.deleted_at is not None:
+        raise HTTPException(404, "Schedule rule not found")
+    return rule
+
+
+async def _check_rule(session: AsyncSession, rule: ScheduleRule, exclude_rule_id: int | None = None) -> None:
+    """시간/기간 검증 + 같은 선생님의 다른 규칙/단건 수업과 겹치는지 확인"""
+    if rule.start_time >= rule.end_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    if rule.valid_to is not None and rule.valid_to < rule.valid_from:
+        raise HTTPException(status_code=400, detail="valid_from must be on or before valid_to")
+    overlaps = await find_rule_overlaps(
+        session,
+        teacher_id=rule.teacher_id,
+        weekday=rule.weekday,
+        start_time=rule.start_time,
+        end_time=rule.end_time,
+        valid_from=rule.valid_from,
+        valid_to=rule.valid_to,
+        exclude_rule_id=exclude_rule_id,
+    )
+    if overlaps:
+        raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+    with session.no_autoflush:
+        if await find_rule_schedule_conflicts(session, rule, exclude_rule_ids=(exclude_rule_id,)):
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+
+
+async def _rule_exceptions(
+    session: AsyncSession, rule_id: int, date_from: date | None = None
+) -> list[ScheduleRuleException]:
+    stmt = select(ScheduleRuleException).where(ScheduleRuleException.rule_id == rule_id)
+    if date_from is not None:
+        stmt = stmt.where(ScheduleRuleException.occurrence_date >= date_from)
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def _drop_orphaned_exceptions(
+    session: AsyncSession, exceptions: list[ScheduleRuleException], rule: ScheduleRule
+) -> list[ScheduleRuleException]:
+    """
+    규칙이 더 이상 만들지 않는 날짜의 예외 정리, 남은 예외 반환
+    - 취소 예외: 취소할 회차가 없으므로 삭제
+    - 실체화/이동 예외: 실제 수업과 새 회차가 함께 보이게 되므로 409 (먼저 해당 수업을 옮기거나 취소)
+    """
+    kept = []
+    for exc in exceptions:
+        if rule_occurrences(rule, exc.occurrence_date, exc.occurrence_date):
+            kept.append(exc)
+        elif exc.schedule_id is not None:
+            raise HTTPException(
+                status_code=409,
+                detail=(
+                    f"Occurrence on {exc.occurrence_date} is materialized as schedule {exc.schedule_id}; "
+                    "move or cancel it before changing the rule"
+                ),
+            )
+        else:
+            await session.delete(exc)
+    return kept
+
+
+@router.post("", response_model=ScheduleRuleOut, status_code=201)
+async def create_rule(payload: ScheduleRuleCreate, session: AsyncSession = Depends(get_session)):
+    rule = ScheduleRule(**payload.model_dump())
+    await _check_rule(session, rule)
+    await flush_returning(session, rule)
+    await session.commit()
+    return rule
+
+
+@router.get("", response_model=list[ScheduleRuleOut])
+async def list_rules(
+    teacher_id: int | None = Query(None),
+    student_id: int | None = Query(None),
+    active_on: date | None = Query(None, description="해당 날짜에 유효한 규칙만"),
+    session: AsyncSession = Depends(get_session),
+):
+    stmt = select(ScheduleRule).where(ScheduleRule.deleted_at.is_(None))
+    if teacher_id is not None:
+        stmt = stmt.where(ScheduleRule.teacher_id == teacher_id)
+    if student_id is not None:
+        stmt = stmt.where(ScheduleRule.student_id == student_id)
+    if active_on is not None:
+        stmt = stmt.where(
+            ScheduleRule.valid_from <= active_on,
+            (ScheduleRule.valid_to.is_(None)) | (ScheduleRule.valid_to >= active_on),
+        )
+    rows = (await session.execute(stmt.order_by(ScheduleRule.weekday, ScheduleRule.start_time))).scalars().all()
+    return rows
+
+
+@router.get("/{rule_id}", response_model=ScheduleRuleOut)
+async def get_rule(rule_id: int, session: AsyncSession = Depends(get_session)):
+    return await _get_rule(session, rule_id)
+
+
+@router.patch("/{rule_id}", response_model=ScheduleRuleOut)
+async def update_rule(
+    rule_id: int,
+    payload: ScheduleRuleUpdate,
+    effective_from: date | None = Query(
+        None, description="지정 시 기존 규칙은 전날까지로 종료하고 이날부터 새 규칙으로 분리 (과거 회차 보존)"
+    ),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    "매주 화요일 수업 변경"을 규칙 1행 수정으로 처리
+    effective_from이 기존 시작일 이후면 규칙을 둘로 나누어 새 규칙을 반환
+    (이후 날짜의 예외와 실체화된 수업은 새 규칙으로 이동)
+    """
+    rule = await _get_rule(session, rule_id)
+    data = payload.model_dump(exclude_unset=True)
+
+    if effective_from is not None and effective_from > rule.valid_from:
+        if rule.valid_to is not None and effective_from > rule.valid_to:
+            raise HTTPException(status_code=400, detail="effective_from is after the rule ends")
+        new_rule = ScheduleRule(
+            teacher_id=rule.teacher_id,
+            student_id=rule.student_id,
+            subject_id=rule.subject_id,
+            weekday=rule.weekday,
+            start_time=rule.start_time,
+            end_time=rule.end_time,
+            interval_weeks=rule.interval_weeks,
+            valid_from=effective_from,
+            valid_to=rule.valid_to,
+            notes=rule.notes,
+        )
+        for k, v in data.items():
+            if k != "valid_from":
+                setattr(new_rule, k, v)
+        if "interval_weeks" not in data:
+            # 격주 규칙을 쉬는 주에서 나눠도 주기가 밀리지 않게 다음 수업 주부터 시작
+            phase_start = rule_phase_start(rule, effective_from)
+            if new_rule.valid_to is None or phase_start <= new_rule.valid_to:
+                new_rule.valid_from = phase_start
+        rule.valid_to = effective_from - timedelta(days=1)
+        await _check_rule(session, new_rule, exclude_rule_id=rule.rule_id)
+        # effective_from 이후 예외(취소/실체화)는 그 회차를 만드는 새 규칙으로 이동
+        moved = await _drop_orphaned_exceptions(
+            session, await _rule_exceptions(session, rule.rule_id, effective_from), new_rule
+        )
+        await flush_returning(session, new_rule)
+        for exc in moved:
+            exc.rule_id = new_rule.rule_id
+        schedule_ids = [exc.schedule_id for exc in moved if exc.schedule_id is not None]
+        if schedule_ids:
+            await session.execute(
+                update(Schedule).where(Schedule.schedule_id.in_(schedule_ids)).values(rule_id=new_rule.rule_id)
+            )
+        mark_written(session, rule.teacher_id)
+        await session.commit()
+        return new_rule
+
+    for k, v in data.items():
+        setattr(rule, k, v)
+    await _check_rule(session, rule, exclude_rule_id=rule.rule_id)
+    await _drop_orphaned_exceptions(session, await _rule_exceptions(session, rule.rule_id), rule)
+    await flush_returning(session, rule)
+    await session.commit()
+    return rule
+
+
+@router.delete("/{rule_id}", status_code=204)
+async def delete_rule(
+    rule_id: int,
+    effective_from: date | None = Query(None, description="지정 시 삭제 대신 이날 이후 회차만 종료"),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    규칙 삭제 (실체화된 schedules 행은 rule_id만 NULL로 남음)
+    행은 deleted_at만 기록해 남겨 둠 → GET /schedules/changes가 삭제를 rules_changed로 알림
+    """
+    rule = await _get_rule(session, rule_id)
+    if effective_from is not None and effective_from > rule.valid_from:
+        rule.valid_to = effective_from - timedelta(days=1)
+    else:
+        rule.deleted_at = func.now()
+        await session.execute(update(Schedule).where(Schedule.rule_id == rule_id).values(rule_id=None))
+    mark_written(session, rule.teacher_id)
+    await session.commit()
+
+
+@router.patch("/{rule_id}/occurrences/{occurrence_date}", response_model=ScheduleOut)
+async def materialize_occurrence(
+    rule_id: int,
+    occurrence_date: date,
+    payload: ScheduleUpdate,
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    가상 회차에 출결/메모/시간 변경을 기록 → schedules 행으로 실체화
+    이후 수정은 PATCH /schedules/{schedule_id}로 진행
+    """
+    rule = await _get_rule(session, rule_id)
+    if not rule_occurrences(rule, occurrence_date, occurrence_date):
+        raise HTTPException(404, "Occurrence not found for this rule")
+
+    existing = (
+        await session.execute(
+            select(ScheduleRuleException).where(
+                ScheduleRuleException.rule_id == rule_id,
+                ScheduleRuleException.occurrence_date == occurrence_date,
+            )
+        )
+    ).scalar_one_or_none()
+    if existing is not None:
+        if existing.schedule_id is not None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Occurrence already materialized as schedule {existing.schedule_id}",
+            )
+        if existing.kind == "cancelled" and payload.status != "cancelled":
+            # 취소했던 회차를 되살리는 경우: 취소 예외를 실체화 예외로 교체
+            await session.delete(existing)
+            await session.flush()
+            existing = None
+
+    data = payload.model_dump(exclude_unset=True)
+    sched = Schedule(
+        teacher_id=rule.teacher_id,
+        student_id=rule.student_id,
+        subject_id=rule.subject_id,
+        lesson_date=occurrence_date,
+        start_time=rule.start_time,
+        end_time=rule.end_time,
+        notes=rule.notes,
+        rule_id=rule.rule_id,
+    )
+    for k, v in data.items():
+        setattr(sched, k, v)
+    if existing is not None:
+        # 남아 있는 예외는 취소 예외 → 취소 정보를 수업 행으로 옮김
+        sched.cancelled_by = sched.cancelled_by or existing.cancelled_by
+        sched.cancel_reason = sched.cancel_reason or existing.cancel_reason
+    if sched.start_time >= sched.end_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    if sched.status != "cancelled":
+        # 다른 규칙의 가상 회차와 겹치는지 (같은 날짜면 지금 실체화하는 이 규칙 회차는 제외)
+        other_rule_id = await find_rule_occurrence_at(
+            session,
+            teacher_id=rule.teacher_id,
+            lesson_date=sched.lesson_date,
+            start_time=sched.start_time,
+            end_time=sched.end_time,
+            exclude_rule_id=rule.rule_id if sched.lesson_date == occurrence_date else None,
+        )
+        if other_rule_id is not None:
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+
+    moved = (sched.lesson_date, sched.start_time, sched.end_time) != (
+        occurrence_date,
+        rule.start_time,
+        rule.end_time,
+    )
+    try:
+        await flush_returning(session, sched)
+        if existing is not None:
+            # 취소된 회차를 취소 상태 그대로 실체화: 예외도 실체화로 바꿔야 가상 취소 회차가 중복되지 않음
+            existing.schedule_id = sched.schedule_id
+            existing.kind = "moved" if moved else "materialized"
+        else:
+            session.add(
+                ScheduleRuleException(
+                    rule_id=rule.rule_id,
+                    occurrence_date=occurrence_date,
+                    kind="moved" if moved else "materialized",
+                    schedule_id=sched.schedule_id,
+                )
+            )
+        mark_written(session, rule.teacher_id)
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        if is_exclusion_violation(e, SCHEDULE_OVERLAP_CONSTRAINT):
+            raise HTTPException(status_code=409, detail=CONFLICT_DETAIL)
+        raise HTTPException(status_code=409, detail="Occurrence was modified concurrently")
+    return _schedule_to_out(sched)
+
+
+@router.delete("/{rule_id}/occurrences/{occurrence_date}", response_model=ScheduleRuleExceptionOut)
+async def cancel_occurrence(
+    rule_id: int,
+    occurrence_date: date,
+    cancelled_by: int | None = Query(None),
+    cancel_reason: str | None = Query(None),
+    session: AsyncSession = Depends(get_session),
+):
+    """회차 1건 취소 (schedules 행을 만들지 않고 예외만 기록)"""
+    rule = await _get_rule(session, rule_id)
+    if not rule_occurrences(rule, occurrence_date, occurrence_date):
+        raise HTTPException(404, "Occurrence not found for this rule")
+
+    exc = ScheduleRuleException(
+        rule_id=rule_id,
+        occurrence_date=occurrence_date,
+        kind="cancelled",
+        cancelled_by=cancelled_by,
+        cancel_reason=cancel_reason,
+    )
+    try:
+        await flush_returning(session, exc)
+        # 예외 행에는 teacher_id가 없어 before_flush가 교사를 알 수 없음
+        mark_written(session, rule.teacher_id)
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail="Occurrence already has an exception; update the materialized schedule instead",
+        )
+    return exc
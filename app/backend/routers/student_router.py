@@ -1,29 +1,71 @@
 # app/backend/routers/student_router.py
+from datetime import datetime
 from fastapi import APIRouter, Depends, Query, HTTPException
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import load_only, undefer_group
 from app.backend.db.database import get_session
+from app.backend.db.routing import get_read_session
+from app.backend.core.crypto import phone_hash_hex
+from app.backend.services.student_search import search_student_ids
+from app.backend.db.writes import flush_returning
 from app.backend.db.models import Student, StudentHistory
+from app.backend.db.types import SENSITIVE_GROUP
+from app.backend.db.bulk_decrypt import attach_decrypted, defer_encrypted, with_raw_encrypted
 from app.backend.schemas.student import (
     StudentCreate,
     StudentOut,
     StudentListResp,
     StudentUpdate,
+    StudentView,
 )
 from app.backend.schemas.student_history import (
     StudentHistoryOut,
     StudentHistoryChangeType,
 )
+from app.backend.utils.pagination import fetch_keyset_page
 
 router = APIRouter(prefix="/students", tags=["students"])
 
+# 전체 컬럼 로드 (deferred 민감 컬럼 포함) - 단건 조회/이력 스냅샷용
+FULL_LOAD = (undefer_group(SENSITIVE_GROUP),)
+# 목록에서 페이지 단위로 일괄 복호화할 암호화 컬럼 (view별)
+LIST_ENCRYPTED = {
+    "full": ("name", "phone", "parent_phone"),
+    "summary": ("name", "phone"),
+}
+# 목록 summary 뷰: 화면에 표시하는 컬럼만 SELECT (parent_phone/notes는 복호화하지 않음)
+# name/phone은 LIST_ENCRYPTED로 따로 조회
+SUMMARY_LOAD = (
+    load_only(
+        Student.student_id,
+        Student.teacher_id,
+        Student.school,
+        Student.grade,
+        Student.subject_id,
+        Student.start_date,
+        Student.lesson_day,
+        Student.lesson_time,
+        Student.hourly_rate,
+        Student.is_active,
+        Student.is_adult,
+        Student.created_at,
+        Student.updated_at,
+    ),
+)
+
 
 def _student_snapshot(student: Student) -> dict:
-    """Serialize a Student ORM object to a JSON-friendly dict."""
-    mapper = inspect(student)
-    raw = {attr.key: getattr(student, attr.key) for attr in mapper.mapper.column_attrs}
+    """Serialize a Student ORM object to a JSON-friendly dict (로드되지 않은 컬럼은 제외)."""
+    state = inspect(student)
+    unloaded = state.unloaded
+    raw = {
+        attr.key: getattr(student, attr.key)
+        for attr in state.mapper.column_attrs
+        if attr.key not in unloaded
+    }
     return jsonable_encoder(raw)
 
 
@@ -101,10 +143,8 @@ async def create_student(payload: StudentCreate, session: AsyncSession = Depends
         print(f"⚠️ 경고: teacher_id가 None입니다!")
     
     student = Student(**safe)
-    session.add(student)
     try:
-        await session.flush()
-        await session.refresh(student)
+        await flush_returning(session, student)
         print(f"✅ 학생 생성 성공: student_id={student.student_id}, teacher_id={student.teacher_id}")
         after_snapshot = _student_snapshot(student)
         print(f"  - after_snapshot.teacher_id: {after_snapshot.get('teacher_id')}")
@@ -124,14 +164,17 @@ async def create_student(payload: StudentCreate, session: AsyncSession = Depends
 
 @router.get("", response_model=StudentListResp)
 async def list_students(
-    q: str | None = Query(None, description="이름 부분검색"),
+    q: str | None = Query(None, description="이름 부분검색 (초성 검색 가능, 예: 환주, ㅎㅈ)"),
     teacher_id: int | None = Query(None, description="담당 교사 ID"),
     is_active: bool | None = Query(None, description="활성화 여부 (None: 전체, True: 활성화만, False: 비활성화만)"),
     orderBy: str = Query("created_at"),
     order: str = Query("desc"),
     page: int = Query(1, ge=1),
     pageSize: int = Query(20, ge=1, le=200),
-    session: AsyncSession = Depends(get_session),
+    cursor: str | None = Query(None, description="커서 모드 (orderBy=created_at만 지원): 첫 페이지는 빈 문자열, 이후 next_cursor 값"),
+    withTotal: bool | None = Query(None, description="total 계산 여부 (기본: offset 모드 true, 커서 모드 false)"),
+    view: StudentView = Query("full", description="summary: parent_phone/notes 제외 (목록 화면용)"),
+    session: AsyncSession = Depends(get_read_session),
 ):
     ORDERABLE = {
         "created_at": Student.created_at,
@@ -141,10 +184,15 @@ async def list_students(
         "start_date": Student.start_date,
     }
     order_col = ORDERABLE.get(orderBy, Student.created_at)
+    # 같은 값이 여러 행이면 페이지 사이에 순서가 바뀌지 않도록 student_id로 한 번 더 정렬
+    tiebreak = Student.student_id
     if order.lower() == "desc":
-        order_col = order_col.desc()
+        order_col, tiebreak = order_col.desc(), tiebreak.desc()
 
-    base = select(Student)
+    # 암호화 컬럼은 엔티티 로드에서 빼고 암호문으로 받아 페이지 단위로 일괄 복호화
+    encrypted = LIST_ENCRYPTED[view]
+    options = SUMMARY_LOAD if view == "summary" else defer_encrypted(Student, encrypted)
+    base = with_raw_encrypted(select(Student).options(*options), Student, encrypted)
     cnt = select(func.count()).select_from(Student)
 
     if teacher_id is not None:
@@ -156,28 +204,69 @@ async def list_students(
         cnt = cnt.where(Student.is_active == is_active)
 
     if q:
-        # 암호화된 필드는 직접 검색 불가, 해시 필드로 정확 일치 검색
-        # 부분 검색은 모든 레코드를 가져와서 복호화 후 필터링 (비효율적)
-        # TODO: 검색 인덱스 테이블 또는 별도 검색 엔진 사용 고려
-        # 임시로 해시 기반 정확 일치만 지원
-        from app.backend.core.crypto import hmac_sha256_hex
-        q_hash = hmac_sha256_hex(q)
-        base = base.where(Student.name_hash == q_hash)
-        cnt = cnt.where(Student.name_hash == q_hash)
+        # 이름은 암호문이므로 blind n-gram 인덱스로 후보를 찾고 후보만 복호화해서 확인
+        matched_ids = await search_student_ids(session, q, teacher_id=teacher_id, is_active=is_active)
+        base = base.where(Student.student_id.in_(matched_ids))
+        cnt = cnt.where(Student.student_id.in_(matched_ids))
 
-    total = (await session.execute(cnt)).scalar_one()
-    rows = (
-        await session.execute(
-            base.order_by(order_col).offset((page - 1) * pageSize).limit(pageSize)
-        )
-    ).scalars().all()
+    if withTotal is None:
+        withTotal = cursor is None
+    total = (await session.execute(cnt)).scalar_one() if withTotal else None
 
+    next_cursor = None
+    if cursor is not None:
+        # 커서는 NOT NULL + 평문 정렬이 가능한 created_at 기준만 지원 (name/phone은 암호문)
+        if orderBy != "created_at":
+            raise HTTPException(status_code=400, detail="cursor pagination supports orderBy=created_at only")
+        try:
+            rows, next_cursor = await fetch_keyset_page(
+                session,
+                base,
+                (Student.created_at, Student.student_id),
+                cursor=cursor,
+                page_size=pageSize,
+                parsers=(datetime.fromisoformat, int),
+                descending=order.lower() == "desc",
+            )
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    else:
+        rows = (
+            await session.execute(
+                base.order_by(order_col, tiebreak).offset((page - 1) * pageSize).limit(pageSize)
+            )
+        ).all()
+
+    rows = await attach_decrypted(rows, encrypted)
     items = [_snapshot_to_out(_student_snapshot(s)) for s in rows]
-    return StudentListResp(total=total, page=page, pageSize=pageSize, items=items)
+    return StudentListResp(
+        total=total, page=page, pageSize=pageSize, items=items, next_cursor=next_cursor, view=view
+    )
+
+@router.get("/by-phone", response_model=list[StudentOut])
+async def list_students_by_phone(
+    phone: str = Query(..., min_length=1, description="전화번호 (010-1234-5678, 01012345678, +821012345678 모두 가능)"),
+    teacher_id: int | None = Query(None, description="담당 교사 ID"),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    전화번호로 학생 조회 (발신자 표시 등)
+    phone_hash가 E.164 정규화 후 해시이므로 ix_students_phone_hash 인덱스 조회 1번
+    """
+    stmt = (
+        select(Student)
+        .options(*FULL_LOAD)
+        .where(Student.phone_hash == phone_hash_hex(phone))
+        .order_by(Student.student_id)
+    )
+    if teacher_id is not None:
+        stmt = stmt.where(Student.teacher_id == teacher_id)
+    rows = (await session.execute(stmt)).scalars().all()
+    return [_snapshot_to_out(_student_snapshot(s)) for s in rows]
 
 @router.get("/{student_id}", response_model=StudentOut)
 async def get_student(student_id: int, session: AsyncSession = Depends(get_session)):
-    obj = await session.get(Student, student_id)
+    obj = await session.get(Student, student_id, options=FULL_LOAD)
     if not obj:
         raise HTTPException(404, "Student not found")
     return _snapshot_to_out(_student_snapshot(obj))
@@ -188,7 +277,7 @@ async def update_student(
     payload: StudentUpdate,
     session: AsyncSession = Depends(get_session),
 ):
-    obj = await session.get(Student, student_id)
+    obj = await session.get(Student, student_id, options=FULL_LOAD)
     if not obj:
         raise HTTPException(404, "Student not found")
 
@@ -200,8 +289,7 @@ async def update_student(
             setattr(obj, k, v)
 
     try:
-        await session.flush()
-        await session.refresh(obj)
+        await flush_returning(session, obj)
         after_snapshot = _student_snapshot(obj)
         session.add(
             _build_history_entry(
@@ -219,7 +307,7 @@ async def update_student(
 
 @router.delete("/{student_id}", status_code=204)
 async def delete_student(student_id: int, session: AsyncSession = Depends(get_session)):
-    obj = await session.get(Student, student_id)
+    obj = await session.get(Student, student_id, options=FULL_LOAD)
     if not obj:
         raise HTTPException(404, "Student not found")
     before_snapshot = _student_snapshot(obj)
@@ -242,7 +330,7 @@ async def delete_student(student_id: int, session: AsyncSession = Depends(get_se
 @router.get("/{student_id}/history", response_model=list[StudentHistoryOut])
 async def list_student_history(
     student_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     student_exists = await session.scalar(select(func.count()).select_from(Student).where(Student.student_id == student_id))
     if not student_exists:
@@ -1,30 +1,84 @@
 from __future__ import annotations
 
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import load_only, undefer_group
 
 from app.backend.db.database import get_session
+from app.backend.db.routing import get_read_session
+from app.backend.db.writes import flush_returning
 from app.backend.db.models import Teacher, TeacherHistory
+from app.backend.db.types import SENSITIVE_GROUP
+from app.backend.db.bulk_decrypt import attach_decrypted, defer_encrypted, with_raw_encrypted
 from app.backend.schemas.teacher import (
+    FreeSlotsResp,
     TeacherCreate,
     TeacherOut,
     TeacherListResp,
     TeacherUpdate,
+    TeacherView,
 )
 from app.backend.schemas.teacher_history import (
     TeacherHistoryOut,
     TeacherHistoryChangeType,
 )
+from app.backend.services.availability import MAX_RANGE_DAYS, find_free_slots
 
 router = APIRouter(prefix="/teachers", tags=["teachers"])
 
+# 전체 컬럼 로드 (deferred 계좌 정보 포함) - 단건 조회/이력 스냅샷용
+FULL_LOAD = (undefer_group(SENSITIVE_GROUP),)
+# 목록에서 페이지 단위로 일괄 복호화할 암호화 컬럼 (view별)
+LIST_ENCRYPTED = {
+    "full": ("phone", "email", "account_name", "account_number"),
+    "summary": ("phone",),
+}
+# 목록 summary 뷰: 계좌 정보/이메일/메모는 SELECT도 복호화도 하지 않음
+# phone은 LIST_ENCRYPTED로 따로 조회
+SUMMARY_LOAD = (
+    load_only(
+        Teacher.teacher_id,
+        Teacher.nickname,
+        Teacher.provider,
+        Teacher.oauth_id,
+        Teacher.subject_id,
+        Teacher.tax_type,
+        Teacher.hourly_rate_min,
+        Teacher.hourly_rate_max,
+        Teacher.available_days,
+        Teacher.available_time,
+        Teacher.total_students,
+        Teacher.monthly_income,
+        Teacher.created_at,
+        Teacher.updated_at,
+    ),
+)
+# 빈 시간 계산에 필요한 컬럼 (암호화 컬럼 없음)
+AVAILABILITY_LOAD = (
+    load_only(
+        Teacher.teacher_id,
+        Teacher.lesson_start_hour,
+        Teacher.lesson_end_hour,
+        Teacher.exclude_weekends,
+        Teacher.vacation_start,
+        Teacher.vacation_end,
+    ),
+)
+
 
 def _teacher_snapshot(teacher: Teacher) -> dict:
-    mapper = inspect(teacher)
-    raw = {attr.key: getattr(teacher, attr.key) for attr in mapper.mapper.column_attrs}
+    """로드된 컬럼만 직렬화 (summary 뷰에서 지연 로딩이 일어나지 않도록)"""
+    state = inspect(teacher)
+    unloaded = state.unloaded
+    raw = {
+        attr.key: getattr(teacher, attr.key)
+        for attr in state.mapper.column_attrs
+        if attr.key not in unloaded
+    }
     return jsonable_encoder(raw)
 
 
@@ -82,10 +136,8 @@ async def create_teacher(payload: TeacherCreate, session: AsyncSession = Depends
         if exists:
             raise HTTPException(status_code=409, detail="Nickname already in use")
     teacher = Teacher(**safe)
-    session.add(teacher)
     try:
-        await session.flush()
-        await session.refresh(teacher)
+        await flush_returning(session, teacher)
         after_snapshot = _teacher_snapshot(teacher)
         session.add(
             _build_history_entry(
@@ -109,6 +161,7 @@ async def list_teachers(
     order: str = Query("desc"),
     page: int = Query(1, ge=1),
     pageSize: int = Query(20, ge=1, le=200),
+    view: TeacherView = Query("full", description="summary: 계좌 정보/이메일/메모 제외 (목록 화면용)"),
     session: AsyncSession = Depends(get_session),
 ):
     orderable = {
@@ -122,7 +175,10 @@ async def list_teachers(
     if order.lower() == "desc":
         order_col = order_col.desc()
 
-    stmt = select(Teacher)
+    # 암호화 컬럼은 암호문으로 받아 페이지 단위로 일괄 복호화
+    encrypted = LIST_ENCRYPTED[view]
+    options = SUMMARY_LOAD if view == "summary" else defer_encrypted(Teacher, encrypted)
+    stmt = with_raw_encrypted(select(Teacher).options(*options), Teacher, encrypted)
     count_stmt = select(func.count()).select_from(Teacher)
 
     if q:
@@ -138,10 +194,11 @@ async def list_teachers(
         await session.execute(
             stmt.order_by(order_col).offset((page - 1) * pageSize).limit(pageSize)
         )
-    ).scalars().all()
+    ).all()
+    rows = await attach_decrypted(rows, encrypted)
 
     items = [_snapshot_to_out(_teacher_snapshot(row)) for row in rows]
-    return TeacherListResp(total=total, page=page, pageSize=pageSize, items=items)
+    return TeacherListResp(total=total, page=page, pageSize=pageSize, items=items, view=view)
 
 
 @router.get("/by-oauth", response_model=TeacherOut)
@@ -151,7 +208,7 @@ async def get_teacher_by_oauth(
     session: AsyncSession = Depends(get_session),
 ):
     """OAuth provider와 oauth_id로 teacher 조회"""
-    stmt = select(Teacher).where(
+    stmt = select(Teacher).options(*FULL_LOAD).where(
         Teacher.provider == provider,
         Teacher.oauth_id == oauth_id,
     )
@@ -164,7 +221,7 @@ async def get_teacher_by_oauth(
 
 @router.get("/{teacher_id}", response_model=TeacherOut)
 async def get_teacher(teacher_id: int, session: AsyncSession = Depends(get_session)):
-    teacher = await session.get(Teacher, teacher_id)
+    teacher = await session.get(Teacher, teacher_id, options=FULL_LOAD)
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     return _snapshot_to_out(_teacher_snapshot(teacher))
@@ -176,11 +233,6 @@ async def update_teacher(
     payload: TeacherUpdate,
     session: AsyncSession = Depends(get_session),
 ):
-    teacher = await session.get(Teacher, teacher_id)
-    if not teacher:
-        raise HTTPException(status_code=404, detail="Teacher not found")
-
-    before_snapshot = _teacher_snapshot(teacher)
     data = payload.model_dump(exclude_unset=True)
     allowed_fields = {
         "nickname",
@@ -212,23 +264,26 @@ async def update_teacher(
             detail=f"Fields cannot be updated: {', '.join(disallowed)}",
         )
 
+    # 닉네임 중복은 행을 읽기(복호화) 전에 COUNT로 확인
     if "nickname" in data:
-        new_nickname = data["nickname"]
-        if new_nickname != teacher.nickname:
-            exists = await session.scalar(
-                select(func.count())
-                .select_from(Teacher)
-                .where(Teacher.nickname == new_nickname, Teacher.teacher_id != teacher_id)
-            )
-            if exists:
-                raise HTTPException(status_code=409, detail="Nickname already in use")
+        exists = await session.scalar(
+            select(func.count())
+            .select_from(Teacher)
+            .where(Teacher.nickname == data["nickname"], Teacher.teacher_id != teacher_id)
+        )
+        if exists:
+            raise HTTPException(status_code=409, detail="Nickname already in use")
+
+    teacher = await session.get(Teacher, teacher_id, options=FULL_LOAD)
+    if not teacher:
+        raise HTTPException(status_code=404, detail="Teacher not found")
 
+    before_snapshot = _teacher_snapshot(teacher)
     for key, value in data.items():
         setattr(teacher, key, value)
 
     try:
-        await session.flush()
-        await session.refresh(teacher)
+        await flush_returning(session, teacher)
         after_snapshot = _teacher_snapshot(teacher)
         session.add(
             _build_history_entry(
@@ -247,7 +302,7 @@ async def update_teacher(
 
 @router.delete("/{teacher_id}", status_code=204)
 async def delete_teacher(teacher_id: int, session: AsyncSession = Depends(get_session)):
-    teacher = await session.get(Teacher, teacher_id)
+    teacher = await session.get(Teacher, teacher_id, options=FULL_LOAD)
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     before_snapshot = _teacher_snapshot(teacher)
@@ -270,7 +325,7 @@ async def delete_teacher(teacher_id: int, session: AsyncSession = Depends(get_se
 @router.get("/{teacher_id}/history", response_model=list[TeacherHistoryOut])
 async def list_teacher_history(
     teacher_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ):
     teacher_exists = await session.scalar(
         select(func.count()).select_from(Teacher).where(Teacher.teacher_id == teacher_id)
@@ -285,3 +340,46 @@ async def list_teacher_history(
     )
     rows = (await session.execute(stmt)).scalars().all()
     return rows
+
+
+@router.get("/{teacher_id}/free-slots", response_model=FreeSlotsResp)
+async def list_free_slots(
+    teacher_id: int,
+    date_from: date = Query(..., alias="from", description="시작일 (YYYY-MM-DD)"),
+    date_to: date = Query(..., alias="to", description="종료일 (YYYY-MM-DD, 포함)"),
+    duration: int = Query(60, ge=5, le=720, description="수업 길이 (분)"),
+    step: int = Query(30, ge=5, le=240, description="시작 시각 간격 (분)"),
+    disabled_hours: list[int] | None = Query(None, description="추가로 제외할 시(0~23), 예: disabled_hours=13&disabled_hours=18"),
+    limit: int = Query(200, ge=1, le=2000),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    수업 가능 시간(lesson_start_hour~lesson_end_hour, 주말/휴가 제외)에서
+    기존 수업(반복 규칙 포함)과 겹치지 않는 duration분짜리 빈 시간 목록
+    """
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="from must be on or before to")
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range too large (max {MAX_RANGE_DAYS} days)")
+
+    teacher = await session.get(Teacher, teacher_id, options=AVAILABILITY_LOAD)
+    if not teacher:
+        raise HTTPException(status_code=404, detail="Teacher not found")
+
+    items = await find_free_slots(
+        session,
+        teacher,
+        date_from=date_from,
+        date_to=date_to,
+        duration_minutes=duration,
+        step_minutes=step,
+        disabled_hours=disabled_hours or (),
+        limit=limit,
+    )
+    return FreeSlotsResp(
+        teacher_id=teacher_id,
+        date_from=date_from,
+        date_to=date_to,
+        duration=duration,
+        items=items,
+    )
@@ -64,8 +64,9 @@ class InvoiceOut(InvoiceBase):
 
 
 class InvoiceListResp(BaseModel):
-    total: int
+    total: Optional[int] = None  # 커서 모드에서는 withTotal=true일 때만 계산
     page: int
     pageSize: int
     items: list[InvoiceOut]
+    next_cursor: Optional[str] = None  # 커서 모드: 다음 페이지 토큰 (없으면 마지막 페이지)
 
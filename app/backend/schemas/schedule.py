@@ -43,13 +43,22 @@ class ScheduleUpdate(BaseModel):
 
 class ScheduleOut(ScheduleBase):
     model_config = ConfigDict(from_attributes=True)
-    schedule_id: int
+    schedule_id: Optional[int] = None  # 실체화되지 않은 반복 회차는 None
+    rule_id: Optional[int] = None  # 반복 규칙에서 온 회차면 규칙 ID
     created_at: datetime
     updated_at: datetime
 
 
 class ScheduleListResp(BaseModel):
-    total: int
+    total: Optional[int] = None  # 커서 모드에서는 withTotal=true일 때만 계산
     page: int
     pageSize: int
     items: list[ScheduleOut]
+    next_cursor: Optional[str] = None  # 커서 모드: 다음 페이지 토큰 (없으면 마지막 페이지)
+
+
+class ScheduleChangesResp(BaseModel):
+    items: list[ScheduleOut]  # since 이후 변경된 수업 (취소는 status=cancelled 툼스톤)
+    next_token: str  # 다음 요청의 since 값
+    has_more: bool  # true면 바로 다시 요청 (limit 초과)
+    rules_changed: bool = False  # 반복 규칙/예외가 바뀌었으면 기간 목록을 다시 조회
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+RuleExceptionKind = Literal["cancelled", "materialized", "moved"]
+
+
+class ScheduleRuleBase(BaseModel):
+    teacher_id: int
+    student_id: int
+    subject_id: str
+    weekday: int = Field(..., ge=0, le=6, description="0=월 ... 6=일")
+    start_time: str = Field(..., pattern=r"^\d{2}:\d{2}$")
+    end_time: str = Field(..., pattern=r"^\d{2}:\d{2}$")
+    interval_weeks: int = Field(1, ge=1, description="1=매주, 2=격주")
+    valid_from: date
+    valid_to: Optional[date] = None
+    notes: Optional[str] = None
+
+
+class ScheduleRuleCreate(ScheduleRuleBase):
+    pass
+
+
+class ScheduleRuleUpdate(BaseModel):
+    subject_id: Optional[str] = None
+    weekday: Optional[int] = Field(None, ge=0, le=6)
+    start_time: Optional[str] = Field(None, pattern=r"^\d{2}:\d{2}$")
+    end_time: Optional[str] = Field(None, pattern=r"^\d{2}:\d{2}$")
+    interval_weeks: Optional[int] = Field(None, ge=1)
+    valid_from: Optional[date] = None
+    valid_to: Optional[date] = None
+    notes: Optional[str] = None
+
+
+class ScheduleRuleOut(ScheduleRuleBase):
+    model_config = ConfigDict(from_attributes=True)
+    rule_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class ScheduleRuleExceptionOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    exception_id: int
+    rule_id: int
+    occurrence_date: date
+    kind: RuleExceptionKind
+    schedule_id: Optional[int] = None
+    cancelled_by: Optional[int] = None
+    cancel_reason: Optional[str] = None
+    created_at: datetime
@@ -1,8 +1,11 @@
 # app/backend/schemas/student.py
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime, date
 
+# summary: 목록용 (parent_phone, notes를 읽지 않고 null로 반환)
+StudentView = Literal["full", "summary"]
+
 class StudentBase(BaseModel):
     name: str
     phone: str
@@ -45,7 +48,9 @@ class StudentOut(StudentBase):
     updated_at: datetime
 
 class StudentListResp(BaseModel):
-    total: int
+    total: Optional[int] = None  # 커서 모드에서는 withTotal=true일 때만 계산
     page: int
     pageSize: int
     items: list[StudentOut]
+    next_cursor: Optional[str] = None  # 커서 모드: 다음 페이지 토큰 (없으면 마지막 페이지)
+    view: StudentView = "full"
@@ -7,6 +7,8 @@ from pydantic import BaseModel, ConfigDict, field_validator
 
 TaxType = Literal["사업소득", "기타소득", "프리랜서", "미신고"]
 Provider = Literal["google", "kakao", "naver", "apple"]
+# summary: 목록용 (계좌 정보, 이메일, 메모를 읽지 않음)
+TeacherView = Literal["full", "summary"]
 
 
 class TeacherBase(BaseModel):
@@ -103,3 +105,18 @@ class TeacherListResp(BaseModel):
     page: int
     pageSize: int
     items: list[TeacherOut]
+    view: TeacherView = "full"
+
+
+class FreeSlot(BaseModel):
+    date: date
+    start_time: str
+    end_time: str
+
+
+class FreeSlotsResp(BaseModel):
+    teacher_id: int
+    date_from: date
+    date_to: date
+    duration: int  # 분
+    items: list[FreeSlot]
@@ -0,0 +1,161 @@
+# app/services/availability.py
+"""
+빈 시간 계산 엔진
+- 하루를 5분 단위 288칸 비트맵(파이썬 int)으로 표현
+- 수업 시간은 기간 전체에 대해 쿼리 1번 + 반복 규칙 전개로 채움
+- duration 길이의 연속 빈 칸은 시프트 AND로 한 번에 계산
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.db.models import Schedule, Teacher
+from app.backend.services.recurrence import load_rule_occurrences
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+FULL_DAY = (1 << SLOTS_PER_DAY) - 1
+
+# 한 번에 조회할 수 있는 최대 기간 (일)
+MAX_RANGE_DAYS = 62
+
+DEFAULT_LESSON_START_HOUR = 12
+DEFAULT_LESSON_END_HOUR = 22
+
+
+def _to_slot(hhmm: str, *, ceil: bool = False) -> int:
+    """"HH:MM" → 하루 중 칸 번호 (ceil이면 올림, 24:00 허용)"""
+    h, m = hhmm.split(":")
+    minutes = int(h) * 60 + int(m)
+    slot = -(-minutes // SLOT_MINUTES) if ceil else minutes // SLOT_MINUTES
+    return max(0, min(slot, SLOTS_PER_DAY))
+
+
+def _from_slot(slot: int) -> str:
+    minutes = slot * SLOT_MINUTES
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def span_mask(start_slot: int, end_slot: int) -> int:
+    """[start_slot, end_slot) 구간 비트"""
+    if end_slot <= start_slot:
+        return 0
+    return ((1 << (end_slot - start_slot)) - 1) << start_slot
+
+
+def opening_mask(start_hour: int, end_hour: int, disabled_hours: Iterable[int] = ()) -> int:
+    """수업 가능 시간대 비트 (disabled_hours는 1시간 단위로 제외)"""
+    per_hour = 60 // SLOT_MINUTES
+    mask = span_mask(start_hour * per_hour, end_hour * per_hour)
+    for h in disabled_hours:
+        if 0 <= h < 24:
+            mask &= ~span_mask(h * per_hour, (h + 1) * per_hour)
+    return mask
+
+
+def window_starts(free: int, length: int) -> int:
+    """
+    free에서 length칸이 연속으로 비어 있는 시작 위치 비트
+    (m & m>>1, 결과 & 결과>>2 ... 로 O(log length) 번의 시프트)
+    """
+    if length <= 0:
+        return free
+    result = free
+    covered = 1
+    while covered < length:
+        shift = min(covered, length - covered)
+        result &= result >> shift
+        covered += shift
+    return result
+
+
+def _is_available_day(teacher: Teacher, day: date) -> bool:
+    if teacher.exclude_weekends and day.weekday() >= 5:
+        return False
+    if teacher.vacation_start and teacher.vacation_end:
+        if teacher.vacation_start <= day <= teacher.vacation_end:
+            return False
+    return True
+
+
+async def build_occupancy(
+    session: AsyncSession,
+    teacher_id: int,
+    date_from: date,
+    date_to: date,
+) -> dict[date, int]:
+    """기간 내 날짜별 점유 비트맵 (취소된 수업 제외, 반복 규칙 회차 포함)"""
+    rows = (
+        await session.execute(
+            select(Schedule.lesson_date, Schedule.start_time, Schedule.end_time).where(
+                Schedule.teacher_id == teacher_id,
+                Schedule.lesson_date.between(date_from, date_to),
+                Schedule.status != "cancelled",
+            )
+        )
+    ).all()
+    virtual = await load_rule_occurrences(
+        session, window_from=date_from, window_to=date_to, teacher_id=teacher_id
+    )
+
+    busy: dict[date, int] = {}
+    spans = [(d, s, e) for d, s, e in rows]
+    spans.extend(
+        (v["lesson_date"], v["start_time"], v["end_time"]) for v in virtual if v["status"] != "cancelled"
+    )
+    for d, start, end in spans:
+        busy[d] = busy.get(d, 0) | span_mask(_to_slot(start), _to_slot(end, ceil=True))
+    return busy
+
+
+async def find_free_slots(
+    session: AsyncSession,
+    teacher: Teacher,
+    *,
+    date_from: date,
+    date_to: date,
+    duration_minutes: int,
+    step_minutes: int = 30,
+    disabled_hours: Iterable[int] = (),
+    limit: int = 200,
+) -> list[dict]:
+    """
+    수업 가능 시간대 중 duration_minutes 이상 비어 있는 시작 시각 목록
+    step_minutes 간격으로 정렬된 시작 시각만 반환 (최대 limit개)
+    """
+    length = -(-duration_minutes // SLOT_MINUTES)
+    step = max(step_minutes // SLOT_MINUTES, 1)
+    start_hour = teacher.lesson_start_hour if teacher.lesson_start_hour is not None else DEFAULT_LESSON_START_HOUR
+    end_hour = teacher.lesson_end_hour if teacher.lesson_end_hour is not None else DEFAULT_LESSON_END_HOUR
+    opening = opening_mask(start_hour, end_hour, disabled_hours)
+
+    # step에 맞춘 시작 위치 비트 (하루 공통)
+    aligned = 0
+    for slot in range(0, SLOTS_PER_DAY, step):
+        aligned |= 1 << slot
+
+    busy = await build_occupancy(session, teacher.teacher_id, date_from, date_to)
+
+    slots: list[dict] = []
+    day = date_from
+    while day <= date_to and len(slots) < limit:
+        if _is_available_day(teacher, day):
+            free = opening & ~busy.get(day, 0) & FULL_DAY
+            starts = window_starts(free, length) & aligned
+            while starts and len(slots) < limit:
+                low = starts & -starts
+                slot = low.bit_length() - 1
+                slots.append(
+                    {
+                        "date": day,
+                        "start_time": _from_slot(slot),
+                        "end_time": _from_slot(slot + length),
+                    }
+                )
+                starts ^= low
+        day += timedelta(days=1)
+    return slots
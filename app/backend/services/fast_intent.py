@@ -0,0 +1,284 @@
+# app/services/fast_intent.py
+"""
+LLM 없이 처리하는 규칙 기반 의도 파서 (빠른 경로)
+- "오늘 수업 뭐 있어?" → schedule_list
+- "내일 오후 3시 이환주 1시간" → schedule_create
+- "모레 오후 5시 이환주 수업 취소" → schedule_cancel
+상대 날짜(오늘/내일/모레/다음주 X요일), 시각(오후 1시, 13:30), 길이(1시간반, 90분), 등록된 학생 이름만 해석하고
+하나라도 애매하면(값이 여러 개, 오전/오후 불명확, 모르는 학생 등) None을 반환해 LLM으로 넘김
+"""
+from __future__ import annotations
+
+import re
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from app.backend.schemas.command import ActionPlan
+from app.backend.utils.time_utils import KST
+
+_WEEKDAYS = "월화수목금토일"
+_NATIVE_NUMBERS = {
+    "한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5, "여섯": 6,
+    "일곱": 7, "여덟": 8, "아홉": 9, "열": 10, "열한": 11, "열두": 12,
+}
+_NUM = r"(\d{1,2}|열한|열두|다섯|여섯|일곱|여덟|아홉|한|두|세|네|열)"
+
+_RELATIVE_DAY_RE = re.compile(r"(오늘|내일|모레)")
+_WEEKDAY_RE = re.compile(rf"(?:(이번\s*주|다음\s*주|담주)\s*)?([{_WEEKDAYS}])요일")
+# 요일 없이 쓴 "이번주/다음주" (캐시 키 정규화용)
+_WEEK_RE = re.compile(r"(이번\s*주|다음\s*주|담주|지난\s*주)")
+# 해석하지 않는 상대 날짜 ("다다음주"의 "다음주", "3일 뒤"의 "일"을 잘못 읽지 않도록 먼저 걸러 LLM으로)
+_UNRESOLVED_DATE_RE = re.compile(
+    r"글피|다다음|어제|그제|그저께|(?:이번|다음|지난)\s*달|\d+\s*(?:일|주|달|개월)\s*(?:뒤|후|전|있다가)"
+)
+_MONTH_DAY_RE = re.compile(r"(\d{1,2})\s*월\s*(\d{1,2})\s*일")
+_CLOCK_RE = re.compile(r"(?<!\d)([01]?\d|2[0-3]):([0-5]\d)(?!\d)")
+_HOUR_RE = re.compile(rf"(?:(오전|아침|오후|저녁|밤)\s*)?{_NUM}\s*시(?!간)(?:\s*(반|(\d{{1,2}})\s*분))?")
+_DURATION_RE = re.compile(
+    rf"{_NUM}\s*시간\s*(반|(\d{{1,2}})\s*분)?|(?<![시\d])(\d{{2,3}})\s*분(?:\s*(?:동안|수업))?"
+)
+
+_LIST_RE = re.compile(r"(수업|일정|스케줄).*(뭐|무슨|있어|있나|있니|있냐|알려|보여|목록|확인|몇\s*개)")
+_CANCEL_RE = re.compile(r"취소|빼\s*줘|삭제|지워")
+# 변경/회차 등은 말이 다양해서 LLM에 맡김
+_UNSUPPORTED_RE = re.compile(r"바꿔|변경|옮겨|미뤄|당겨|연기|회차|횟수|추가\s*결제|말고|아니")
+_SPACE_RE = re.compile(r"\s+")
+# 캐시 키에서 무시: 문장부호(숫자 사이 . , 제외), 공백(숫자 사이 제외 → "2 3시"와 "23시" 구분)
+_CACHE_IGNORED_RE = re.compile(r"[!?~…\"']+|(?<!\d)[.,]|[.,](?!\d)|(?<!\d)\s+|\s+(?!\d)")
+
+
+def _number(token: str) -> int:
+    return int(token) if token.isdigit() else _NATIVE_NUMBERS[token]
+
+
+def _today() -> date:
+    return datetime.now(KST).date()
+
+
+# ─────────────────────────────────────────────────────────────
+# 값 추출 (여러 개면 None, 없으면 MISSING)
+# ─────────────────────────────────────────────────────────────
+MISSING = object()
+
+
+def _relative_day(m: re.Match, today: date) -> date:
+    return today + timedelta(days={"오늘": 0, "내일": 1, "모레": 2}[m.group(1)])
+
+
+def _week_monday(week: str, today: date) -> date:
+    monday = today - timedelta(days=today.weekday())
+    if "다음" in week or "담" in week:
+        return monday + timedelta(days=7)
+    if "지난" in week:
+        return monday - timedelta(days=7)
+    return monday
+
+
+def _weekday_date(m: re.Match, today: date) -> date:
+    week, weekday = m.group(1), _WEEKDAYS.index(m.group(2))
+    if week:
+        return _week_monday(week, today) + timedelta(days=weekday)
+    # "금요일" → 오늘 이후 가장 가까운 금요일 (오늘 포함)
+    return today + timedelta(days=(weekday - today.weekday()) % 7)
+
+
+def parse_date(text: str, today: date) -> date | None | object:
+    if _UNRESOLVED_DATE_RE.search(text):
+        return None
+    if _WEEK_RE.search(_WEEKDAY_RE.sub(" ", text)):
+        return None  # 요일 없는 "이번주/다음주"는 기간이라 LLM에 맡김
+    found: set[date] = set()
+    for m in _RELATIVE_DAY_RE.finditer(text):
+        found.add(_relative_day(m, today))
+    for m in _WEEKDAY_RE.finditer(text):
+        week = m.group(1)
+        if week and ("다음" in week or "담" in week) and today.weekday() == 6:
+            return None  # 일요일의 "다음주"는 내일부터인 주인지 그다음 주인지 애매함
+        d = _weekday_date(m, today)
+        if week and d < today:
+            return None  # "이번주 토요일"이 이미 지났으면 다음 주인지 애매함
+        found.add(d)
+    for m in _MONTH_DAY_RE.finditer(text):
+        month, day = int(m.group(1)), int(m.group(2))
+        try:
+            d = date(today.year, month, day)
+        except ValueError:
+            return None
+        if d < today:
+            if d >= today - timedelta(days=30):
+                return None  # 최근에 지난 날짜는 지난 수업인지 날짜 착오인지 애매함
+            # 한 달 넘게 지난 날짜는 내년 (12월에 말한 "1월 5일")
+            try:
+                d = date(today.year + 1, month, day)
+            except ValueError:
+                return None
+        found.add(d)
+    if not found:
+        return MISSING
+    return found.pop() if len(found) == 1 else None
+
+
+def parse_time(text: str) -> str | None | object:
+    found: set[str] = set()
+    for m in _CLOCK_RE.finditer(text):
+        found.add(f"{int(m.group(1)):02d}:{m.group(2)}")
+    for m in _HOUR_RE.finditer(text):
+        meridiem, hour = m.group(1), _number(m.group(2))
+        minute = 30 if m.group(3) == "반" else int(m.group(4) or 0)
+        if hour > 24 or minute >= 60:
+            return None
+        if meridiem in ("오후", "저녁", "밤"):
+            if hour < 12:
+                hour += 12
+        elif meridiem in ("오전", "아침"):
+            if hour == 12:
+                hour = 0
+        elif 1 <= hour <= 7:
+            # 새벽 수업은 없다고 보고 오후로 해석
+            hour += 12
+        elif 8 <= hour <= 11:
+            return None  # 오전/오후 불명확
+        if hour >= 24:
+            return None
+        found.add(f"{hour:02d}:{minute:02d}")
+    if not found:
+        return MISSING
+    return found.pop() if len(found) == 1 else None
+
+
+def parse_duration(text: str) -> int | None | object:
+    # "3시 30분"의 30분이 길이로 잡히지 않게 시각 부분은 먼저 지움
+    text = _HOUR_RE.sub(" ", _CLOCK_RE.sub(" ", text))
+    found: set[int] = set()
+    for m in _DURATION_RE.finditer(text):
+        if m.group(1):
+            minutes = _number(m.group(1)) * 60
+            minutes += 30 if m.group(2) == "반" else int(m.group(3) or 0)
+        else:
+            minutes = int(m.group(4))
+        if not 10 <= minutes <= 600:
+            return None
+        found.add(minutes)
+    if not found:
+        return MISSING
+    return found.pop() if len(found) == 1 else None
+
+
+def find_student(text: str, names: Iterable[str]) -> str | None | object:
+    """문장에 들어 있는 등록 학생 이름 (긴 이름 우선, 서로 다른 학생이 둘 이상이면 None)"""
+    compact = _SPACE_RE.sub("", text)
+    matches = sorted({n for n in names if n and _SPACE_RE.sub("", n) in compact}, key=len, reverse=True)
+    if not matches:
+        return MISSING
+    # "이환주"와 "환주"처럼 긴 이름에 포함된 짧은 이름은 같은 학생으로 봄
+    distinct = [n for n in matches if not any(n != other and n in other for other in matches)]
+    return distinct[0] if len(distinct) == 1 else None
+
+
+def normalize_for_cache(text: str, today: date | None = None) -> str:
+    """
+    LLM 응답 캐시 키용 정규화
+    상대 날짜를 실제 날짜로 바꾸고(내일 → 2026-10-19, 이번주 → 2026-10-12주) 공백/문장부호/대소문자 차이를 없앰
+    → 같은 날 같은 뜻이면 같은 키, 날짜가 바뀌면 "내일"도 다른 키
+    """
+    today = today or _today()
+    text = _WEEKDAY_RE.sub(lambda m: _weekday_date(m, today).isoformat(), text)
+    text = _RELATIVE_DAY_RE.sub(lambda m: _relative_day(m, today).isoformat(), text)
+    text = _WEEK_RE.sub(lambda m: f"{_week_monday(m.group(1), today).isoformat()}주", text)
+    return _CACHE_IGNORED_RE.sub("", _SPACE_RE.sub(" ", text)).lower()
+
+
+# ─────────────────────────────────────────────────────────────
+# 응답 문구
+# ─────────────────────────────────────────────────────────────
+def _date_label(d: date, today: date) -> str:
+    relative = {0: "오늘", 1: "내일", 2: "모레"}.get((d - today).days)
+    label = f"{d.month}월 {d.day}일({_WEEKDAYS[d.weekday()]})"
+    return f"{relative} {label}" if relative else label
+
+
+def _time_label(hhmm: str) -> str:
+    hour, minute = map(int, hhmm.split(":"))
+    meridiem = "오전" if hour < 12 else "오후"
+    hour12 = hour % 12 or 12
+    return f"{meridiem} {hour12}시" + (f" {minute}분" if minute else "")
+
+
+def _duration_label(minutes: int) -> str:
+    hours, rest = divmod(minutes, 60)
+    if not hours:
+        return f"{rest}분"
+    return f"{hours}시간" + (f" {rest}분" if rest else "")
+
+
+# ─────────────────────────────────────────────────────────────
+# 진입점
+# ─────────────────────────────────────────────────────────────
+def parse_fast_intent(message: str, student_names: Iterable[str] = (), today: date | None = None) -> dict | None:
+    """
+    확신할 수 있을 때만 extract_intent_with_history와 같은 형식
+    {"action": ActionPlan.dict(), "ai_response": ...}을 반환, 아니면 None (LLM으로)
+    """
+    text = message.strip()
+    if not text or len(text) > 100 or _UNSUPPORTED_RE.search(text):
+        return None
+    today = today or _today()
+
+    d = parse_date(text, today)
+    start_time = parse_time(text)
+    duration = parse_duration(text)
+    if d is None or start_time is None or duration is None:
+        return None
+    student = find_student(text, student_names)
+    if student is None:
+        return None
+
+    # 목록 조회: 시각/길이/학생 없이 "수업 뭐 있어?"류
+    if (
+        _LIST_RE.search(text)
+        and start_time is MISSING
+        and duration is MISSING
+        and student is MISSING
+        and not _CANCEL_RE.search(text)
+    ):
+        params = {} if d is MISSING else {"date": d.isoformat()}
+        when = "" if d is MISSING else f"{_date_label(d, today)} "
+        plan = ActionPlan(action="schedule_list", params=params)
+        return {"action": plan.dict(), "ai_response": f"{when}수업 목록을 불러왔어요."}
+
+    if MISSING in (d, start_time, student):
+        return None
+
+    if _CANCEL_RE.search(text):
+        if duration is not MISSING:
+            return None
+        plan = ActionPlan(
+            action="schedule_cancel",
+            params={"student_name": student, "date": d.isoformat(), "start_time": start_time},
+        )
+        return {
+            "action": plan.dict(),
+            "ai_response": (
+                f"{student} 학생 {_date_label(d, today)} {_time_label(start_time)} 수업을 취소했어요. "
+                "다른 시간으로 다시 잡을까요?"
+            ),
+        }
+
+    if duration is MISSING:
+        return None
+    plan = ActionPlan(
+        action="schedule_create",
+        params={
+            "student_name": student,
+            "date": d.isoformat(),
+            "start_time": start_time,
+            "duration_minutes": duration,
+        },
+    )
+    return {
+        "action": plan.dict(),
+        "ai_response": (
+            f"{student} 학생 수업을 {_date_label(d, today)} {_time_label(start_time)}부터 "
+            f"{_duration_label(duration)}으로 등록했어요! 변경이나 취소가 필요하면 말씀해 주세요."
+        ),
+    }
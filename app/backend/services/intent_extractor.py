@@ -1,8 +1,16 @@
 # app/services/intent_extractor.py
+import hashlib
 import json
-from app.backend.core.llm import call_llm
+from typing import AsyncIterator, Iterable
+from app.backend.core.llm import call_llm, stream_llm
+from app.backend.core.metrics import AI_INTENT
 from app.backend.schemas.command import ActionPlan
-from app.backend.core.redis import get_conversation, save_conversation, clear_conversation
+from app.backend.core.redis import get_conversation_store
+from app.backend.services import fast_intent
+from app.backend.services.fast_intent import normalize_for_cache, parse_fast_intent
+
+# 프롬프트에 넣는 최근 대화 수
+HISTORY_LIMIT = 10
 
 SYSTEM_PROMPT = """
         You are a tutoring schedule assistant. 
@@ -71,33 +79,59 @@ SYSTEM_PROMPT = """
         몇 시간 수업할까요?
 """
 
-def extract_intent_with_history(session_id: str, message: str) -> dict:
+# 프롬프트를 고치면 LLM 응답 캐시 키가 바뀌도록 프롬프트 해시를 버전으로 사용
+PROMPT_VERSION = hashlib.sha256(SYSTEM_PROMPT.encode()).hexdigest()[:12]
+
+
+def _llm_cache_key(history: list, message: str) -> str:
+    """
+    LLM 응답 캐시 키: 프롬프트 버전 + 오늘 날짜(KST) + 이전 대화 지문 + 정규화한 메시지
+    정규화가 풀지 못하는 상대 표현("3일 뒤", "다음 달 5일", "글피" 등)도 있으므로 날짜가 바뀌면 항상 다른 키
+    """
+    today = fast_intent._today()
+    fingerprint = hashlib.sha256(
+        "\n".join(normalize_for_cache(msg["content"], today) for msg in history).encode()
+    ).hexdigest()
+    return "\x1f".join((PROMPT_VERSION, today.isoformat(), fingerprint, normalize_for_cache(message, today)))
+
+
+async def _prepare_messages(session_id: str, message: str) -> tuple[list, str]:
+    """(LLM 메시지, 응답 캐시 키) - 사용자 메시지는 기록에 즉시 추가"""
     print(f"\n[SESSION] {session_id}")
     print(f"[USER] {message}")
 
-    history = get_conversation(session_id) or []
+    store = get_conversation_store()
+    # 이번 메시지를 포함해 최근 HISTORY_LIMIT개만 사용
+    history = await store.recent(session_id, HISTORY_LIMIT - 1)
     print(f"[HISTORY] {len(history)} messages")
+    cache_key = _llm_cache_key(history, message)
 
     # 사용자 메시지 추가 + 즉시 저장
-    history.append({"role": "user", "content": message})
-    save_conversation(session_id, history)
+    user_message = {"role": "user", "content": message}
+    history.append(user_message)
+    await store.append(session_id, user_message)
 
     # 히스토리 content만
-    history_contents = "\n".join([msg["content"] for msg in history[-10:]])
+    history_contents = "\n".join([msg["content"] for msg in history])
     print(f"[HISTORY CONTENTS]\n{history_contents}")
 
-    # LLM 호출
     prompt = SYSTEM_PROMPT.format(history_contents=history_contents)
     messages = [{"role": "system", "content": prompt}, {"role": "user", "content": message}]
-    raw_response = call_llm(messages).strip()
+    return messages, cache_key
+
+
+async def _save_ai_message(session_id: str, content: str) -> None:
+    await get_conversation_store().append(session_id, {"role": "ai", "content": content})
+
+
+async def _handle_llm_response(session_id: str, raw_response: str) -> dict:
     print(f"[LLM RAW] {raw_response}")
 
     # === 자연어 질문 ===
     if not raw_response.startswith("{"):
         question = raw_response.strip().strip('"')
         if question:
-            history.append({"role": "ai", "content": question})
-            save_conversation(session_id, history)
+            await _save_ai_message(session_id, question)
             return {"response": question}
 
     # === JSON 파싱 ===
@@ -108,8 +142,7 @@ def extract_intent_with_history(session_id: str, message: str) -> dict:
         # action 필수
         if "action" not in data:
             fallback = "정보가 부족해요. 다시 말씀해 주세요."
-            history.append({"role": "ai", "content": fallback})
-            save_conversation(session_id, history)
+            await _save_ai_message(session_id, fallback)
             return {"response": fallback}
 
         # ai_response 필수
@@ -120,12 +153,8 @@ def extract_intent_with_history(session_id: str, message: str) -> dict:
         # ActionPlan 생성 (action + params만)
         plan = ActionPlan(action=data["action"], params=data.get("params", {}))
 
-        # history에 ai_response 저장
-        history.append({"role": "ai", "content": ai_response})
-        save_conversation(session_id, history)
-
-        # 성공 시 히스토리 초기화
-        clear_conversation(session_id)
+        # 성공 시 히스토리 초기화 (ai_response는 저장할 필요 없음)
+        await get_conversation_store().clear(session_id)
 
         return {
             "action": plan.dict(),
@@ -135,6 +164,57 @@ def extract_intent_with_history(session_id: str, message: str) -> dict:
     except Exception as e:
         print(f"[ERROR] {e}")
         fallback = "죄송해요, 다시 말씀해 주세요."
-        history.append({"role": "ai", "content": fallback})
-        save_conversation(session_id, history)
-        return {"response": fallback}
\ No newline at end of file
+        await _save_ai_message(session_id, fallback)
+        return {"response": fallback}
+
+
+async def _fast_path(session_id: str, message: str, student_names: Iterable[str]) -> dict | None:
+    """규칙 파서로 확실히 해석되면 LLM 없이 바로 결과 (대화 기록은 LLM 성공 때처럼 초기화)"""
+    result = parse_fast_intent(message, student_names)
+    if result is None:
+        AI_INTENT.inc(path="llm")
+        return None
+    AI_INTENT.inc(path="fast")
+    print(f"[FAST PATH] {result}")
+    await get_conversation_store().clear(session_id)
+    return result
+
+
+async def extract_intent_with_history(session_id: str, message: str, student_names: Iterable[str] = ()) -> dict:
+    fast = await _fast_path(session_id, message, student_names)
+    if fast is not None:
+        return fast
+    messages, cache_key = await _prepare_messages(session_id, message)
+    raw_response = (await call_llm(messages, cache_key=cache_key)).strip()
+    return await _handle_llm_response(session_id, raw_response)
+
+
+async def stream_intent_with_history(
+    session_id: str, message: str, student_names: Iterable[str] = ()
+) -> AsyncIterator[tuple[str, object]]:
+    """
+    extract_intent_with_history의 스트리밍 버전
+    - 자연어 응답이면 ("delta", 텍스트 조각)을 받는 대로 내보냄
+    - JSON(액션) 응답은 조각을 내보내지 않고 다 받은 뒤 파싱
+    - 마지막에 ("result", extract_intent_with_history와 같은 dict)
+    """
+    fast = await _fast_path(session_id, message, student_names)
+    if fast is not None:
+        yield "result", fast
+        return
+    messages, cache_key = await _prepare_messages(session_id, message)
+    parts: list[str] = []
+    is_text: bool | None = None
+    async for delta in stream_llm(messages, cache_key=cache_key):
+        parts.append(delta)
+        if is_text is None:
+            head = "".join(parts).lstrip()
+            if not head:
+                continue
+            is_text = not head.startswith("{")
+            if is_text:
+                yield "delta", head
+        elif is_text:
+            yield "delta", delta
+    raw_response = "".join(parts).strip()
+    yield "result", await _handle_llm_response(session_id, raw_response)
@@ -5,6 +5,7 @@
 import httpx
 from typing import Optional
 from app.backend.core.config import settings
+from app.backend.core.metrics import KAKAOPAY_ERRORS, KAKAOPAY_LATENCY
 
 
 class KakaoPayError(Exception):
@@ -75,7 +76,8 @@ class KakaoPayService:
         
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.post(url, headers=headers, data=data, timeout=10.0)
+                with KAKAOPAY_LATENCY.time(operation="ready"):
+                    response = await client.post(url, headers=headers, data=data, timeout=10.0)
                 result = response.json()
                 
                 # 카카오페이 오류 응답 체크 (code 필드가 있으면 오류)
@@ -85,8 +87,10 @@ class KakaoPayService:
                 response.raise_for_status()
                 return result
             except httpx.HTTPStatusError as e:
+                KAKAOPAY_ERRORS.inc(operation="ready")
                 raise KakaoPayError(f"HTTP error: {e.response.text}")
             except Exception as e:
+                KAKAOPAY_ERRORS.inc(operation="ready")
                 raise KakaoPayError(f"Unexpected error: {str(e)}")
     
     async def approve_payment(
@@ -137,7 +141,8 @@ class KakaoPayService:
         
         async with httpx.AsyncClient() as client:
             try:
-                response = await client.post(url, headers=headers, data=data, timeout=10.0)
+                with KAKAOPAY_LATENCY.time(operation="approve"):
+                    response = await client.post(url, headers=headers, data=data, timeout=10.0)
                 result = response.json()
                 
                 # 카카오페이 오류 응답 체크
@@ -147,8 +152,10 @@ class KakaoPayService:
                 response.raise_for_status()
                 return result
             except httpx.HTTPStatusError as e:
+                KAKAOPAY_ERRORS.inc(operation="approve")
                 raise KakaoPayError(f"HTTP error: {e.response.text}")
             except Exception as e:
+                KAKAOPAY_ERRORS.inc(operation="approve")
                 raise KakaoPayError(f"Unexpected error: {str(e)}")
 
 
@@ -6,9 +6,9 @@ from app.backend.services.response_generator import generate_friendly_response
 # from app.backend.services.student_service import add_sessions, use_session
 from app.backend.schemas.command import ActionPlan
 
-def process_command_with_redis(db, user_id, message, session_id):
+async def process_command_with_redis(db, user_id, message, session_id):
     # 1. 의도 추출
-    result = extract_intent_with_history(session_id, message)
+    result = await extract_intent_with_history(session_id, message)
     if "response" in result:
         return result  # 자연어 질문
 
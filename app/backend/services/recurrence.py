@@ -0,0 +1,389 @@
+# app/services/recurrence.py
+"""
+반복 수업 생성 엔진
+- 후보 날짜는 메모리에서 계산 (요일 목록 또는 RRULE)
+- 충돌은 전체 기간에 대해 쿼리 1번으로 확인
+- 남은 날짜는 다중 행 INSERT ... RETURNING 1번으로 생성
+- 반복 규칙(schedule_rules)은 조회 기간에 맞춰 가상 회차로 전개
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from dateutil.rrule import rrulestr
+from sqlalchemy import select, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.db.models import Schedule, ScheduleRule, ScheduleRuleException
+from app.backend.db.routing import mark_written
+
+# 한 번에 생성할 수 있는 최대 회차 (주 7회 × 1년 + 여유)
+MAX_OCCURRENCES = 400
+
+
+def expand_weekdays(
+    date_from: date,
+    date_to: date,
+    weekdays: Iterable[int],
+    interval: int = 1,
+) -> list[date]:
+    """date_from이 속한 주부터 interval주마다 weekdays(0=월 ... 6=일)에 해당하는 날짜"""
+    days = sorted(set(weekdays))
+    if not days or any(d < 0 or d > 6 for d in days):
+        raise ValueError("weekdays must be between 0 (Mon) and 6 (Sun)")
+    if interval < 1:
+        raise ValueError("interval must be >= 1")
+
+    week_start = date_from - timedelta(days=date_from.weekday())
+    result: list[date] = []
+    while week_start <= date_to:
+        for d in days:
+            cur = week_start + timedelta(days=d)
+            if date_from <= cur <= date_to:
+                result.append(cur)
+        if len(result) > MAX_OCCURRENCES:
+            raise ValueError(f"Too many occurrences (max {MAX_OCCURRENCES})")
+        week_start += timedelta(weeks=interval)
+    return result
+
+
+def expand_rrule(spec: str, date_from: date, date_to: date) -> list[date]:
+    """
+    RRULE 문자열(예: "FREQ=WEEKLY;BYDAY=MO,WE;INTERVAL=2;COUNT=20")을 date_from~date_to 범위로 전개
+    DTSTART는 date_from으로 고정
+    """
+    spec = spec.strip()
+    if spec.upper().startswith("RRULE:"):
+        spec = spec[len("RRULE:"):]
+    try:
+        rule = rrulestr(spec, dtstart=datetime.combine(date_from, time()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid rrule: {e}") from e
+
+    result: list[date] = []
+    for occurrence in rule:
+        cur = occurrence.date()
+        if cur > date_to:
+            break
+        result.append(cur)
+        if len(result) > MAX_OCCURRENCES:
+            raise ValueError(f"Too many occurrences (max {MAX_OCCURRENCES})")
+    return result
+
+
+async def generate_recurring_schedules(
+    session: AsyncSession,
+    *,
+    teacher_id: int,
+    student_id: int,
+    subject_id: str,
+    dates: list[date],
+    start_time: str,
+    end_time: str,
+    status: str = "confirmed",
+    notes: str | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    dates 중 기존 수업과 겹치지 않는 날짜에 수업 생성 (commit은 호출자 책임)
+
+    Returns:
+        - created: 생성된 수업 수 (dry_run이면 생성될 수)
+        - dates: 생성된(될) 날짜 목록
+        - conflicts: 겹쳐서 건너뛴 날짜와 기존 schedule_id
+        - schedule_ids: 생성된 schedule_id 목록 (dry_run이면 빈 목록)
+    """
+    if not dates:
+        return {"created": 0, "dates": [], "conflicts": [], "schedule_ids": []}
+
+    # 전체 기간 충돌 확인 (ix_schedules_teacher_id_lesson_date 범위 스캔 1회)
+    conflict_rows = (
+        await session.execute(
+            select(Schedule.lesson_date, Schedule.schedule_id)
+            .where(
+                Schedule.teacher_id == teacher_id,
+                Schedule.lesson_date.between(min(dates), max(dates)),
+                Schedule.lesson_date.in_(dates),
+                Schedule.status != "cancelled",
+                Schedule.start_time < end_time,
+                Schedule.end_time > start_time,
+            )
+            .order_by(Schedule.lesson_date)
+        )
+    ).all()
+    conflicts = [{"lesson_date": d, "schedule_id": sid} for d, sid in conflict_rows]
+    taken = {d for d, _ in conflict_rows}
+
+    # 반복 규칙의 가상 회차는 schedules 행이 없어 EXCLUDE 제약이 보지 못하므로 따로 확인
+    date_set = set(dates)
+    for v in await load_rule_occurrences(
+        session, window_from=min(dates), window_to=max(dates), teacher_id=teacher_id
+    ):
+        if (
+            v["status"] != "cancelled"
+            and v["lesson_date"] in date_set
+            and v["start_time"] < end_time
+            and v["end_time"] > start_time
+        ):
+            conflicts.append({"lesson_date": v["lesson_date"], "schedule_id": None, "rule_id": v["rule_id"]})
+            taken.add(v["lesson_date"])
+    conflicts.sort(key=lambda c: c["lesson_date"])
+    survivors = [d for d in dates if d not in taken]
+
+    if dry_run or not survivors:
+        return {
+            "created": len(survivors) if dry_run else 0,
+            "dates": survivors,
+            "conflicts": conflicts,
+            "schedule_ids": [],
+        }
+
+    # 다중 행 INSERT 1회. 그 사이 다른 요청이 끼어들면 EXCLUDE 제약 + DO NOTHING으로 건너뜀
+    inserted = (
+        await session.execute(
+            pg_insert(Schedule)
+            .values(
+                [
+                    {
+                        "teacher_id": teacher_id,
+                        "student_id": student_id,
+                        "subject_id": subject_id,
+                        "lesson_date": d,
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "status": status,
+                        "notes": notes,
+                    }
+                    for d in survivors
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(Schedule.schedule_id, Schedule.lesson_date)
+        )
+    ).all()
+    if inserted:
+        # Core INSERT는 before_flush에 잡히지 않으므로 직접 기록
+        mark_written(session, teacher_id)
+    created_dates = {d for _, d in inserted}
+    conflicts.extend(
+        {"lesson_date": d, "schedule_id": None} for d in survivors if d not in created_dates
+    )
+
+    return {
+        "created": len(inserted),
+        "dates": sorted(created_dates),
+        "conflicts": conflicts,
+        "schedule_ids": [sid for sid, _ in inserted],
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# 반복 규칙 전개
+# ─────────────────────────────────────────────────────────────
+def rule_occurrences(rule: ScheduleRule, window_from: date, window_to: date) -> list[date]:
+    """규칙의 회차 중 window_from~window_to에 속하는 날짜 (interval은 valid_from이 속한 주 기준)"""
+    start = max(rule.valid_from, window_from)
+    end = min(rule.valid_to, window_to) if rule.valid_to else window_to
+    if start > end:
+        return []
+
+    interval = max(rule.interval_weeks or 1, 1)
+    anchor_week = rule.valid_from - timedelta(days=rule.valid_from.weekday())
+    week = start - timedelta(days=start.weekday())
+    skip = ((week - anchor_week).days // 7) % interval
+    if skip:
+        week += timedelta(weeks=interval - skip)
+
+    result: list[date] = []
+    cur = week + timedelta(days=rule.weekday)
+    while cur <= end:
+        if cur >= start:
+            result.append(cur)
+        cur += timedelta(weeks=interval)
+    return result
+
+
+def rule_phase_start(rule: ScheduleRule, d: date) -> date:
+    """
+    d가 규칙의 쉬는 주(격주 등)면 다음 수업 주의 월요일, 아니면 d
+    규칙을 d부터 분리할 때 새 규칙의 valid_from으로 쓰면 interval 주기가 유지됨
+    """
+    interval = max(rule.interval_weeks or 1, 1)
+    anchor_week = rule.valid_from - timedelta(days=rule.valid_from.weekday())
+    week = d - timedelta(days=d.weekday())
+    skip = ((week - anchor_week).days // 7) % interval
+    return week + timedelta(weeks=interval - skip) if skip else d
+
+
+def expand_rules(
+    rules: Iterable[ScheduleRule],
+    exceptions: Iterable[ScheduleRuleException],
+    window_from: date,
+    window_to: date,
+) -> list[dict]:
+    """
+    규칙을 ScheduleOut 형태의 가상 회차로 전개
+    - 실체화/이동된 회차는 schedules 행이 따로 조회되므로 제외
+    - 취소된 회차는 status=cancelled로 포함
+    """
+    by_key = {(e.rule_id, e.occurrence_date): e for e in exceptions}
+    items: list[dict] = []
+    for rule in rules:
+        for d in rule_occurrences(rule, window_from, window_to):
+            exc = by_key.get((rule.rule_id, d))
+            if exc is not None and exc.kind != "cancelled":
+                continue
+            cancelled = exc is not None
+            items.append(
+                {
+                    "schedule_id": None,
+                    "rule_id": rule.rule_id,
+                    "teacher_id": rule.teacher_id,
+                    "student_id": rule.student_id,
+                    "subject_id": rule.subject_id,
+                    "lesson_date": d,
+                    "start_time": rule.start_time,
+                    "end_time": rule.end_time,
+                    "notes": rule.notes,
+                    "status": "cancelled" if cancelled else "confirmed",
+                    "attendance_status": None,
+                    "cancelled_at": exc.created_at if cancelled else None,
+                    "cancelled_by": exc.cancelled_by if cancelled else None,
+                    "cancel_reason": exc.cancel_reason if cancelled else None,
+                    "created_at": rule.created_at,
+                    "updated_at": max(rule.updated_at, exc.updated_at) if cancelled else rule.updated_at,
+                }
+            )
+    return items
+
+
+async def load_rule_occurrences(
+    session: AsyncSession,
+    *,
+    window_from: date,
+    window_to: date,
+    teacher_id: int | None = None,
+    student_id: int | None = None,
+    subject_id: str | None = None,
+) -> list[dict]:
+    """조회 기간에 걸친 규칙과 예외를 읽어 가상 회차 목록 반환 (쿼리 최대 2번)"""
+    stmt = select(ScheduleRule).where(
+        ScheduleRule.deleted_at.is_(None),
+        ScheduleRule.valid_from <= window_to,
+        or_(ScheduleRule.valid_to.is_(None), ScheduleRule.valid_to >= window_from),
+    )
+    if teacher_id is not None:
+        stmt = stmt.where(ScheduleRule.teacher_id == teacher_id)
+    if student_id is not None:
+        stmt = stmt.where(ScheduleRule.student_id == student_id)
+    if subject_id is not None:
+        stmt = stmt.where(ScheduleRule.subject_id == subject_id)
+    rules = (await session.execute(stmt)).scalars().all()
+    if not rules:
+        return []
+
+    exceptions = (
+        await session.execute(
+            select(ScheduleRuleException).where(
+                ScheduleRuleException.rule_id.in_([r.rule_id for r in rules]),
+                ScheduleRuleException.occurrence_date.between(window_from, window_to),
+            )
+        )
+    ).scalars().all()
+    return expand_rules(rules, exceptions, window_from, window_to)
+
+
+async def find_rule_overlaps(
+    session: AsyncSession,
+    *,
+    teacher_id: int,
+    weekday: int,
+    start_time: str,
+    end_time: str,
+    valid_from: date,
+    valid_to: date | None,
+    exclude_rule_id: int | None = None,
+) -> list[int]:
+    """
+    같은 요일/시간대에 겹치는 다른 규칙 ID
+    (격주 규칙끼리 서로 다른 주에 열리는 경우도 보수적으로 충돌로 간주)
+    """
+    stmt = select(ScheduleRule.rule_id).where(
+        ScheduleRule.teacher_id == teacher_id,
+        ScheduleRule.deleted_at.is_(None),
+        ScheduleRule.weekday == weekday,
+        ScheduleRule.start_time < end_time,
+        ScheduleRule.end_time > start_time,
+        or_(ScheduleRule.valid_to.is_(None), ScheduleRule.valid_to >= valid_from),
+    )
+    if valid_to is not None:
+        stmt = stmt.where(ScheduleRule.valid_from <= valid_to)
+    if exclude_rule_id is not None:
+        stmt = stmt.where(ScheduleRule.rule_id != exclude_rule_id)
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def find_rule_occurrence_at(
+    session: AsyncSession,
+    *,
+    teacher_id: int,
+    lesson_date: date,
+    start_time: str,
+    end_time: str,
+    exclude_rule_id: int | None = None,
+) -> int | None:
+    """
+    단건 수업 시간대와 겹치는 (취소되지 않은) 가상 회차의 규칙 ID
+    규칙 회차는 schedules 행이 아니라서 EXCLUDE 제약이 보지 못하므로 별도로 확인
+    (exclude_rule_id: 지금 실체화하는 회차의 규칙)
+    """
+    stmt = select(ScheduleRule).where(
+        ScheduleRule.teacher_id == teacher_id,
+        ScheduleRule.deleted_at.is_(None),
+        ScheduleRule.weekday == lesson_date.weekday(),
+        ScheduleRule.start_time < end_time,
+        ScheduleRule.end_time > start_time,
+        ScheduleRule.valid_from <= lesson_date,
+        or_(ScheduleRule.valid_to.is_(None), ScheduleRule.valid_to >= lesson_date),
+        ~select(ScheduleRuleException.exception_id)
+        .where(
+            ScheduleRuleException.rule_id == ScheduleRule.rule_id,
+            ScheduleRuleException.occurrence_date == lesson_date,
+        )
+        .exists(),
+    )
+    if exclude_rule_id is not None:
+        stmt = stmt.where(ScheduleRule.rule_id != exclude_rule_id)
+    rules = (await session.execute(stmt)).scalars().all()
+    for rule in rules:
+        if rule_occurrences(rule, lesson_date, lesson_date):
+            return rule.rule_id
+    return None
+
+
+async def find_rule_schedule_conflicts(
+    session: AsyncSession,
+    rule: ScheduleRule,
+    exclude_rule_ids: Iterable[int | None] = (),
+) -> list[int]:
+    """
+    규칙 회차와 겹치는 (취소되지 않은) 수업의 schedule_id
+    - 이 규칙(또는 분리 전 규칙)에서 실체화된 수업은 제외
+    - 요일/격주 판정은 rule_occurrences로 (교사 + 기간 + 시간대로 좁힌 뒤)
+    """
+    stmt = select(Schedule.schedule_id, Schedule.lesson_date).where(
+        Schedule.teacher_id == rule.teacher_id,
+        Schedule.status != "cancelled",
+        Schedule.lesson_date >= rule.valid_from,
+        Schedule.start_time < rule.end_time,
+        Schedule.end_time > rule.start_time,
+    )
+    if rule.valid_to is not None:
+        stmt = stmt.where(Schedule.lesson_date <= rule.valid_to)
+    excluded = [rid for rid in (rule.rule_id, *exclude_rule_ids) if rid is not None]
+    if excluded:
+        stmt = stmt.where(or_(Schedule.rule_id.is_(None), Schedule.rule_id.notin_(excluded)))
+    rows = (await session.execute(stmt)).all()
+    return [sid for sid, d in rows if rule_occurrences(rule, d, d)]
@@ -3,17 +3,24 @@
 - Speech-to-Text: OpenAI Whisper
 - Text-to-Speech: OpenAI TTS
 """
+import asyncio
 import os
 import io
-from openai import OpenAI
+import time
+from typing import AsyncIterator
 from app.backend.core.config import settings
+from app.backend.core.llm import openai_call
+from app.backend.core.metrics import TTS_FIRST_AUDIO
 import logging
 
 logger = logging.getLogger(__name__)
 
-# OpenAI 클라이언트 초기화 (API 키가 있을 때만)
+# OpenAI 클라이언트는 core/llm의 공유 AsyncOpenAI 사용 (API 키가 있을 때만)
 _openai_api_key = os.getenv("OPENAI_API_KEY") or settings.OPENAI_API_KEY
-client = OpenAI(api_key=_openai_api_key) if _openai_api_key else None
+
+# TTS 스트림을 미리 받아 두는 청크 수 (4KB × 256 ≈ 1MB, 문장 하나 분량 MP3는 모두 들어감)
+# → 클라이언트 전송이 느려도 OpenAI 응답을 다 받으면 동시 호출 슬롯을 바로 반납
+TTS_BUFFER_CHUNKS = 256
 
 
 class SpeechService:
@@ -21,11 +28,11 @@ class SpeechService:
     
     def __init__(self):
         """초기화"""
-        if not os.getenv("OPENAI_API_KEY"):
+        if not _openai_api_key:
             logger.warning("OPENAI_API_KEY가 설정되지 않았습니다.")
         logger.info("SpeechService initialized")
     
-    def speech_to_text(self, audio_data: bytes, filename: str = "audio.webm") -> str:
+    async def speech_to_text(self, audio_data: bytes, filename: str = "audio.webm") -> str:
         """
         음성을 텍스트로 변환 (OpenAI Whisper)
         
@@ -42,13 +49,14 @@ class SpeechService:
             audio_file.name = filename
             
             # Whisper API 호출
-            if client is None:
+            if not _openai_api_key:
                 raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. 음성 인식을 사용하려면 API 키가 필요합니다.")
-            transcript = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                language="ko",  # 한국어 지정으로 정확도 향상
-            )
+            async with openai_call("stt") as client:
+                transcript = await client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=audio_file,
+                    language="ko",  # 한국어 지정으로 정확도 향상
+                )
             
             text = transcript.text.strip()
             logger.info(f"Speech-to-text: {text[:50]}...")
@@ -58,7 +66,7 @@ class SpeechService:
             logger.error(f"Speech-to-text error: {e}")
             raise Exception(f"음성 인식 실패: {str(e)}")
     
-    def text_to_speech(self, text: str, voice: str = "nova") -> bytes:
+    async def text_to_speech(self, text: str, voice: str = "nova") -> bytes:
         """
         텍스트를 음성으로 변환 (OpenAI TTS)
         
@@ -70,13 +78,14 @@ class SpeechService:
             오디오 바이너리 데이터 (MP3)
         """
         try:
-            if client is None:
+            if not _openai_api_key:
                 raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. 음성 생성을 사용하려면 API 키가 필요합니다.")
-            response = client.audio.speech.create(
-                model="tts-1",  # 빠른 응답을 위해 tts-1 사용 (tts-1-hd는 더 고품질)
-                voice=voice,
-                input=text,
-            )
+            async with openai_call("tts") as client:
+                response = await client.audio.speech.create(
+                    model="tts-1",  # 빠른 응답을 위해 tts-1 사용 (tts-1-hd는 더 고품질)
+                    voice=voice,
+                    input=text,
+                )
             
             audio_bytes = response.content
             logger.info(f"Text-to-speech: {len(audio_bytes)} bytes generated")
@@ -86,3 +95,48 @@ class SpeechService:
             logger.error(f"Text-to-speech error: {e}")
             raise Exception(f"음성 생성 실패: {str(e)}")
 
+    async def stream_text_to_speech(
+        self, text: str, voice: str = "nova", chunk_size: int = 4096
+    ) -> AsyncIterator[bytes]:
+        """
+        텍스트를 음성으로 변환하면서 MP3 청크를 받는 대로 전달 (OpenAI TTS 스트리밍)
+        전체 오디오를 기다리지 않으므로 클라이언트가 바로 재생을 시작할 수 있음
+        """
+        if not _openai_api_key:
+            raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. 음성 생성을 사용하려면 API 키가 필요합니다.")
+        queue: asyncio.Queue = asyncio.Queue(TTS_BUFFER_CHUNKS)
+        producer = asyncio.create_task(self._pump_speech(text, voice, chunk_size, queue))
+        try:
+            while (item := await queue.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # 소비자가 중간에 멈추면 (연결 종료 등) OpenAI 스트림도 닫음
+            producer.cancel()
+
+    async def _pump_speech(self, text: str, voice: str, chunk_size: int, queue: asyncio.Queue) -> None:
+        """
+        OpenAI TTS 스트림을 큐로 옮김 (끝나면 None, 실패하면 예외를 넣음)
+        openai_call 슬롯/지연 시간 측정은 OpenAI 응답을 다 받는 시점까지만
+        """
+        start = time.perf_counter()
+        total = 0
+        try:
+            async with openai_call("tts") as client:
+                async with client.audio.speech.with_streaming_response.create(
+                    model="tts-1",
+                    voice=voice,
+                    input=text,
+                    response_format="mp3",
+                ) as response:
+                    async for chunk in response.iter_bytes(chunk_size):
+                        if total == 0:
+                            TTS_FIRST_AUDIO.observe(time.perf_counter() - start)
+                        total += len(chunk)
+                        await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+            return
+        logger.info(f"Text-to-speech (stream): {total} bytes")
+        await queue.put(None)
@@ -0,0 +1,86 @@
+# app/services/student_search.py
+"""
+학생 이름 부분 검색
+1) 검색어 n-gram 해시로 student_name_grams를 조회해 후보 student_id 추출 (인덱스 조회 1번)
+2) 후보의 이름만 일괄 복호화해서 실제 포함 여부 확인 (후보가 많으면 student_id 순서로 나눠서 전부 확인)
+"""
+from __future__ import annotations
+
+import time
+
+from sqlalchemy import LargeBinary, func, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.backend.core.blind_index import name_matches, query_gram_hashes
+from app.backend.core.crypto import hmac_sha256_hex
+from app.backend.db.bulk_decrypt import decrypt_values
+from app.backend.db.models import Student, StudentNameGram
+
+# 한 번에 읽어 복호화하는 후보 수 (예: 성씨 한 글자 검색처럼 후보가 많으면 여러 번에 나눠 확인)
+CANDIDATE_BATCH = 2000
+
+# AI 빠른 경로(services/fast_intent)용 교사별 재원생 이름 캐시: teacher_id → (만료 시각, 이름 목록)
+NAME_CACHE_SECONDS = 60.0
+_name_cache: dict[int, tuple[float, list[str]]] = {}
+
+
+async def search_student_ids(
+    session: AsyncSession,
+    q: str,
+    *,
+    teacher_id: int | None = None,
+    is_active: bool | None = None,
+) -> list[int]:
+    """이름에 q가 포함된 학생 ID 목록 (초성 검색 지원)"""
+    hashes = query_gram_hashes(q)
+    if not hashes:
+        return []
+
+    # 모든 gram을 가진 학생만 후보 (gram_hash가 PK 선두 컬럼이라 인덱스 조회)
+    gram_match = select(StudentNameGram.student_id).where(StudentNameGram.gram_hash.in_(hashes))
+    if teacher_id is not None:
+        # 다른 교사의 학생 gram까지 묶지 않도록 집계 전에 교사로 한정
+        gram_match = gram_match.join(Student, Student.student_id == StudentNameGram.student_id).where(
+            Student.teacher_id == teacher_id
+        )
+    gram_match = gram_match.group_by(StudentNameGram.student_id).having(func.count() == len(hashes))
+    stmt = select(Student.student_id, type_coerce(Student.name, LargeBinary)).where(
+        or_(
+            Student.student_id.in_(gram_match),
+            # 인덱스 백필 전 데이터도 전체 이름 일치는 찾을 수 있게
+            Student.name_hash == hmac_sha256_hex(q),
+        )
+    )
+    if teacher_id is not None:
+        stmt = stmt.where(Student.teacher_id == teacher_id)
+    if is_active is not None:
+        stmt = stmt.where(Student.is_active == is_active)
+
+    matched: list[int] = []
+    last_id = None
+    while True:
+        batch = stmt if last_id is None else stmt.where(Student.student_id > last_id)
+        rows = (await session.execute(batch.order_by(Student.student_id).limit(CANDIDATE_BATCH))).all()
+        names = await decrypt_values([raw for _, raw in rows])
+        matched.extend(student_id for (student_id, _), name in zip(rows, names) if name and name_matches(name, q))
+        if len(rows) < CANDIDATE_BATCH:
+            return matched
+        last_id = rows[-1][0]
+
+
+async def teacher_student_names(session: AsyncSession, teacher_id: int) -> list[str]:
+    """교사의 재원생 이름 (복호화 결과를 NAME_CACHE_SECONDS 동안 캐시)"""
+    now = time.monotonic()
+    cached = _name_cache.get(teacher_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    raw = (
+        await session.execute(
+            select(type_coerce(Student.name, LargeBinary)).where(
+                Student.teacher_id == teacher_id, Student.is_active.is_(True)
+            )
+        )
+    ).scalars().all()
+    names = [name for name in await decrypt_values(list(raw)) if name]
+    _name_cache[teacher_id] = (now + NAME_CACHE_SECONDS, names)
+    return names
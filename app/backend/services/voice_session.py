@@ -0,0 +1,219 @@
+"""
+WebSocket 음성 어시스턴트 세션 (WS /ai/ws)
+- 클라이언트가 오디오 프레임(binary)을 보내다가 발화가 끝나면 바로 STT
+  발화 끝: {"type": "end_of_speech"} 또는 AI_WS_SILENCE_SECONDS 동안 프레임이 없을 때
+- LLM 응답은 토큰 단위로 전달하고, 문장이 완성되는 대로 TTS를 시작해 오디오 청크(binary)를 보냄
+  (나머지 문장은 그동안 계속 생성)
+
+클라이언트 → 서버
+    binary                                  오디오 프레임 (webm/opus 등 Whisper가 읽는 포맷)
+    {"type": "start", "format": "webm"}     새 발화 시작 (버퍼 초기화, 포맷 지정)
+    {"type": "end_of_speech"}               발화 끝
+    {"type": "text", "text": "..."}         음성 대신 텍스트 입력
+서버 → 클라이언트
+    {"type": "session", "session_id"}
+    {"type": "transcript", "text"}
+    {"type": "reply_delta", "text"}         LLM 응답 조각
+    {"type": "audio_start", "index", "text"} → binary MP3 청크들 → {"type": "audio_end", "index"}
+    {"type": "reply", "text"}               최종 응답 텍스트
+    {"type": "done"}                        한 턴 종료
+    {"type": "error", "stage", "detail"}
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+
+from fastapi import WebSocket
+
+from app.backend.core.config import settings
+from app.backend.db.database import AsyncSessionLocal
+from app.backend.schemas.command import ActionPlan
+from app.backend.services.intent_extractor import stream_intent_with_history
+from app.backend.services.orchestra import _execute_action
+from app.backend.services.speech_service import SpeechService
+from app.backend.services.student_search import teacher_student_names
+
+logger = logging.getLogger(__name__)
+
+# 문장 끝: 종결 부호 + 공백, 또는 줄바꿈
+_SENTENCE_END_RE = re.compile(r"[.!?…~]+[\"')\]]*\s+|\n+")
+# 이보다 짧은 문장은 다음 문장과 합쳐서 TTS (짧은 TTS 요청이 너무 많아지지 않게)
+MIN_SENTENCE_CHARS = 6
+
+
+class SentenceSplitter:
+    """스트리밍 텍스트를 TTS용 문장으로 자름"""
+
+    def __init__(self, min_chars: int = MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buf = ""
+
+    def feed(self, text: str) -> list[str]:
+        self._buf += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END_RE.finditer(self._buf):
+            sentence = self._buf[start : match.end()].strip()
+            if len(sentence) < self.min_chars:
+                continue
+            sentences.append(sentence)
+            start = match.end()
+        self._buf = self._buf[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        rest = self._buf.strip()
+        self._buf = ""
+        return rest or None
+
+
+def split_sentences(text: str) -> list[str]:
+    splitter = SentenceSplitter()
+    sentences = splitter.feed(text)
+    rest = splitter.flush()
+    return [*sentences, rest] if rest else sentences
+
+
+class VoiceSession:
+    def __init__(self, websocket: WebSocket, session_id: str, teacher_id: int, speech_service: SpeechService):
+        self.ws = websocket
+        self.session_id = session_id
+        self.teacher_id = teacher_id
+        self.speech = speech_service
+        self.filename = "recording.webm"
+        self._send_lock = asyncio.Lock()
+
+    async def run(self) -> None:
+        await self._send_json({"type": "session", "session_id": self.session_id})
+        while True:
+            utterance = await self._next_utterance()
+            if utterance is None:
+                return
+            audio, text = utterance
+            await self._handle_turn(audio, text)
+
+    # ─────────────────────────────────────────────────────────
+    # 송수신
+    # ─────────────────────────────────────────────────────────
+    async def _send_json(self, data: dict) -> None:
+        async with self._send_lock:
+            await self.ws.send_text(json.dumps(data, ensure_ascii=False))
+
+    async def _send_bytes(self, data: bytes) -> None:
+        async with self._send_lock:
+            await self.ws.send_bytes(data)
+
+    async def _next_utterance(self) -> tuple[bytes | None, str | None] | None:
+        """(오디오, 텍스트) 중 하나, 연결이 끊기면 None"""
+        buf = bytearray()
+        while True:
+            timeout = settings.AI_WS_SILENCE_SECONDS if buf else None
+            try:
+                message = await asyncio.wait_for(self.ws.receive(), timeout)
+            except asyncio.TimeoutError:
+                return bytes(buf), None
+            if message["type"] == "websocket.disconnect":
+                return None
+
+            if message.get("bytes") is not None:
+                buf.extend(message["bytes"])
+                if len(buf) > settings.AI_WS_MAX_AUDIO_BYTES:
+                    buf.clear()
+                    await self._send_json({"type": "error", "stage": "audio", "detail": "오디오가 너무 깁니다."})
+                continue
+
+            try:
+                data = json.loads(message.get("text") or "")
+            except ValueError:
+                await self._send_json({"type": "error", "stage": "protocol", "detail": "JSON 메시지가 아닙니다."})
+                continue
+            kind = data.get("type")
+            if kind == "start":
+                buf.clear()
+                self.filename = f"recording.{data.get('format') or 'webm'}"
+            elif kind == "end_of_speech":
+                if buf:
+                    return bytes(buf), None
+            elif kind == "text":
+                return None, data.get("text") or ""
+
+    # ─────────────────────────────────────────────────────────
+    # 한 턴: STT → LLM(스트리밍) → 문장별 TTS
+    # ─────────────────────────────────────────────────────────
+    async def _handle_turn(self, audio: bytes | None, text: str | None) -> None:
+        if audio is not None:
+            try:
+                text = await self.speech.speech_to_text(audio, filename=self.filename)
+            except Exception as e:
+                logger.error(f"STT error: {e}")
+                await self._send_json({"type": "error", "stage": "stt", "detail": f"음성 인식 실패: {e}"})
+                await self._send_json({"type": "done"})
+                return
+            await self._send_json({"type": "transcript", "text": text})
+
+        if not text or not text.strip():
+            await self._send_json({"type": "error", "stage": "stt", "detail": "음성을 인식할 수 없습니다."})
+            await self._send_json({"type": "done"})
+            return
+
+        sentences: asyncio.Queue[str | None] = asyncio.Queue()
+        speaker = asyncio.create_task(self._speak(sentences))
+        splitter = SentenceSplitter()
+        streamed = False
+        result: dict = {"response": "죄송해요, 다시 말씀해 주세요."}
+        try:
+            student_names = await self._student_names()
+            async for kind, value in stream_intent_with_history(self.session_id, text, student_names):
+                if kind == "delta":
+                    streamed = True
+                    await self._send_json({"type": "reply_delta", "text": value})
+                    for sentence in splitter.feed(value):
+                        sentences.put_nowait(sentence)
+                else:
+                    result = value
+
+            if "response" in result:
+                reply_text = result["response"]
+                remaining = [splitter.flush()] if streamed else split_sentences(reply_text)
+            else:
+                reply_text = result.get("ai_response", "처리 완료되었습니다.")
+                if "action" in result:
+                    async with AsyncSessionLocal() as db:
+                        _execute_action(db, self.teacher_id, ActionPlan(**result["action"]))
+                remaining = split_sentences(reply_text)
+            for sentence in remaining:
+                if sentence:
+                    sentences.put_nowait(sentence)
+            await self._send_json({"type": "reply", "text": reply_text})
+        except Exception as e:
+            logger.error(f"LLM processing error: {e}", exc_info=True)
+            await self._send_json({"type": "error", "stage": "llm", "detail": str(e)})
+        finally:
+            sentences.put_nowait(None)
+            await speaker
+        await self._send_json({"type": "done"})
+
+    async def _student_names(self) -> list[str]:
+        """빠른 경로(규칙 파서)용 학생 이름, 조회에 실패하면 빈 목록 (→ LLM으로 처리)"""
+        try:
+            async with AsyncSessionLocal() as db:
+                return await teacher_student_names(db, self.teacher_id)
+        except Exception as e:
+            logger.warning(f"학생 이름 조회 실패, 빠른 경로 없이 처리: {e}")
+            return []
+
+    async def _speak(self, sentences: asyncio.Queue) -> None:
+        index = 0
+        while (sentence := await sentences.get()) is not None:
+            await self._send_json({"type": "audio_start", "index": index, "text": sentence})
+            try:
+                async for chunk in self.speech.stream_text_to_speech(sentence, voice="nova"):
+                    await self._send_bytes(chunk)
+            except Exception as e:
+                logger.error(f"TTS error: {e}")
+                await self._send_json({"type": "error", "stage": "tts", "detail": f"음성 생성 실패: {e}"})
+            await self._send_json({"type": "audio_end", "index": index})
+            index += 1
@@ -0,0 +1,287 @@
+"""
+WebSocket 음성 어시스턴트 테스트 (WS /ai/ws)
+- OpenAI 대신 지연 시간을 조절할 수 있는 가짜 서버(FakeOpenAI)를 core/llm에 연결
+- 프로토콜 순서와, 순차 처리(POST /ai/process_audio) 대비 첫 오디오까지의 시간 단축 확인
+"""
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.backend.core import llm
+from app.backend.core.config import settings
+from app.backend.core.redis import reset_conversation_store
+from app.backend.db.database import get_session
+from app.backend.routers import ai_router
+from app.backend.services import speech_service
+from app.backend.services.voice_session import SentenceSplitter, split_sentences
+
+REPLY = "내일 오후 수업으로 할까요? 시작 시간도 알려 주시면 바로 등록할게요. 수업 시간은 몇 분인가요?"
+TRANSCRIPT = "내일 이환주 학생 수업 잡아줘"
+
+
+class FakeOpenAI:
+    """
+    chat(스트리밍/일반), audio.transcriptions, audio.speech만 흉내내는 ASGI 앱
+    - stt_delay: 전사 응답까지
+    - token_delay: LLM 토큰 하나당 (일반 응답은 토큰 수 × token_delay 후 한 번에)
+    - tts_delay: TTS 첫 청크까지, 이후 청크마다 tts_chunk_delay
+    """
+
+    def __init__(self, stt_delay=0.05, token_delay=0.02, tts_delay=0.1, tts_chunk_delay=0.01, reply=REPLY):
+        self.stt_delay = stt_delay
+        self.token_delay = token_delay
+        self.tts_delay = tts_delay
+        self.tts_chunk_delay = tts_chunk_delay
+        self.reply = reply
+        self.tts_inputs: list[str] = []
+        self.app = FastAPI()
+        self.app.post("/v1/chat/completions")(self.chat)
+        self.app.post("/v1/audio/transcriptions")(self.transcriptions)
+        self.app.post("/v1/audio/speech")(self.speech)
+
+    def tokens(self) -> list[str]:
+        # 두 글자씩 = 토큰 하나
+        return [self.reply[i : i + 2] for i in range(0, len(self.reply), 2)]
+
+    async def chat(self, request: Request):
+        body = await request.json()
+        tokens = self.tokens()
+        if not body.get("stream"):
+            await asyncio.sleep(self.token_delay * len(tokens))
+            return {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": self.reply}}],
+            }
+
+        async def events():
+            for token in tokens:
+                await asyncio.sleep(self.token_delay)
+                chunk = {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion.chunk",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                }
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def transcriptions(self, request: Request):
+        await request.body()
+        await asyncio.sleep(self.stt_delay)
+        return {"text": TRANSCRIPT}
+
+    async def speech(self, request: Request):
+        text = (await request.json())["input"]
+        self.tts_inputs.append(text)
+
+        async def audio():
+            await asyncio.sleep(self.tts_delay)
+            for i in range(3):
+                if i:
+                    await asyncio.sleep(self.tts_chunk_delay)
+                yield f"ID3|{text}|{i}|".encode()
+
+        return StreamingResponse(audio(), media_type="audio/mpeg")
+
+
+class StreamingASGITransport(httpx.AsyncBaseTransport):
+    """
+    httpx.ASGITransport는 응답 본문을 끝까지 모은 뒤 돌려주므로 스트리밍(SSE/TTS) 지연을 재현할 수 없음
+    앱을 별도 태스크로 실행하고 body 메시지를 받는 대로 전달
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        chunks: asyncio.Queue[bytes | None] = asyncio.Queue()
+        started: asyncio.Future = asyncio.get_running_loop().create_future()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await asyncio.Event().wait()  # 연결 끊김 없음
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                started.set_result(message)
+            elif message["type"] == "http.response.body":
+                if message.get("body"):
+                    await chunks.put(message["body"])
+                if not message.get("more_body"):
+                    await chunks.put(None)
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": request.method,
+            "scheme": request.url.scheme,
+            "path": request.url.path,
+            "raw_path": request.url.raw_path.split(b"?")[0],
+            "query_string": request.url.query,
+            "root_path": "",
+            "headers": [(k.lower(), v) for k, v in request.headers.raw],
+            "server": (request.url.host, request.url.port or 80),
+            "client": ("127.0.0.1", 12345),
+        }
+        task = asyncio.create_task(self.app(scope, receive, send))
+        await asyncio.wait([started, task], return_when=asyncio.FIRST_COMPLETED)
+        if not started.done():
+            task.result()  # 앱 예외 전파
+        start = started.result()
+
+        class _Body(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                while (chunk := await chunks.get()) is not None:
+                    yield chunk
+
+            async def aclose(self):
+                if not task.done():
+                    task.cancel()
+
+        return httpx.Response(start["status"], headers=start.get("headers", []), stream=_Body())
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    fake = FakeOpenAI()
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-fake")
+    monkeypatch.setattr(settings, "OPENAI_BASE_URL", "http://fake-openai/v1")
+    monkeypatch.setattr(speech_service, "_openai_api_key", "sk-fake")
+
+    # 대화 기록은 메모리 저장소에 (Redis 없이), LLM 응답 캐시는 끔 (매 턴 LLM 지연 측정)
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    reset_conversation_store()
+
+    llm.reset_llm_client(StreamingASGITransport(fake.app))
+    yield fake
+    llm.reset_llm_client()
+    reset_conversation_store()
+
+
+@pytest.fixture
+def client(fake_openai):
+    app = FastAPI()
+    app.include_router(ai_router.router)
+
+    async def _no_session():
+        yield None
+
+    app.dependency_overrides[get_session] = _no_session
+    with TestClient(app) as c:
+        yield c
+
+
+def _run_turn(ws) -> tuple[list[dict], bytes, float | None]:
+    """done까지 받은 (JSON 메시지, 오디오 바이트, 첫 오디오 도착 시각)"""
+    messages, audio, first_audio_at = [], bytearray(), None
+    while True:
+        msg = ws.receive()
+        if msg.get("bytes") is not None:
+            if first_audio_at is None:
+                first_audio_at = time.perf_counter()
+            audio.extend(msg["bytes"])
+            continue
+        data = json.loads(msg["text"])
+        messages.append(data)
+        if data["type"] == "done":
+            return messages, bytes(audio), first_audio_at
+
+
+def test_sentence_splitter_streams_complete_sentences():
+    splitter = SentenceSplitter()
+    out = []
+    for i in range(0, len(REPLY), 3):
+        out.extend(splitter.feed(REPLY[i : i + 3]))
+    out.append(splitter.flush())
+    assert out == split_sentences(REPLY) == [
+        "내일 오후 수업으로 할까요?",
+        "시작 시간도 알려 주시면 바로 등록할게요.",
+        "수업 시간은 몇 분인가요?",
+    ]
+    # 짧은 문장은 다음 문장과 합침
+    assert split_sentences("네. 알겠어요! 등록할게요.") == ["네. 알겠어요!", "등록할게요."]
+
+
+def test_ws_voice_turn_protocol(client, fake_openai):
+    with client.websocket_connect("/ai/ws?session_id=s-1") as ws:
+        assert json.loads(ws.receive_text()) == {"type": "session", "session_id": "s-1"}
+        ws.send_text(json.dumps({"type": "start", "format": "webm"}))
+        for _ in range(3):
+            ws.send_bytes(b"\x1a\x45\xdf\xa3" * 100)
+        ws.send_text(json.dumps({"type": "end_of_speech"}))
+        messages, audio, _ = _run_turn(ws)
+
+    types = [m["type"] for m in messages]
+    assert types[0] == "transcript" and messages[0]["text"] == TRANSCRIPT
+    assert types[-1] == "done"
+    reply = next(m for m in messages if m["type"] == "reply")["text"]
+    assert reply == REPLY
+    assert "".join(m["text"] for m in messages if m["type"] == "reply_delta") == REPLY
+
+    # 문장별로 TTS (LLM 응답이 끝나기 전에 첫 문장 TTS 시작)
+    starts = [m for m in messages if m["type"] == "audio_start"]
+    assert [m["text"] for m in starts] == split_sentences(REPLY)
+    assert fake_openai.tts_inputs == split_sentences(REPLY)
+    assert types.index("audio_start") < types.index("reply")
+    assert audio.startswith(b"ID3|" + split_sentences(REPLY)[0].encode())
+    assert "error" not in types
+
+
+def test_ws_text_input_and_multiple_turns(client, fake_openai):
+    with client.websocket_connect("/ai/ws") as ws:
+        session = json.loads(ws.receive_text())
+        assert session["type"] == "session" and session["session_id"]
+        for _ in range(2):
+            ws.send_text(json.dumps({"type": "text", "text": "내일 수업"}))
+            messages, audio, _ = _run_turn(ws)
+            assert messages[0]["type"] == "reply_delta"
+            assert audio
+
+
+def test_ws_pipelining_reduces_time_to_first_audio(client, fake_openai):
+    audio_file = {"audio": ("a.webm", b"\x1a\x45\xdf\xa3" * 100, "audio/webm")}
+
+    # 순차: 전사 → LLM 전체 → TTS 전체 후 JSON 응답
+    start = time.perf_counter()
+    resp = client.post("/ai/process_audio", params={"session_id": "seq"}, files=audio_file)
+    sequential = time.perf_counter() - start
+    assert resp.status_code == 200 and resp.json()["audio"]
+
+    # WS: 첫 문장이 생성되자마자 TTS
+    with client.websocket_connect("/ai/ws?session_id=ws") as ws:
+        ws.receive_text()
+        ws.send_bytes(b"\x1a\x45\xdf\xa3" * 100)
+        start = time.perf_counter()
+        ws.send_text(json.dumps({"type": "end_of_speech"}))
+        _, _, first_audio_at = _run_turn(ws)
+    first_audio = first_audio_at - start
+
+    fake = fake_openai
+    llm_total = fake.token_delay * len(fake.tokens())
+    # 순차 처리는 LLM 응답 전체 + TTS를 기다려야 첫 오디오를 받음
+    assert sequential >= fake.stt_delay + llm_total + fake.tts_delay
+    # 파이프라인은 첫 문장까지의 토큰만 기다림
+    assert first_audio < fake.stt_delay + llm_total + fake.tts_delay
+    assert first_audio < sequential * 0.75, (first_audio, sequential)
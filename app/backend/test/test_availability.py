@@ -0,0 +1,124 @@
+"""
+빈 시간 계산 테스트 (services/availability.py)
+- 비트맵 연산(window_starts, opening_mask)과 find_free_slots의 step 정렬, 주말/휴가 제외 확인
+- 점유 비트맵 조회(build_occupancy)는 고정 값으로 바꿔 DB 없이 실행
+"""
+import asyncio
+import os
+from datetime import date
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+from app.backend.services import availability
+from app.backend.services.availability import (
+    FULL_DAY,
+    SLOTS_PER_DAY,
+    _to_slot,
+    opening_mask,
+    span_mask,
+    window_starts,
+)
+
+
+def _bits(mask: int) -> list[int]:
+    return [i for i in range(SLOTS_PER_DAY) if mask >> i & 1]
+
+
+def test_window_starts_within_runs():
+    free = span_mask(10, 16) | span_mask(20, 22)
+    # 3칸 연속: 10~13만 (20~22는 2칸)
+    assert _bits(window_starts(free, 3)) == [10, 11, 12, 13]
+    assert _bits(window_starts(free, 2)) == [10, 11, 12, 13, 14, 20]
+    # 비어 있는 구간보다 길면 없음
+    assert window_starts(free, 7) == 0
+    assert window_starts(free, 0) == free
+
+
+def test_window_starts_at_day_boundaries():
+    # 하루 끝(24:00)에 딱 맞는 마지막 칸도 시작 위치가 됨
+    tail = span_mask(SLOTS_PER_DAY - 12, SLOTS_PER_DAY)
+    assert _bits(window_starts(tail, 12)) == [SLOTS_PER_DAY - 12]
+    assert window_starts(tail, 13) == 0
+    # 하루 시작(00:00)
+    assert _bits(window_starts(span_mask(0, 4), 4)) == [0]
+    # 하루 전체
+    assert _bits(window_starts(FULL_DAY, SLOTS_PER_DAY)) == [0]
+
+
+def test_opening_mask_with_disabled_hours():
+    mask = opening_mask(12, 16, disabled_hours=[13, 15, 30])
+    assert mask == span_mask(_to_slot("12:00"), _to_slot("13:00")) | span_mask(_to_slot("14:00"), _to_slot("15:00"))
+    assert opening_mask(12, 12) == 0
+    assert opening_mask(0, 24) == FULL_DAY
+
+
+def _teacher(**kw):
+    fields = dict(
+        teacher_id=1,
+        lesson_start_hour=14,
+        lesson_end_hour=18,
+        exclude_weekends=False,
+        vacation_start=None,
+        vacation_end=None,
+    )
+    fields.update(kw)
+    return SimpleNamespace(**fields)
+
+
+def _free_slots(monkeypatch, teacher, busy=None, **kw):
+    async def _occupancy(session, teacher_id, date_from, date_to):
+        return busy or {}
+
+    monkeypatch.setattr(availability, "build_occupancy", _occupancy)
+    return asyncio.run(availability.find_free_slots(None, teacher, **kw))
+
+
+def test_find_free_slots_aligns_to_step(monkeypatch):
+    day = date(2026, 10, 14)  # 수요일
+    # 14:00~14:50 수업 → 15:00부터, 17:00 시작이 마지막 (18:00 종료)
+    busy = {day: span_mask(_to_slot("14:00"), _to_slot("14:50"))}
+    slots = _free_slots(monkeypatch, _teacher(), busy, date_from=day, date_to=day, duration_minutes=60)
+    assert [(s["start_time"], s["end_time"]) for s in slots] == [
+        ("15:00", "16:00"),
+        ("15:30", "16:30"),
+        ("16:00", "17:00"),
+        ("16:30", "17:30"),
+        ("17:00", "18:00"),
+    ]
+    # step 20분: 14:50은 20분 단위가 아니므로 15:00부터
+    slots = _free_slots(monkeypatch, _teacher(), busy, date_from=day, date_to=day, duration_minutes=60, step_minutes=20)
+    assert [s["start_time"] for s in slots] == ["15:00", "15:20", "15:40", "16:00", "16:20", "16:40", "17:00"]
+
+
+def test_find_free_slots_rounds_duration_and_respects_limit(monkeypatch):
+    day = date(2026, 10, 14)
+    # 55분 → 5분 칸으로 올림, 17:00 시작은 17:55 종료로 가능
+    slots = _free_slots(monkeypatch, _teacher(), date_from=day, date_to=day, duration_minutes=55, step_minutes=60)
+    assert [(s["start_time"], s["end_time"]) for s in slots][-1] == ("17:00", "17:55")
+    slots = _free_slots(monkeypatch, _teacher(), date_from=day, date_to=date(2026, 10, 16), duration_minutes=60, limit=3)
+    assert len(slots) == 3 and {s["date"] for s in slots} == {day}
+
+
+def test_find_free_slots_skips_weekends_and_vacation(monkeypatch):
+    teacher = _teacher(
+        lesson_start_hour=14,
+        lesson_end_hour=15,
+        exclude_weekends=True,
+        vacation_start=date(2026, 10, 20),
+        vacation_end=date(2026, 10, 21),
+    )
+    # 10/16(금) ~ 10/22(목): 토/일, 휴가(화/수) 제외
+    slots = _free_slots(
+        monkeypatch, teacher, date_from=date(2026, 10, 16), date_to=date(2026, 10, 22), duration_minutes=60
+    )
+    assert [s["date"] for s in slots] == [date(2026, 10, 16), date(2026, 10, 19), date(2026, 10, 22)]
+    assert all(s["start_time"] == "14:00" for s in slots)
+
+
+def test_find_free_slots_with_disabled_hours(monkeypatch):
+    day = date(2026, 10, 14)
+    slots = _free_slots(
+        monkeypatch, _teacher(), date_from=day, date_to=day, duration_minutes=60, step_minutes=60, disabled_hours=[15]
+    )
+    assert [s["start_time"] for s in slots] == ["14:00", "16:00", "17:00"]
@@ -0,0 +1,76 @@
+"""
+이름 부분 검색용 blind n-gram 인덱스 테스트 (core/blind_index.py)
+- 검색어 gram이 항상 이름 gram의 부분집합인지 (인덱스로 후보를 놓치지 않음), 초성 검색, 최종 확인 함수 확인
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest
+
+from app.backend.core.blind_index import (
+    GRAM_HASH_LEN,
+    chosung,
+    name_gram_hashes,
+    name_grams,
+    name_matches,
+    query_gram_hashes,
+    query_grams,
+)
+
+
+def test_name_grams_cover_syllables_and_chosung():
+    assert name_grams("이환주") == {
+        "s:이", "s:환", "s:주", "s:이환", "s:환주",
+        "c:ㅇ", "c:ㅎ", "c:ㅈ", "c:ㅇㅎ", "c:ㅎㅈ",
+    }
+    # 공백/대소문자 무시
+    assert name_grams(" Kim  MJ ") == name_grams("kimmj")
+    assert name_grams("   ") == set()
+
+
+def test_query_grams():
+    assert query_grams("환주") == {"s:환주"}
+    assert query_grams("이환주") == {"s:이환", "s:환주"}
+    assert query_grams("환") == {"s:환"}
+    assert query_grams("ㅎㅈ") == {"c:ㅎㅈ"}
+    assert query_grams("") == set()
+
+
+@pytest.mark.parametrize("query", ["이", "환주", "이환주", "ㅇ", "ㅎㅈ", "ㅇㅎㅈ"])
+def test_query_hashes_are_subset_of_name_hashes(query):
+    assert query_gram_hashes(query) <= name_gram_hashes("이환주")
+    assert all(len(h) == GRAM_HASH_LEN for h in name_gram_hashes("이환주"))
+
+
+def test_unrelated_query_has_missing_grams():
+    assert not query_gram_hashes("민지") <= name_gram_hashes("이환주")
+    # 음절 gram과 초성 gram은 다른 해시 (접두어로 분리)
+    assert query_gram_hashes("ㅇ").isdisjoint(query_gram_hashes("이"))
+
+
+def test_chosung():
+    assert chosung("김민지") == "ㄱㅁㅈ"
+    # 한글 음절이 아닌 글자는 그대로
+    assert chosung("A반 2") == "Aㅂ 2"
+
+
+@pytest.mark.parametrize(
+    "name, query, expected",
+    [
+        ("이환주", "환주", True),
+        ("이환주", "이주", False),
+        ("이환주", "ㅎㅈ", True),
+        ("이환주", "ㅈㅎ", False),
+        ("Kim Minji", "minji", True),
+        ("이환주", "", True),
+    ],
+)
+def test_name_matches(name, query, expected):
+    assert name_matches(name, query) is expected
+
+
+def test_gram_false_positive_rejected_by_name_matches():
+    # "이환환이"는 "이환이"의 gram(이환, 환이)을 모두 가지지만 이어져 있지 않음 → 복호화 후 확인에서 걸러짐
+    assert query_gram_hashes("이환이") <= name_gram_hashes("이환환이")
+    assert not name_matches("이환환이", "이환이")
@@ -0,0 +1,85 @@
+"""
+AI 대화 기록 저장소 테스트 (core/redis.py)
+- Redis 서버 없이 메모리 저장소 동작과, 연결 실패 시 메모리로 전환되는지 확인
+"""
+import asyncio
+import os
+import socket
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest
+
+from app.backend.core import redis as conversation
+from app.backend.core.config import settings
+
+
+def _msg(i: int) -> dict:
+    return {"role": "user", "content": f"메시지 {i}"}
+
+
+def test_memory_store_keeps_last_messages_and_expires(monkeypatch):
+    store = conversation.MemoryConversationStore(max_sessions=2, max_messages=3, ttl=60)
+
+    async def _go():
+        await store.append("a", *[_msg(i) for i in range(5)])
+        assert await store.recent("a", 10) == [_msg(2), _msg(3), _msg(4)]
+        assert await store.recent("a", 2) == [_msg(3), _msg(4)]
+
+        # 세션 수 LRU: a를 읽었으므로 b가 밀려남
+        await store.append("b", _msg(0))
+        await store.recent("a", 1)
+        await store.append("c", _msg(0))
+        assert await store.recent("b", 10) == []
+        assert await store.recent("a", 1) == [_msg(4)]
+
+        await store.clear("a")
+        assert await store.recent("a", 10) == []
+
+        # TTL 지나면 비어 있음
+        now = conversation.time.monotonic()
+        monkeypatch.setattr(conversation.time, "monotonic", lambda: now + 61)
+        assert await store.recent("c", 10) == []
+
+    asyncio.run(_go())
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+def unreachable_redis(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_URL", f"redis://127.0.0.1:{_closed_port()}/0")
+    monkeypatch.setattr(settings, "REDIS_RETRY_SECONDS", 60.0)
+    conversation.reset_conversation_store()
+    yield
+    conversation.reset_conversation_store()
+
+
+def test_falls_back_to_memory_when_redis_is_down(unreachable_redis):
+    async def _go():
+        store = conversation.get_conversation_store()
+        assert store.primary is not None
+        await store.append("s", _msg(1))
+        await store.append("s", _msg(2))
+        assert await store.recent("s", 10) == [_msg(1), _msg(2)]
+        # 재시도 시각 전에는 Redis를 다시 시도하지 않음
+        assert store._retry_at > conversation.time.monotonic()
+        await store.clear("s")
+        assert await store.recent("s", 10) == []
+        await conversation.close_conversation_store()
+
+    asyncio.run(_go())
+
+
+def test_no_redis_url_uses_memory(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+    conversation.reset_conversation_store()
+    store = conversation.get_conversation_store()
+    assert store.primary is None
+    asyncio.run(store.append("s", _msg(1)))
+    assert asyncio.run(store.recent("s", 5)) == [_msg(1)]
+    conversation.reset_conversation_store()
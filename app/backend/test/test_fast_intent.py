@@ -0,0 +1,135 @@
+"""
+규칙 기반 빠른 경로 테스트 (services/fast_intent.py)
+- 자주 쓰는 일정 명령은 LLM 없이 같은 형식의 결과를 내고, 애매한 문장은 None(→ LLM)인지 확인
+"""
+import asyncio
+import os
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest
+
+from app.backend.core.config import settings
+from app.backend.core.redis import get_conversation_store, reset_conversation_store
+from app.backend.services import intent_extractor
+from app.backend.services.fast_intent import parse_fast_intent
+
+TODAY = date(2026, 10, 14)  # 수요일
+NAMES = ["이환주", "김민지", "박서준"]
+
+
+def _params(message: str) -> dict | None:
+    result = parse_fast_intent(message, NAMES, today=TODAY)
+    return None if result is None else {"action": result["action"]["action"], **result["action"]["params"]}
+
+
+@pytest.mark.parametrize(
+    "message, expected",
+    [
+        ("오늘 수업 뭐 있어?", {"action": "schedule_list", "date": "2026-10-14"}),
+        ("내일 일정 알려줘", {"action": "schedule_list", "date": "2026-10-15"}),
+        ("수업 목록 보여줘", {"action": "schedule_list"}),
+        (
+            "내일 오후 3시 이환주 1시간",
+            {"action": "schedule_create", "student_name": "이환주", "date": "2026-10-15",
+             "start_time": "15:00", "duration_minutes": 60},
+        ),
+        (
+            "금요일 4시 반에 김민지 학생 90분 수업 잡아줘",
+            {"action": "schedule_create", "student_name": "김민지", "date": "2026-10-16",
+             "start_time": "16:30", "duration_minutes": 90},
+        ),
+        (
+            "다음주 월요일 19:00 박서준 한시간반",
+            {"action": "schedule_create", "student_name": "박서준", "date": "2026-10-19",
+             "start_time": "19:00", "duration_minutes": 90},
+        ),
+        (
+            "10월 20일 오후 2시 30분 이환주 2시간 수업",
+            {"action": "schedule_create", "student_name": "이환주", "date": "2026-10-20",
+             "start_time": "14:30", "duration_minutes": 120},
+        ),
+        (
+            "모레 오후 5시 이환주 수업 취소해줘",
+            {"action": "schedule_cancel", "student_name": "이환주", "date": "2026-10-16", "start_time": "17:00"},
+        ),
+    ],
+)
+def test_parses_common_commands(message, expected):
+    assert _params(message) == expected
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        "내일 10시 이환주 1시간",  # 오전/오후 불명확
+        "내일 오후 3시 최유나 1시간",  # 등록되지 않은 학생
+        "내일 오후 3시 이환주 김민지 1시간",  # 학생 둘
+        "내일 오후 3시 이환주",  # 수업 길이 없음
+        "내일 이환주 수업 잡아줘",  # 시각 없음
+        "내일 말고 모레 오후 3시 이환주 1시간",  # 정정
+        "이환주 수업 내일 오후 4시로 바꿔줘",  # 변경은 LLM
+        "오늘 내일 오후 3시 이환주 1시간",  # 날짜 둘
+        "이번주 월요일 오후 3시 이환주 1시간",  # 이미 지난 요일
+        "다음주 수업 뭐 있어?",  # 기간 조회
+        "3일 뒤 수업 알려줘",  # 해석하지 않는 상대 날짜
+        "글피 수업 뭐 있어?",
+        "다다음주 월요일 오후 3시 이환주 1시간",
+        "다음 달 5일 오후 3시 이환주 1시간",
+        "10월 10일 오후 3시 이환주 1시간",  # 며칠 전 날짜
+        "이환주 학생 요즘 어때?",
+    ],
+)
+def test_ambiguous_messages_fall_back_to_llm(message):
+    assert _params(message) is None
+
+
+def test_month_day_long_past_rolls_to_next_year():
+    assert _params("1월 5일 오후 3시 이환주 1시간") == {
+        "action": "schedule_create", "student_name": "이환주", "date": "2027-01-05",
+        "start_time": "15:00", "duration_minutes": 60,
+    }
+
+
+def test_next_week_on_sunday_falls_back_to_llm():
+    sunday = date(2026, 10, 18)
+    # 월요일 시작 주로는 내일(10/19)이지만 10/26을 뜻하는 경우도 많음
+    assert parse_fast_intent("다음주 월요일 오후 4시 이환주 1시간반", NAMES, today=sunday) is None
+    assert parse_fast_intent("담주 화요일 오후 4시 이환주 1시간", NAMES, today=sunday) is None
+    # 요일만 말하면 애매하지 않음
+    result = parse_fast_intent("월요일 오후 4시 이환주 1시간", NAMES, today=sunday)
+    assert result["action"]["params"]["date"] == "2026-10-19"
+
+
+@pytest.fixture
+def memory_store(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+    reset_conversation_store()
+    yield get_conversation_store()
+    reset_conversation_store()
+
+
+def test_extractor_skips_llm_on_fast_path(monkeypatch, memory_store):
+    calls = []
+
+    async def _fake_llm(messages, response_format=None, cache_key=None):
+        calls.append(messages)
+        return "몇 시로 잡을까요?"
+
+    monkeypatch.setattr(intent_extractor, "call_llm", _fake_llm)
+
+    async def _go():
+        await memory_store.append("s", {"role": "user", "content": "이전 대화"})
+        result = await intent_extractor.extract_intent_with_history("s", "오늘 수업 뭐 있어?", NAMES)
+        assert result["action"]["action"] == "schedule_list"
+        assert calls == []
+        # 액션이 확정됐으므로 대화 기록 초기화 (LLM 경로와 동일)
+        assert await memory_store.recent("s", 10) == []
+
+        # 애매하면 LLM으로
+        result = await intent_extractor.extract_intent_with_history("s", "내일 이환주 수업 잡아줘", NAMES)
+        assert result == {"response": "몇 시로 잡을까요?"}
+        assert len(calls) == 1
+
+    asyncio.run(_go())
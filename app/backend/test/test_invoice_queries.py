@@ -0,0 +1,155 @@
+"""
+청구서 API 쿼리 수 회귀 테스트
+- 목록 조회 시 항목을 청구서마다 따로 불러오는 N+1이 다시 생기지 않는지 확인
+- Postgres 없이 SQLite(aiosqlite)로 invoices/invoice_items 테이블만 만들어 실행
+"""
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+
+from app.backend.db.base_class import Base
+from app.backend.db.database import get_session
+from app.backend.db.routing import get_read_session
+from app.backend.db.models import Invoice, InvoiceItem
+from app.backend.routers.invoice_router import router as invoices_router
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    # SQLite는 INTEGER PRIMARY KEY만 자동 증가
+    return "INTEGER"
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.statements: list[str] = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@pytest.fixture
+def api(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'invoices.sqlite'}", poolclass=NullPool)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def _setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all, tables=[Invoice.__table__, InvoiceItem.__table__]
+            )
+
+    asyncio.run(_setup())
+
+    async def _get_session():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+    app.include_router(invoices_router)
+    app.dependency_overrides[get_session] = _get_session
+    app.dependency_overrides[get_read_session] = _get_session
+    yield app, QueryCounter(engine)
+    asyncio.run(engine.dispose())
+
+
+def _invoice_payload(n: int, items: int = 3) -> dict:
+    return {
+        "teacher_id": 1,
+        "student_id": 1,
+        "invoice_number": f"INV-TEST-{n:04d}",
+        "total_amount": 10000 * items,
+        "final_amount": 10000 * items,
+        "items": [
+            {"description": f"수업 {i + 1}회차", "unit_price": 10000, "amount": 10000}
+            for i in range(items)
+        ],
+    }
+
+
+def _run(app, calls):
+    async def _go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await call(client) for call in calls]
+
+    return asyncio.run(_go())
+
+
+def test_create_invoice_uses_returning_without_refresh(api):
+    app, counter = api
+    (resp,) = _run(app, [lambda c: c.post("/invoices", json=_invoice_payload(1))])
+    assert resp.status_code == 201
+    body = resp.json()
+    assert len(body["items"]) == 3
+    assert body["created_at"] and body["items"][0]["quantity"] == 1
+    # INSERT ... RETURNING만 실행 (refresh용 SELECT 없음)
+    # Postgres는 항목을 다중 행 INSERT 1번으로, SQLite는 행마다 INSERT
+    assert all(sql.lstrip().upper().startswith("INSERT") for sql in counter.statements), counter.statements
+
+
+@pytest.mark.parametrize("page_size", [5, 40])
+def test_list_invoices_query_count_is_constant(api, page_size):
+    app, counter = api
+    _run(app, [lambda c, n=n: c.post("/invoices", json=_invoice_payload(n)) for n in range(page_size)])
+
+    counter.reset()
+    (resp,) = _run(app, [lambda c: c.get("/invoices", params={"pageSize": page_size})])
+    assert resp.status_code == 200
+    body = resp.json()
+    assert len(body["items"]) == page_size
+    assert all(len(inv["items"]) == 3 for inv in body["items"])
+    # COUNT + 청구서 페이지 + 항목 selectin 1번 (페이지 크기와 무관)
+    assert counter.count == 3, counter.statements
+
+    counter.reset()
+    (resp,) = _run(app, [lambda c: c.get("/invoices", params={"pageSize": page_size, "cursor": ""})])
+    assert resp.status_code == 200
+    # 커서 모드는 COUNT 생략
+    assert counter.count == 2, counter.statements
+
+
+def test_detail_and_update_query_counts(api):
+    app, counter = api
+    (created,) = _run(app, [lambda c: c.post("/invoices", json=_invoice_payload(1))])
+    invoice_id = created.json()["invoice_id"]
+
+    counter.reset()
+    (resp,) = _run(app, [lambda c: c.get(f"/invoices/{invoice_id}")])
+    assert resp.status_code == 200 and len(resp.json()["items"]) == 3
+    # 청구서 + 항목
+    assert counter.count == 2, counter.statements
+
+    counter.reset()
+    (resp,) = _run(app, [lambda c: c.patch(f"/invoices/{invoice_id}", json={"notes": "메모"})])
+    assert resp.status_code == 200
+    assert resp.json()["notes"] == "메모" and len(resp.json()["items"]) == 3
+    # 청구서 + 항목 + UPDATE ... RETURNING
+    assert counter.count == 3, counter.statements
+
+    counter.reset()
+    (resp,) = _run(
+        app,
+        [lambda c: c.post(f"/invoices/{invoice_id}/send-link", params={"kakao_pay_link": "https://pay.example/x"})],
+    )
+    assert resp.status_code == 200 and resp.json()["status"] == "sent"
+    assert counter.count == 3, counter.statements
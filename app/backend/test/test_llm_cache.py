@@ -0,0 +1,153 @@
+"""
+LLM 응답 캐시 테스트 (core/llm_cache.py)
+- 같은 뜻의 요청은 OpenAI를 다시 호출하지 않고, 날짜/대화 기록이 다르면 다시 호출하는지 확인
+- OpenAI 대신 httpx.MockTransport, Redis는 없거나 연결 불가
+"""
+import asyncio
+import os
+import socket
+from datetime import date
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import httpx
+import pytest
+
+from app.backend.core import llm, llm_cache
+from app.backend.core.config import settings
+from app.backend.core.metrics import LLM_CACHE
+from app.backend.core.redis import reset_conversation_store
+from app.backend.services import fast_intent, intent_extractor
+
+REPLY = "어느 학생 수업을 볼까요?"
+
+
+def _completion() -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": 0,
+            "model": settings.OPENAI_MODEL,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": REPLY}}],
+        },
+    )
+
+
+@pytest.fixture
+def openai_calls(monkeypatch):
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return _completion()
+
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "sk-fake")
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    reset_conversation_store()
+    llm_cache.reset_llm_cache()
+    llm.reset_llm_client(httpx.MockTransport(handler))
+    yield calls
+    llm.reset_llm_client()
+    llm_cache.reset_llm_cache()
+    reset_conversation_store()
+
+
+def _hits(result: str) -> float:
+    return LLM_CACHE._values.get((result,), 0)
+
+
+def test_memory_cache_lru_and_ttl():
+    cache = llm_cache.MemoryLLMCache(max_entries=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")  # a를 읽었으므로 b가 밀려남
+    assert cache.get("b") is None
+    assert cache.get("a") == "1" and cache.get("c") == "3"
+
+    cache.ttl = -1
+    cache.set("d", "4")
+    assert cache.get("d") is None
+
+
+def test_repeated_intent_served_from_cache(openai_calls, monkeypatch):
+    monkeypatch.setattr(fast_intent, "_today", lambda: date(2026, 10, 14))
+    misses, memory_hits = _hits("miss"), _hits("memory")
+
+    async def _go():
+        ask = intent_extractor.extract_intent_with_history
+        assert await ask("a", "이번주 수업 알려줘") == {"response": REPLY}
+        # 다른 세션, 공백/문장부호만 다름 → 캐시
+        assert await ask("b", "이번 주 수업 알려줘?") == {"response": REPLY}
+        assert len(openai_calls) == 1
+
+        # 같은 세션은 대화 기록이 달라졌으므로 다시 호출
+        await ask("a", "이번주 수업 알려줘")
+        assert len(openai_calls) == 2
+
+        # 날짜가 바뀌면 "이번주"가 가리키는 주가 달라짐 (다음 주 수요일)
+        monkeypatch.setattr(fast_intent, "_today", lambda: date(2026, 10, 21))
+        await ask("c", "이번주 수업 알려줘")
+        assert len(openai_calls) == 3
+
+        # 스트리밍도 같은 캐시 사용 (적중하면 한 번에)
+        deltas = [v async for kind, v in intent_extractor.stream_intent_with_history("d", "이번주 수업 알려줘") if kind == "delta"]
+        assert deltas == [REPLY]
+        assert len(openai_calls) == 3
+
+    asyncio.run(_go())
+    assert _hits("miss") - misses == 3
+    assert _hits("memory") - memory_hits == 2
+
+
+def test_unresolved_relative_dates_miss_on_a_new_day(openai_calls, monkeypatch):
+    monkeypatch.setattr(fast_intent, "_today", lambda: date(2026, 10, 14))
+
+    async def _go():
+        ask = intent_extractor.extract_intent_with_history
+        # 정규화가 날짜로 바꾸지 못하는 상대 표현
+        await ask("a", "3일 뒤 수업 알려줘")
+        await ask("b", "3일 뒤 수업 알려줘")
+        assert len(openai_calls) == 1
+
+        monkeypatch.setattr(fast_intent, "_today", lambda: date(2026, 10, 15))
+        await ask("c", "3일 뒤 수업 알려줘")
+        assert len(openai_calls) == 2
+
+    asyncio.run(_go())
+
+
+def test_failures_are_not_cached_and_redis_outage_is_a_miss(openai_calls, monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_MAX_RETRIES", 0)
+    # 아무도 듣지 않는 포트 → Redis 연결 실패
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    monkeypatch.setattr(settings, "REDIS_URL", f"redis://127.0.0.1:{port}/0")
+    llm_cache.reset_llm_cache()
+
+    messages = [{"role": "user", "content": "안녕"}]
+    fail = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if fail:
+            return httpx.Response(500, json={"error": {"message": "boom"}})
+        openai_calls.append(request)
+        return _completion()
+
+    llm.reset_llm_client(httpx.MockTransport(handler))
+
+    async def _go():
+        nonlocal fail
+        # 실패 응답(기본 문구)은 캐시하지 않음
+        assert await llm.call_llm(messages, cache_key="k") == "죄송해요, 다시 말씀해 주세요."
+        fail = False
+        assert await llm.call_llm(messages, cache_key="k") == REPLY
+        assert await llm.call_llm(messages, cache_key="k") == REPLY
+        assert len(openai_calls) == 1
+        await llm_cache.close_llm_cache()
+
+    asyncio.run(_go())
@@ -0,0 +1,130 @@
+"""
+메트릭 레지스트리 / /metrics 출력 테스트 (core/metrics.py)
+- Prometheus 텍스트 포맷, 라우트 템플릿 라벨, 여러 워커 스냅샷 합산 확인
+"""
+import asyncio
+import json
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from app.backend.core import metrics
+from app.backend.core.config import settings
+
+
+def _registry_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/things/{thing_id}")
+    async def get_thing(thing_id: int):
+        if thing_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": thing_id}
+
+    return app
+
+
+def _get(app, *paths):
+    async def _go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.get(p) for p in paths]
+
+    return asyncio.run(_go())
+
+
+def _sample(text: str, prefix: str) -> float:
+    (line,) = [l for l in text.splitlines() if l.startswith(prefix + " ")]
+    return float(line.rsplit(" ", 1)[1])
+
+
+def test_http_metrics_use_route_template(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", None)
+    before = metrics.render()
+    _get(_registry_app(), "/things/1", "/things/2", "/things/0", "/nope")
+    text = metrics.render()
+
+    ok = 'http_requests_total{method="GET",route="/things/{thing_id}",status="200"}'
+    assert _sample(text, ok) - (_sample(before, ok) if ok in before else 0) == 2
+    assert 'http_requests_total{method="GET",route="/things/{thing_id}",status="404"}' in text
+    assert 'http_requests_total{method="GET",route="unmatched",status="404"}' in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/things/{thing_id}",le="+Inf"}' in text
+    assert "/things/1" not in text
+
+
+def test_histogram_buckets_are_cumulative(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", None)
+    h = metrics.histogram("test_latency_seconds", "테스트", ("op",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, op="x")
+    text = metrics.render()
+    assert _sample(text, 'test_latency_seconds_bucket{op="x",le="0.1"}') == 1
+    assert _sample(text, 'test_latency_seconds_bucket{op="x",le="1.0"}') == 2
+    assert _sample(text, 'test_latency_seconds_bucket{op="x",le="+Inf"}') == 3
+    assert _sample(text, 'test_latency_seconds_count{op="x"}') == 3
+    assert _sample(text, 'test_latency_seconds_sum{op="x"}') == 5.55
+
+
+def test_track_counts_errors(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", None)
+    latency = metrics.histogram("test_call_seconds", "테스트", ("api",))
+    errors = metrics.counter("test_call_errors_total", "테스트", ("api",))
+    with metrics.track(latency, errors, api="a"):
+        pass
+    try:
+        with metrics.track(latency, errors, api="a"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    text = metrics.render()
+    assert _sample(text, 'test_call_seconds_count{api="a"}') == 2
+    assert _sample(text, 'test_call_errors_total{api="a"}') == 1
+
+
+def test_multiprocess_snapshots_are_merged(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "METRICS_MULTIPROC_DIR", str(tmp_path))
+    c = metrics.counter("test_jobs_total", "테스트", ("kind",))
+    g = metrics.gauge("test_pool_size", "테스트", (), callback=lambda: {(): 7})
+    c.inc(3, kind="a")
+
+    # 이미 종료된 다른 워커의 스냅샷 (카운터는 합산, 게이지는 제외)
+    dead_pid = 2**22 + 12345
+    other = {
+        "test_jobs_total": {"type": "counter", "help": "테스트", "labelnames": ["kind"], "values": [[["a"], 4.0]]},
+        "test_pool_size": {"type": "gauge", "help": "테스트", "labelnames": [], "values": [[[], 9.0]]},
+    }
+    (tmp_path / f"{dead_pid}.json").write_text(json.dumps({"pid": dead_pid, "metrics": other}))
+
+    text = metrics.render()
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert _sample(text, 'test_jobs_total{kind="a"}') == 7
+    assert _sample(text, f'test_pool_size{{pid="{os.getpid()}"}}') == 7
+    assert f'pid="{dead_pid}"' not in text
+
+
+def test_internal_endpoints_require_token_outside_local(monkeypatch):
+    from app.backend.routers.internal_router import router as internal_router
+
+    app = FastAPI()
+    app.include_router(internal_router)
+
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", None)
+    monkeypatch.setattr(settings, "ENV", "local")
+    assert _get(app, "/internal/db-pool")[0].status_code == 200
+    monkeypatch.setattr(settings, "ENV", "prod")
+    assert _get(app, "/internal/db-pool")[0].status_code == 404
+
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", "secret")
+
+    async def _with_auth(value):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get("/internal/db-pool", headers={"Authorization": value})).status_code
+
+    assert asyncio.run(_with_auth("Bearer secret")) == 200
+    assert asyncio.run(_with_auth("Bearer wrong")) == 404
@@ -0,0 +1,36 @@
+"""
+전화번호 해시 정규화 테스트 (core/crypto.canonical_phone, db/types.PhoneHashedString)
+- 하이픈/숫자만/E.164 형식이 모두 같은 해시가 되는지 (저장과 조회가 같은 값)
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest
+
+from app.backend.core.crypto import canonical_phone, phone_hash_hex
+from app.backend.db.types import PhoneHashedString
+
+FORMATS = ["010-1234-5678", "01012345678", "+821012345678", " 010 1234 5678 "]
+
+
+@pytest.mark.parametrize("phone", FORMATS)
+def test_canonical_phone_is_e164(phone):
+    assert canonical_phone(phone) == "+821012345678"
+
+
+def test_invalid_numbers_fall_back_to_digits():
+    assert canonical_phone("123-45") == "12345"
+    assert canonical_phone("+1 (23) 45") == "+12345"
+
+
+def test_process_bind_param_hashes_all_formats_equal():
+    bind = PhoneHashedString().process_bind_param
+    hashes = {bind(phone, None) for phone in FORMATS}
+    assert hashes == {phone_hash_hex("+821012345678")}
+    # 이미 해시된 값은 그대로 (다시 해시하지 않음)
+    digest = hashes.pop()
+    assert bind(digest, None) == digest
+    assert bind(None, None) is None
+    with pytest.raises(ValueError):
+        bind(1012345678, None)
@@ -0,0 +1,175 @@
+"""
+반복 수업 전개 테스트 (services/recurrence.py)
+- 요일 목록 전개, 규칙 회차(매주/격주/기간), 규칙 분리 후 회차 보존, 예외(취소/실체화) 반영 확인
+- DB 없이 모델 객체만 만들어 순수 함수로 확인
+"""
+import os
+from datetime import date, datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest
+
+from app.backend.db.models import ScheduleRule, ScheduleRuleException
+from app.backend.services.recurrence import (
+    expand_rules,
+    expand_weekdays,
+    rule_occurrences,
+    rule_phase_start,
+)
+
+CREATED = datetime(2026, 10, 1, 9, 0)
+
+
+def _rule(rule_id=1, weekday=1, interval_weeks=1, valid_from=date(2026, 10, 6), valid_to=None) -> ScheduleRule:
+    # 2026-10-06은 화요일
+    return ScheduleRule(
+        rule_id=rule_id,
+        teacher_id=1,
+        student_id=1,
+        subject_id="math",
+        weekday=weekday,
+        start_time="15:00",
+        end_time="16:00",
+        interval_weeks=interval_weeks,
+        valid_from=valid_from,
+        valid_to=valid_to,
+        created_at=CREATED,
+        updated_at=CREATED,
+    )
+
+
+def _exception(rule_id, occurrence_date, kind, schedule_id=None) -> ScheduleRuleException:
+    return ScheduleRuleException(
+        rule_id=rule_id,
+        occurrence_date=occurrence_date,
+        kind=kind,
+        schedule_id=schedule_id,
+        created_at=CREATED,
+        updated_at=CREATED + timedelta(days=1),
+    )
+
+
+def _split(rule: ScheduleRule, effective_from: date) -> tuple[ScheduleRule, ScheduleRule]:
+    """PATCH /schedules/rules/{id}?effective_from= 와 같은 방식으로 규칙 분리"""
+    new_rule = _rule(
+        rule_id=rule.rule_id + 1,
+        weekday=rule.weekday,
+        interval_weeks=rule.interval_weeks,
+        valid_from=rule_phase_start(rule, effective_from),
+        valid_to=rule.valid_to,
+    )
+    old_rule = _rule(
+        rule_id=rule.rule_id,
+        weekday=rule.weekday,
+        interval_weeks=rule.interval_weeks,
+        valid_from=rule.valid_from,
+        valid_to=effective_from - timedelta(days=1),
+    )
+    return old_rule, new_rule
+
+
+def test_expand_weekdays():
+    # 10/14(수) ~ 10/25(일), 월/목
+    assert expand_weekdays(date(2026, 10, 14), date(2026, 10, 25), [0, 3]) == [
+        date(2026, 10, 15),
+        date(2026, 10, 19),
+        date(2026, 10, 22),
+    ]
+    assert expand_weekdays(date(2026, 10, 14), date(2026, 10, 13), [0]) == []
+    # 격주: 10/14가 속한 주부터 2주마다
+    assert expand_weekdays(date(2026, 10, 14), date(2026, 11, 8), [2], interval=2) == [
+        date(2026, 10, 14),
+        date(2026, 10, 28),
+    ]
+    with pytest.raises(ValueError):
+        expand_weekdays(date(2026, 10, 14), date(2026, 10, 25), [7])
+
+
+def test_weekly_rule_within_window_and_validity():
+    rule = _rule(valid_to=date(2026, 10, 27))
+    assert rule_occurrences(rule, date(2026, 10, 1), date(2026, 12, 31)) == [
+        date(2026, 10, 6),
+        date(2026, 10, 13),
+        date(2026, 10, 20),
+        date(2026, 10, 27),
+    ]
+    # 조회 기간이 규칙 중간에서 시작
+    assert rule_occurrences(rule, date(2026, 10, 14), date(2026, 10, 21)) == [date(2026, 10, 20)]
+    # 규칙 기간 밖
+    assert rule_occurrences(rule, date(2026, 11, 1), date(2026, 11, 30)) == []
+
+
+def test_biweekly_rule_keeps_phase_for_any_window():
+    rule = _rule(interval_weeks=2)
+    expected = [date(2026, 10, 6), date(2026, 10, 20), date(2026, 11, 3), date(2026, 11, 17)]
+    assert rule_occurrences(rule, date(2026, 10, 1), date(2026, 11, 20)) == expected
+    # 쉬는 주에서 시작하는 조회 기간도 같은 주기
+    assert rule_occurrences(rule, date(2026, 10, 12), date(2026, 11, 20)) == expected[1:]
+
+
+def test_split_preserves_occurrences():
+    rule = _rule(valid_to=date(2026, 11, 30))
+    before = rule_occurrences(rule, date(2026, 10, 1), date(2026, 12, 31))
+    old_rule, new_rule = _split(rule, date(2026, 10, 21))
+    assert old_rule.valid_to == date(2026, 10, 20)
+    after = rule_occurrences(old_rule, date(2026, 10, 1), date(2026, 12, 31)) + rule_occurrences(
+        new_rule, date(2026, 10, 1), date(2026, 12, 31)
+    )
+    assert after == before
+
+
+def test_biweekly_split_in_off_week_keeps_phase():
+    rule = _rule(interval_weeks=2)
+    before = rule_occurrences(rule, date(2026, 10, 1), date(2026, 12, 31))
+    # 10/13이 있는 주는 쉬는 주
+    old_rule, new_rule = _split(rule, date(2026, 10, 14))
+    assert new_rule.valid_from == date(2026, 10, 19)
+    after = rule_occurrences(old_rule, date(2026, 10, 1), date(2026, 12, 31)) + rule_occurrences(
+        new_rule, date(2026, 10, 1), date(2026, 12, 31)
+    )
+    assert after == before
+    # 수업 주에서 나누면 그날부터
+    assert rule_phase_start(rule, date(2026, 10, 21)) == date(2026, 10, 21)
+
+
+def test_expand_rules_applies_exceptions():
+    rule = _rule(valid_to=date(2026, 10, 27))
+    exceptions = [
+        _exception(1, date(2026, 10, 13), "cancelled"),
+        _exception(1, date(2026, 10, 20), "materialized", schedule_id=10),
+        _exception(1, date(2026, 10, 27), "moved", schedule_id=11),
+    ]
+    items = expand_rules([rule], exceptions, date(2026, 10, 1), date(2026, 10, 31))
+    # 실체화/이동된 회차는 schedules 행으로 따로 조회되므로 빠짐
+    assert [(i["lesson_date"], i["status"]) for i in items] == [
+        (date(2026, 10, 6), "confirmed"),
+        (date(2026, 10, 13), "cancelled"),
+    ]
+    cancelled = items[1]
+    assert cancelled["schedule_id"] is None and cancelled["rule_id"] == 1
+    # 예외 수정 시각이 변경 피드에 반영되도록
+    assert cancelled["updated_at"] == CREATED + timedelta(days=1)
+    assert items[0]["updated_at"] == CREATED
+
+
+def test_expand_rules_after_split_follows_moved_exceptions():
+    rule = _rule(valid_to=date(2026, 11, 3))
+    old_rule, new_rule = _split(rule, date(2026, 10, 21))
+    # 분리 후 effective_from 이후 예외는 새 규칙으로 옮겨짐
+    exceptions = [
+        _exception(old_rule.rule_id, date(2026, 10, 13), "cancelled"),
+        _exception(new_rule.rule_id, date(2026, 10, 27), "cancelled"),
+    ]
+    items = expand_rules([old_rule, new_rule], exceptions, date(2026, 10, 1), date(2026, 11, 30))
+    assert [(i["rule_id"], i["lesson_date"], i["status"]) for i in items] == [
+        (1, date(2026, 10, 6), "confirmed"),
+        (1, date(2026, 10, 13), "cancelled"),
+        (1, date(2026, 10, 20), "confirmed"),
+        (2, date(2026, 10, 27), "cancelled"),
+        (2, date(2026, 11, 3), "confirmed"),
+    ]
+    # 옮기지 않은 예외(옛 규칙 id)는 더 이상 그 회차에 적용되지 않음
+    stale = [_exception(old_rule.rule_id, date(2026, 10, 27), "cancelled")]
+    items = expand_rules([old_rule, new_rule], stale, date(2026, 10, 27), date(2026, 10, 27))
+    assert [i["status"] for i in items] == ["confirmed"]
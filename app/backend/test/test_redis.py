@@ -1,4 +1,16 @@
 # test_redis.py
-from app.backend.core.redis import r
+# REDIS_URL의 Redis 연결 확인 (앱과 같은 비동기 클라이언트 설정 사용)
+import asyncio
 
-print(r.ping())  # True면 성공!
\ No newline at end of file
+from app.backend.core.redis import new_async_client
+
+
+async def _ping() -> bool:
+    client = new_async_client()
+    try:
+        return await client.ping()
+    finally:
+        await client.aclose()
+
+
+print(asyncio.run(_ping()))  # True면 성공!
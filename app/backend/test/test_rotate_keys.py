@@ -0,0 +1,77 @@
+"""
+키 교체 재암호화 테스트 (utils/rotate_keys.reencrypt_batch)
+- 평문 → v2 + 해시, 다른 키/v1 → target key의 v2, 이미 target key면 건너뜀, 손상된 envelope는 ValueError
+- DB 없이 워커 함수만 확인
+"""
+import json
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import pytest
+
+from app.backend.core import crypto
+from app.backend.core.crypto import (
+    aesgcm_decrypt_v2,
+    aesgcm_encrypt,
+    aesgcm_encrypt_v2,
+    envelope_key_id,
+    hmac_sha256_hex,
+    phone_hash_hex,
+)
+from app.backend.utils.rotate_keys import TARGETS, reencrypt_batch
+
+# students: (name, phone, parent_phone), 해시는 name → name_hash, phone → phone_hash
+SPECS = TARGETS["students"].hash_specs()
+
+
+@pytest.fixture
+def key2(monkeypatch):
+    monkeypatch.setitem(crypto.AES_KEYS, 2, os.urandom(32))
+    monkeypatch.setattr(crypto, "_AESGCM_BY_KEY_ID", {})
+    return 2
+
+
+def test_plaintext_is_encrypted_and_hashed():
+    rows = [(1, "이환주".encode(), b"010-1234-5678", None)]
+    [(pk, name, phone, parent_phone, name_hash, phone_hash)] = reencrypt_batch(rows, 1, SPECS)
+    assert pk == 1 and parent_phone is None
+    assert envelope_key_id(name) == 1 and envelope_key_id(phone) == 1
+    assert aesgcm_decrypt_v2(name).decode() == "이환주"
+    assert aesgcm_decrypt_v2(phone).decode() == "010-1234-5678"
+    assert name_hash == hmac_sha256_hex("이환주")
+    assert phone_hash == phone_hash_hex("010-1234-5678")
+
+
+def test_rotates_to_target_key_and_skips_current(key2):
+    name = aesgcm_encrypt_v2("김민지", key_id=1)
+    rows = [(1, name, None, None)]
+    [(pk, new_name, *rest)] = reencrypt_batch(rows, key2, SPECS)
+    assert envelope_key_id(new_name) == key2
+    assert aesgcm_decrypt_v2(new_name).decode() == "김민지"
+    # 암호문만 바뀐 행은 해시를 다시 쓰지 않음
+    assert rest == [None, None, None, None]
+    # 이미 target key의 v2면 다시 쓸 필요 없음
+    assert reencrypt_batch([(1, new_name, None, None)], key2, SPECS) == []
+
+
+def test_v1_envelope_is_converted_to_v2():
+    v1 = json.dumps(aesgcm_encrypt("박서준")).encode()
+    [(_, name, *_)] = reencrypt_batch([(1, v1, None, None)], 1, SPECS)
+    assert name[0] == crypto.ENVELOPE_V2
+    assert aesgcm_decrypt_v2(name).decode() == "박서준"
+
+
+def test_only_changed_columns_are_rewritten(key2):
+    name = aesgcm_encrypt_v2("이환주", key_id=key2)
+    phone = aesgcm_encrypt_v2("01012345678", key_id=1)
+    [(_, new_name, new_phone, *_)] = reencrypt_batch([(1, name, phone, None)], key2, SPECS)
+    assert new_name == name
+    assert new_phone != phone and envelope_key_id(new_phone) == key2
+
+
+def test_tampered_envelope_raises(key2):
+    blob = bytearray(aesgcm_encrypt_v2("이환주", key_id=1))
+    blob[-1] ^= 0x01
+    with pytest.raises(ValueError, match="row 7"):
+        reencrypt_batch([(7, bytes(blob), None, None)], key2, SPECS)
@@ -0,0 +1,112 @@
+"""
+요청 단위 SQL 계측 테스트 (db/instrumentation.py)
+- Server-Timing 헤더의 쿼리 수, sql_stats 로그, N+1 경고 확인
+- Postgres 없이 SQLite(aiosqlite)로 invoices/invoice_items 테이블만 만들어 실행
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import BigInteger, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+
+from app.backend.db.base_class import Base
+from app.backend.db.database import get_session
+from app.backend.db.instrumentation import SQLInstrumentationMiddleware, instrument_engine, statement_shape
+from app.backend.db.models import Invoice, InvoiceItem
+from app.backend.db.routing import get_read_session
+from app.backend.routers.invoice_router import router as invoices_router
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer(type_, compiler, **kw):
+    return "INTEGER"
+
+
+@pytest.fixture
+def app(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sql.sqlite'}", poolclass=NullPool)
+    instrument_engine(engine)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def _setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Invoice.__table__, InvoiceItem.__table__])
+
+    asyncio.run(_setup())
+
+    async def _get_session():
+        async with session_maker() as session:
+            yield session
+
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, nplus1_threshold=3)
+    app.include_router(invoices_router)
+    app.dependency_overrides[get_session] = _get_session
+    app.dependency_overrides[get_read_session] = _get_session
+
+    @app.get("/n-plus-one")
+    async def n_plus_one(session: AsyncSession = Depends(get_session)):
+        # 청구서를 하나씩 조회하는 전형적인 N+1
+        for invoice_id in range(1, 6):
+            await session.scalar(select(Invoice).where(Invoice.invoice_id == invoice_id))
+        return {"ok": True}
+
+    yield app
+    asyncio.run(engine.dispose())
+
+
+def _get(app, path: str, **params) -> httpx.Response:
+    async def _go():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, params=params)
+
+    return asyncio.run(_go())
+
+
+def _db_query_count(resp: httpx.Response) -> int:
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', resp.headers["server-timing"])
+    assert match, resp.headers["server-timing"]
+    return int(match.group(1))
+
+
+def test_server_timing_header_and_log(app, caplog):
+    with caplog.at_level(logging.INFO, logger="app.backend.sql"):
+        resp = _get(app, "/invoices", pageSize=5)
+    assert resp.status_code == 200
+    # COUNT + 청구서 페이지 (항목이 없어 selectin 없음)
+    assert _db_query_count(resp) == 2
+    assert "db-slowest;dur=" in resp.headers["server-timing"]
+
+    (record,) = [r for r in caplog.records if r.getMessage().startswith("sql_stats ")]
+    payload = json.loads(record.getMessage().removeprefix("sql_stats "))
+    assert payload["path"] == "/invoices" and payload["status"] == 200
+    assert payload["db_queries"] == 2 and payload["db_slowest_sql"]
+    assert not [r for r in caplog.records if r.levelno == logging.WARNING]
+
+
+def test_nplus1_warning(app, caplog):
+    with caplog.at_level(logging.INFO, logger="app.backend.sql"):
+        resp = _get(app, "/n-plus-one")
+    assert resp.status_code == 200
+    assert _db_query_count(resp) == 5
+    (warning,) = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert "5번" in warning.getMessage() and "/n-plus-one" in warning.getMessage()
+
+
+def test_statement_shape_ignores_values_and_in_list_length():
+    a = statement_shape("SELECT * FROM t WHERE id IN ($1, $2, $3) AND name = 'kim' LIMIT 20")
+    b = statement_shape("SELECT *\n  FROM t WHERE id IN ($1) AND name = 'lee' LIMIT 50")
+    assert a == b == "SELECT * FROM t WHERE id IN (?) AND name = ? LIMIT ?"
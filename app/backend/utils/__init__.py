@@ -1,6 +1,14 @@
 # Utils package
 from .json_utils import safe_json_loads
 from .time_utils import kst_datetime, get_kst_range
+from .pagination import encode_cursor, decode_cursor, keyset_after
 
-__all__ = ["safe_json_loads", "kst_datetime", "get_kst_range"]
+__all__ = [
+    "safe_json_loads",
+    "kst_datetime",
+    "get_kst_range",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_after",
+]
 
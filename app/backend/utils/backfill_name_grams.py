@@ -0,0 +1,56 @@
+"""
+기존 학생의 이름 n-gram 인덱스(student_name_grams) 백필 스크립트
+신규/수정 학생은 setup_hash_fields 이벤트가 자동으로 채우므로 마이그레이션 직후 한 번만 실행
+
+    python -m app.backend.utils.backfill_name_grams
+"""
+import asyncio
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.backend.core.blind_index import name_gram_hashes
+from app.backend.db.database import AsyncSessionLocal
+from app.backend.db.models import Student, StudentNameGram
+
+BATCH_SIZE = 500
+
+
+async def backfill_name_grams() -> int:
+    """student_id 순서로 BATCH_SIZE씩 처리, 처리한 학생 수 반환"""
+    done = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = (
+                await session.execute(
+                    select(Student.student_id, Student.name)
+                    .where(Student.student_id > last_id)
+                    .order_by(Student.student_id)
+                    .limit(BATCH_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+
+            ids = [student_id for student_id, _ in rows]
+            values = [
+                {"gram_hash": h, "student_id": student_id}
+                for student_id, name in rows
+                if name
+                for h in sorted(name_gram_hashes(name))
+            ]
+            await session.execute(delete(StudentNameGram).where(StudentNameGram.student_id.in_(ids)))
+            if values:
+                await session.execute(pg_insert(StudentNameGram).values(values).on_conflict_do_nothing())
+            await session.commit()
+
+            done += len(rows)
+            last_id = ids[-1]
+            print(f"  - {done}명 처리 (마지막 student_id={last_id})")
+    return done
+
+
+if __name__ == "__main__":
+    total = asyncio.run(backfill_name_grams())
+    print(f"✅ 이름 n-gram 인덱스 백필 완료: {total}명")
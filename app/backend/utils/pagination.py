@@ -0,0 +1,91 @@
+"""
+Keyset(커서) 페이지네이션 유틸
+- 정렬 키 + PK 값을 opaque 토큰으로 인코딩/디코딩
+- row-value 비교식 생성 (ORDER BY 방향에 맞춰 < 또는 >)
+- 커서 기반 페이지 조회 (OFFSET/COUNT 없이 seek)
+"""
+from __future__ import annotations
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import ColumnElement
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Unsupported cursor value type: {type(value)}")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값 목록을 URL-safe 토큰으로 인코딩"""
+    raw = json.dumps(list(values), default=_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, parsers: Sequence[Callable[[Any], Any]]) -> list[Any]:
+    """
+    토큰을 디코딩하여 각 값을 parser로 변환
+    형식이 잘못되었으면 ValueError
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(parsers):
+        raise ValueError("Invalid cursor")
+    try:
+        return [parse(v) for parse, v in zip(parsers, values)]
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def keyset_after(
+    columns: Sequence[ColumnElement],
+    values: Sequence[Any],
+    *,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """(c1, c2, ...) < (v1, v2, ...) 형태의 seek 조건 (정렬 방향은 모든 컬럼 동일해야 함)"""
+    lhs = tuple_(*columns)
+    rhs = tuple_(*(literal(v, type_=c.type) for c, v in zip(columns, values)))
+    return lhs < rhs if descending else lhs > rhs
+
+
+async def fetch_keyset_page(
+    session: AsyncSession,
+    stmt: Select,
+    columns: Sequence[InstrumentedAttribute],
+    *,
+    cursor: str,
+    page_size: int,
+    parsers: Sequence[Callable[[Any], Any]],
+    descending: bool = True,
+) -> tuple[list[Any], str | None]:
+    """
+    커서 이후 page_size개의 ORM 객체와 다음 커서를 반환
+    - cursor가 빈 문자열이면 첫 페이지
+    - page_size + 1개를 조회하여 다음 페이지 존재 여부 판단 (COUNT 불필요)
+    - stmt가 엔티티 외에 컬럼을 더 select하면 Row 목록 반환 (커서는 첫 번째 엔티티 기준)
+    """
+    if cursor:
+        after = decode_cursor(cursor, parsers)
+        stmt = stmt.where(keyset_after(columns, after, descending=descending))
+    order_by = [c.desc() if descending else c.asc() for c in columns]
+    result = await session.execute(stmt.order_by(*order_by).limit(page_size + 1))
+    multi = len(stmt.column_descriptions) > 1
+    rows = list(result.all() if multi else result.scalars().all())
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1][0] if multi else rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows, next_cursor
@@ -0,0 +1,92 @@
+"""
+phone_hash를 E.164 정규화 기준으로 다시 계산하는 백필 스크립트
+이전에는 입력 문자열 그대로 해시했으므로 "010-1234-5678"과 "01012345678"의 해시가 달랐음
+신규/수정 행은 setup_hash_fields가 정규화된 해시를 쓰므로 배포 직후 한 번만 실행
+
+    python -m app.backend.utils.rehash_phones
+
+정규화 후 같은 (이름, 전화번호)가 된 학생은 uniq_name_phone에 걸리므로 건너뛰고 ID를 출력
+"""
+import asyncio
+
+from sqlalchemy import LargeBinary, bindparam, select, type_coerce, update
+from sqlalchemy.exc import IntegrityError
+
+from app.backend.core.crypto import aesgcm_decrypt_many, phone_hash_hex
+from app.backend.db.database import AsyncSessionLocal
+from app.backend.db.models import Student, Teacher
+
+BATCH_SIZE = 1000
+
+
+async def rehash_table(model, pk_name: str) -> tuple[int, list[int]]:
+    """(갱신한 행 수, 중복으로 건너뛴 PK 목록)"""
+    table = model.__table__
+    pk = table.c[pk_name]
+    # phone_hash는 PhoneHashedString이라 64자 hex는 그대로 저장됨
+    stmt = (
+        update(table)
+        .where(pk == bindparam("_pk"))
+        .values(phone_hash=bindparam("_phone_hash"), updated_at=table.c.updated_at)
+    )
+
+    updated = 0
+    skipped: list[int] = []
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = (
+                await session.execute(
+                    select(pk, type_coerce(table.c.phone, LargeBinary), table.c.phone_hash)
+                    .where(pk > last_id)
+                    .order_by(pk)
+                    .limit(BATCH_SIZE)
+                )
+            ).all()
+            if not rows:
+                break
+
+            phones = aesgcm_decrypt_many([raw for _, raw, _ in rows], plaintext_fallback=True)
+            params = []
+            for (row_id, _, old_hash), phone in zip(rows, phones):
+                if not phone:
+                    continue
+                new_hash = phone_hash_hex(phone)
+                if new_hash != old_hash:
+                    params.append({"_pk": row_id, "_phone_hash": new_hash})
+
+            if params:
+                try:
+                    await session.execute(stmt, params)
+                    await session.commit()
+                    updated += len(params)
+                except IntegrityError:
+                    # 중복이 있는 배치만 행 단위로 다시 시도
+                    await session.rollback()
+                    for p in params:
+                        try:
+                            async with session.begin_nested():
+                                await session.execute(stmt, [p])
+                            updated += 1
+                        except IntegrityError:
+                            skipped.append(p["_pk"])
+                    await session.commit()
+
+            last_id = rows[-1][0]
+            print(f"  - {table.name}: {updated}행 갱신 (마지막 {pk_name}={last_id})")
+    return updated, skipped
+
+
+async def rehash_phones() -> dict[str, int]:
+    result = {}
+    for model, pk_name in ((Student, "student_id"), (Teacher, "teacher_id")):
+        updated, skipped = await rehash_table(model, pk_name)
+        if skipped:
+            print(f"⚠️ {model.__tablename__}: 정규화 후 중복되어 건너뜀 {pk_name}={skipped}")
+        result[model.__tablename__] = updated
+    return result
+
+
+if __name__ == "__main__":
+    total = asyncio.run(rehash_phones())
+    print(f"✅ 전화번호 해시 재계산 완료: {total}")
@@ -0,0 +1,384 @@
+"""
+암호화 컬럼 키 교체 / 재암호화 작업 (기존 migration_encrypt, convert_envelopes_v2 대체)
+- PK keyset 순서로 배치씩 읽음 (전체 행을 메모리에 올리지 않음)
+- 재암호화(AES-GCM)는 프로세스 풀에서 실행
+- 배치마다 UPDATE ... FROM (VALUES ...) 1번 + 체크포인트 갱신을 같은 트랜잭션으로 커밋
+  → 중단되어도 같은 job으로 다시 실행하면 마지막 배치 다음부터 이어서 진행
+- 서비스 중에 실행하므로 UPDATE는 읽은 암호문이 그대로일 때만 적용 (compare-and-swap)
+  → 그 사이 앱이 수정한 행은 다시 읽어 재시도 (앱의 새 값을 옛 값으로 덮어쓰지 않음)
+- 배치 사이에 복제 지연(pg_stat_replication.replay_lag)이 max_lag 이하가 될 때까지 대기
+
+대상 값
+- 다른 키의 v2 envelope, v1 JSON envelope → target key의 v2 envelope
+- 암호화되지 않은 평문 → 암호화 + 해시 컬럼(name_hash 등) 갱신
+  (평문 학생이 있었다면 이후 backfill_name_grams로 이름 검색 인덱스도 채울 것)
+
+    python -m app.backend.utils.rotate_keys --target-key-id 2 --batch-size 1000 --workers 4 --max-lag 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import warnings
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from sqlalchemy import (
+    BigInteger,
+    LargeBinary,
+    String,
+    Table,
+    cast,
+    column,
+    func,
+    select,
+    text,
+    type_coerce,
+    update,
+    values,
+)
+
+from app.backend.core.crypto import (
+    AES_KEYS,
+    CURRENT_KEY_ID,
+    aesgcm_encrypt_v2,
+    envelope_key_id,
+    hmac_sha256_hex,
+    phone_hash_hex,
+    reencrypt_envelope,
+)
+from app.backend.db.database import AsyncSessionLocal, engine
+from app.backend.db.models import KeyRotationCheckpoint, Student, Teacher
+
+DEFAULT_BATCH_SIZE = 500
+# 배치 도중 앱이 수정한 행을 다시 읽어 재시도하는 횟수
+MAX_CAS_RETRIES = 5
+
+
+@dataclass(frozen=True)
+class RotationTarget:
+    table: Table
+    pk: str
+    columns: tuple[str, ...]
+    # 암호화 컬럼 → 평문이 발견되었을 때 다시 계산할 해시 컬럼
+    hashes: dict[str, str] = field(default_factory=dict)
+    # 해시 전에 E.164로 정규화하는 전화번호 컬럼
+    phones: frozenset[str] = frozenset({"phone"})
+
+    def hash_specs(self) -> tuple[tuple[int, bool], ...]:
+        """워커에 넘길 (암호화 컬럼 위치, 전화번호 여부)"""
+        return tuple((self.columns.index(c), c in self.phones) for c in self.hashes)
+
+
+TARGETS: dict[str, RotationTarget] = {
+    "students": RotationTarget(
+        Student.__table__,
+        "student_id",
+        ("name", "phone", "parent_phone"),
+        {"name": "name_hash", "phone": "phone_hash"},
+    ),
+    "teachers": RotationTarget(
+        Teacher.__table__,
+        "teacher_id",
+        ("phone", "email", "account_name", "account_number"),
+        {"phone": "phone_hash", "email": "email_hash"},
+    ),
+}
+
+
+# ─────────────────────────────────────────────────────────────
+# 재암호화 (프로세스 풀 워커에서 실행)
+# ─────────────────────────────────────────────────────────────
+def reencrypt_batch(
+    rows: list[tuple],
+    target_key_id: int,
+    hash_specs: tuple[tuple[int, bool], ...],
+) -> list[tuple]:
+    """
+    (pk, 값...) 행 중 다시 써야 하는 행만 (pk, 새 값..., 해시...)로 반환
+    - 바꿀 필요 없는 컬럼은 기존 암호문 그대로, 해시는 평문이었던 컬럼만 (나머지 None)
+    - envelope인데 복호화에 실패하면 (키 누락/손상) ValueError로 중단
+    """
+    hash_positions = [pos for pos, _ in hash_specs]
+    changed: list[tuple] = []
+    for pk, *old in rows:
+        new = list(old)
+        hashes: list[str | None] = [None] * len(hash_specs)
+        dirty = False
+        for i, value in enumerate(old):
+            if value is None:
+                continue
+            if envelope_key_id(value) is None:
+                # 암호화되지 않은 평문
+                plain = value.decode("utf-8")
+                new[i] = aesgcm_encrypt_v2(plain, key_id=target_key_id)
+                if i in hash_positions:
+                    j = hash_positions.index(i)
+                    hashes[j] = phone_hash_hex(plain) if hash_specs[j][1] else hmac_sha256_hex(plain)
+                dirty = True
+                continue
+            try:
+                rewritten = reencrypt_envelope(value, key_id=target_key_id)
+            except ValueError as e:
+                raise ValueError(f"row {pk} column #{i}: {e}") from e
+            if rewritten is not None:
+                new[i] = rewritten
+                dirty = True
+        if dirty:
+            changed.append((pk, *new, *hashes))
+    return changed
+
+
+def _update_from_values(target: RotationTarget, changed: list[tuple], old: dict[int, tuple]):
+    """
+    UPDATE t SET ... FROM (VALUES (...), ...) AS v
+    WHERE t.pk = v.pk AND t.<col> IS NOT DISTINCT FROM v.old_<col> (모든 대상 컬럼) RETURNING pk
+    - 읽은 뒤 앱이 바꾼 행은 조건이 맞지 않아 건너뜀 (반환되지 않은 pk는 호출자가 재시도)
+    - 조건이 맞으면 바뀌지 않은 컬럼은 같은 값을 다시 쓰는 것이라 내용 변화 없음
+    - updated_at은 유지
+    """
+    table = target.table
+    hash_cols = list(target.hashes.values())
+    n = len(target.columns)
+    v = values(
+        column(target.pk, BigInteger),
+        *(column(f"old_{c}", LargeBinary) for c in target.columns),
+        *(column(c, LargeBinary) for c in target.columns),
+        *(column(h, String) for h in hash_cols),
+        name="v",
+    ).data([(row[0], *old[row[0]], *row[1 : 1 + n], *row[1 + n :]) for row in changed])
+    assignments = {c: cast(v.c[c], LargeBinary) for c in target.columns}
+    assignments.update({h: func.coalesce(v.c[h], table.c[h]) for h in hash_cols})
+    # 재암호화는 내용 변경이 아니므로 updated_at을 그대로 둠 (onupdate 방지)
+    assignments["updated_at"] = table.c.updated_at
+    unchanged = [
+        type_coerce(table.c[c], LargeBinary).is_not_distinct_from(cast(v.c[f"old_{c}"], LargeBinary))
+        for c in target.columns
+    ]
+    return (
+        update(table)
+        .where(table.c[target.pk] == v.c[target.pk], *unchanged)
+        .values(assignments)
+        .returning(table.c[target.pk])
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# 복제 지연 기반 스로틀
+# ─────────────────────────────────────────────────────────────
+@dataclass
+class Throttle:
+    pause: float = 0.0  # 배치 사이 고정 대기 (초)
+    max_lag: float | None = None  # 복제 지연이 이 값(초) 이하가 될 때까지 대기
+    poll_interval: float = 1.0
+    _lag_unavailable: bool = False
+
+    async def replication_lag(self) -> float | None:
+        """primary 기준 복제본들의 최대 replay_lag (조회 권한이 없으면 None)"""
+        if self._lag_unavailable:
+            return None
+        try:
+            async with engine.connect() as conn:
+                lag = await conn.scalar(
+                    text("SELECT COALESCE(MAX(EXTRACT(EPOCH FROM replay_lag)), 0) FROM pg_stat_replication")
+                )
+        except Exception as e:
+            warnings.warn(f"replication lag unavailable, throttling by pause only: {e}", RuntimeWarning)
+            self._lag_unavailable = True
+            return None
+        return float(lag or 0)
+
+    async def wait(self) -> None:
+        if self.pause > 0:
+            await asyncio.sleep(self.pause)
+        if self.max_lag is None:
+            return
+        while True:
+            lag = await self.replication_lag()
+            if lag is None or lag <= self.max_lag:
+                return
+            print(f"  … 복제 지연 {lag:.1f}s > {self.max_lag}s, 대기")
+            await asyncio.sleep(self.poll_interval)
+
+
+# ─────────────────────────────────────────────────────────────
+# 실행
+# ─────────────────────────────────────────────────────────────
+async def _load_checkpoint(job: str, table_name: str, target_key_id: int, restart: bool) -> KeyRotationCheckpoint:
+    async with AsyncSessionLocal() as session:
+        checkpoint = await session.get(KeyRotationCheckpoint, (job, table_name))
+        if checkpoint is not None and checkpoint.target_key_id != target_key_id:
+            raise ValueError(
+                f"job {job!r} was started with key id {checkpoint.target_key_id}; use a new --job name"
+            )
+        if checkpoint is None:
+            checkpoint = KeyRotationCheckpoint(
+                job_name=job, table_name=table_name, target_key_id=target_key_id
+            )
+            session.add(checkpoint)
+        elif restart:
+            checkpoint.last_id = 0
+            checkpoint.rows_scanned = 0
+            checkpoint.rows_rewritten = 0
+            checkpoint.completed_at = None
+        await session.commit()
+        await session.refresh(checkpoint)
+        return checkpoint
+
+
+def _as_bytes(rows) -> list[tuple]:
+    # 프로세스 풀로 넘기기 위해 memoryview → bytes
+    return [(row[0], *(None if v is None else bytes(v) for v in row[1:])) for row in rows]
+
+
+async def rotate_table(
+    target: RotationTarget,
+    *,
+    job: str,
+    target_key_id: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    executor: Executor | None = None,
+    throttle: Throttle | None = None,
+    restart: bool = False,
+) -> KeyRotationCheckpoint:
+    """한 테이블을 체크포인트 다음부터 끝까지 재암호화"""
+    table = target.table
+    checkpoint = await _load_checkpoint(job, table.name, target_key_id, restart)
+    if checkpoint.completed_at is not None:
+        print(f"  - {table.name}: 이미 완료됨 ({checkpoint.rows_rewritten}행 변환)")
+        return checkpoint
+
+    pk = table.c[target.pk]
+    # EncryptedString의 복호화를 거치지 않고 저장된 바이트를 그대로 읽음
+    raw_cols = [type_coerce(table.c[c], LargeBinary) for c in target.columns]
+    hash_specs = target.hash_specs()
+    key = (KeyRotationCheckpoint.job_name == job) & (KeyRotationCheckpoint.table_name == table.name)
+    loop = asyncio.get_running_loop()
+    last_id = checkpoint.last_id
+
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = (
+                await session.execute(
+                    select(pk, *raw_cols).where(pk > last_id).order_by(pk).limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                await session.execute(update(KeyRotationCheckpoint).where(key).values(completed_at=func.now()))
+                await session.commit()
+                break
+
+            payload = _as_bytes(rows)
+            pending = payload
+            rewritten = 0
+            for _ in range(MAX_CAS_RETRIES):
+                if executor is not None:
+                    changed = await loop.run_in_executor(
+                        executor, reencrypt_batch, pending, target_key_id, hash_specs
+                    )
+                else:
+                    changed = reencrypt_batch(pending, target_key_id, hash_specs)
+                if not changed:
+                    break
+                old = {row[0]: row[1:] for row in pending}
+                done = set(
+                    (await session.execute(_update_from_values(target, changed, old))).scalars().all()
+                )
+                rewritten += len(done)
+                missed = [row[0] for row in changed if row[0] not in done]
+                if not missed:
+                    break
+                # 읽은 뒤 앱이 수정한 행 (삭제된 행은 다시 읽히지 않음) → 현재 값으로 다시
+                pending = _as_bytes(
+                    (await session.execute(select(pk, *raw_cols).where(pk.in_(missed)).order_by(pk))).all()
+                )
+            else:
+                raise RuntimeError(
+                    f"{table.name}: rows kept changing during rotation, retry later: {missed}"
+                )
+            last_id = payload[-1][0]
+            await session.execute(
+                update(KeyRotationCheckpoint)
+                .where(key)
+                .values(
+                    last_id=last_id,
+                    rows_scanned=KeyRotationCheckpoint.rows_scanned + len(payload),
+                    rows_rewritten=KeyRotationCheckpoint.rows_rewritten + rewritten,
+                )
+            )
+            await session.commit()
+            print(f"  - {table.name}: {rewritten}/{len(payload)}행 변환 (마지막 {target.pk}={last_id})")
+
+        if throttle is not None:
+            await throttle.wait()
+
+    async with AsyncSessionLocal() as session:
+        return await session.get(KeyRotationCheckpoint, (job, table.name))
+
+
+async def rotate_keys(
+    *,
+    target_key_id: int = CURRENT_KEY_ID,
+    job: str | None = None,
+    tables: list[str] | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 0,
+    throttle: Throttle | None = None,
+    restart: bool = False,
+) -> dict[str, int]:
+    """대상 테이블 전체를 target_key_id로 재암호화, 테이블별 변환 행 수 반환"""
+    if target_key_id not in AES_KEYS:
+        raise ValueError(f"Unknown key id {target_key_id} (configure it in AES_KEYS_B64)")
+    job = job or f"rotate-to-{target_key_id}"
+    executor = (
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if workers > 0
+        else None
+    )
+    try:
+        result: dict[str, int] = {}
+        for name in tables or list(TARGETS):
+            checkpoint = await rotate_table(
+                TARGETS[name],
+                job=job,
+                target_key_id=target_key_id,
+                batch_size=batch_size,
+                executor=executor,
+                throttle=throttle,
+                restart=restart,
+            )
+            result[name] = checkpoint.rows_rewritten
+        return result
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="암호화 컬럼 키 교체 / 재암호화")
+    parser.add_argument("--target-key-id", type=int, default=CURRENT_KEY_ID, help="기본: AES_CURRENT_KEY_ID")
+    parser.add_argument("--job", help="체크포인트 이름 (기본: rotate-to-<key id>), 같은 이름으로 재실행하면 이어서 진행")
+    parser.add_argument("--tables", nargs="+", choices=sorted(TARGETS), help="기본: 전체")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=0, help="재암호화 프로세스 수 (0이면 현재 프로세스에서)")
+    parser.add_argument("--pause", type=float, default=0.0, help="배치 사이 대기 (초)")
+    parser.add_argument("--max-lag", type=float, default=None, help="복제 지연 상한 (초)")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    total = asyncio.run(
+        rotate_keys(
+            target_key_id=args.target_key_id,
+            job=args.job,
+            tables=args.tables,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            throttle=Throttle(pause=args.pause, max_lag=args.max_lag),
+            restart=args.restart,
+        )
+    )
+    print(f"✅ 키 교체 완료 (key id {args.target_key_id}): {total}")